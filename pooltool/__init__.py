@@ -20,15 +20,13 @@ considered.
 # This is a placeholder that is replaced during package building (`poetry build`)
 __version__ = "0.0.0"
 
-import pooltool.ai as ai
-import pooltool.ai.aim as aim
-import pooltool.ai.pot as pot
-import pooltool.ani.image as image
+import importlib
+from typing import TYPE_CHECKING
+
 import pooltool.constants as constants
 import pooltool.events as events
 import pooltool.evolution as evolution
 import pooltool.game as game
-import pooltool.interact as interact
 import pooltool.layouts as layouts
 import pooltool.objects as objects
 import pooltool.physics as physics
@@ -38,9 +36,16 @@ import pooltool.serialize as serialize
 import pooltool.system as system
 import pooltool.utils as utils
 from pooltool.events import EventType
-from pooltool.evolution import continuize, interpolate_ball_states, simulate
+from pooltool.evolution import (
+    continuize,
+    interpolate_ball_states,
+    interpolate_ball_states_array,
+    interpolate_system_states_array,
+    simulate,
+    simulate_many,
+    warmup,
+)
 from pooltool.game.datatypes import GameType
-from pooltool.interact import Game, show
 from pooltool.layouts import generate_layout, get_rack
 from pooltool.objects import (
     Ball,
@@ -52,6 +57,46 @@ from pooltool.objects import (
 from pooltool.ruleset import Player, get_ruleset
 from pooltool.system import MultiSystem, System
 
+# These depend on Panda3D (the GUI stack), or are slow to import, and aren't needed to
+# simulate. They're imported on first access, so that `import pooltool` stays light for
+# headless use. Maps each name to its module and, for objects, the attribute within it.
+_LAZY_ATTRIBUTES: dict[str, tuple[str, str | None]] = {
+    "ai": ("pooltool.ai", None),
+    "aim": ("pooltool.ai.aim", None),
+    "pot": ("pooltool.ai.pot", None),
+    "image": ("pooltool.ani.image", None),
+    "interact": ("pooltool.interact", None),
+    "Game": ("pooltool.interact", "Game"),
+    "show": ("pooltool.interact", "show"),
+}
+
+if TYPE_CHECKING:
+    import pooltool.ai as ai
+    import pooltool.ai.aim as aim
+    import pooltool.ai.pot as pot
+    import pooltool.ani.image as image
+    import pooltool.interact as interact
+    from pooltool.interact import Game, show
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+
+    # Cache, so that __getattr__ isn't called again for this name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 __all__ = [
     # subpackages
     "events",
@@ -88,7 +133,11 @@ __all__ = [
     # functions
     "continuize",
     "interpolate_ball_states",
+    "interpolate_ball_states_array",
+    "interpolate_system_states_array",
     "simulate",
+    "simulate_many",
+    "warmup",
     "show",
     "generate_layout",
     "get_rack",
@@ -4,7 +4,14 @@ from collections.abc import Callable
 
 from attrs import define
 
+from pooltool.ai.pot.batch import PotCandidates, evaluate_pots
 from pooltool.ai.pot.core import calc_potting_angle, pick_easiest_pot
+from pooltool.ai.pot.geometry import (
+    PocketGeometry,
+    TableGeometry,
+    pocket_geometry,
+    table_geometry,
+)
 from pooltool.objects import Ball, Pocket, Table
 from pooltool.system.datatypes import System
 
@@ -20,3 +27,16 @@ class PottingConfig:
             calculate_angle=calc_potting_angle,
             choose_pocket=pick_easiest_pot,
         )
+
+
+__all__ = [
+    "PottingConfig",
+    "PotCandidates",
+    "evaluate_pots",
+    "PocketGeometry",
+    "TableGeometry",
+    "pocket_geometry",
+    "table_geometry",
+    "calc_potting_angle",
+    "pick_easiest_pot",
+]
@@ -0,0 +1,342 @@
+"""Evaluate every (object ball, pocket) pot at once
+
+The functions of :mod:`pooltool.ai.pot.core` evaluate one object ball and one pocket at a
+time, looping over every other ball in Python to test for occlusion. Evaluating every
+object ball on the table that way recomputes the same potting points and shadow balls
+many times over.
+
+:func:`evaluate_pots` instead computes the potting point and shadow ball of every
+candidate once, and tests every ball path against every ball with array operations. The
+result agrees with the per-candidate functions:
+
+>>> import pooltool as pt
+>>> from pooltool.ai.pot import evaluate_pots, pick_easiest_pot
+>>> system = pt.System.example()
+>>> pots = evaluate_pots(system)
+>>> pocket_id = pots.easiest_pocket("1")
+>>> easiest = pick_easiest_pot(system, system.balls["1"])
+>>> assert pocket_id == (None if easiest is None else easiest.id)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import attrs
+import numpy as np
+from numpy.typing import NDArray
+
+import pooltool.constants as const
+from pooltool.ai.pot.geometry import TableGeometry, table_geometry
+from pooltool.objects import Ball, Table
+from pooltool.system.datatypes import System
+
+
+@attrs.define(frozen=True)
+class PotCandidates:
+    """The evaluation of every (object ball, pocket) candidate
+
+    Each array's first two axes index the object balls (in the order of
+    :attr:`ball_ids`) and the pockets (in the order of :attr:`pocket_ids`). The
+    per-candidate functions of :mod:`pooltool.ai.pot.core` that each array agrees with
+    are noted below.
+
+    Attributes:
+        ball_ids:
+            The IDs of the object balls.
+        pocket_ids:
+            The IDs of the pockets.
+        potting_points:
+            The 2D point the object ball is aimed at (``get_potting_point``).
+        shadow_ball_centers:
+            Where the cue ball contacts the object ball (``calc_shadow_ball_center``).
+        cut_angles:
+            The absolute cut angle, in degrees (as calculated in ``viable_pockets``).
+        precisions:
+            The required precision (``required_precision``). Lower is easier.
+        pocket_occluded:
+            Whether the object ball's path is occluded (``is_pocket_occluded``).
+        room_for_cue_ball:
+            Whether there is room for the cue ball (``is_room_for_cue_ball``).
+        jaw_in_way:
+            Whether the close jaw is in the way (``is_jaw_in_way``).
+        object_ball_occluded:
+            Whether the cue ball's path is occluded (``is_object_ball_occluded``).
+        max_cut:
+            The largest cut angle, in degrees, of a viable candidate.
+    """
+
+    ball_ids: list[str]
+    pocket_ids: list[str]
+    potting_points: NDArray[np.float64]
+    shadow_ball_centers: NDArray[np.float64]
+    cut_angles: NDArray[np.float64]
+    precisions: NDArray[np.float64]
+    pocket_occluded: NDArray[np.bool_]
+    room_for_cue_ball: NDArray[np.bool_]
+    jaw_in_way: NDArray[np.bool_]
+    object_ball_occluded: NDArray[np.bool_]
+    max_cut: float
+
+    @property
+    def viable(self) -> NDArray[np.bool_]:
+        """Whether each candidate is viable (see ``viable_pockets``)"""
+        return (
+            ~self.pocket_occluded
+            & self.room_for_cue_ball
+            & ~self.jaw_in_way
+            & ~self.object_ball_occluded
+            & (self.cut_angles <= self.max_cut)
+        )
+
+    def ranked(self) -> NDArray[np.int64]:
+        """Rank the viable candidates from easiest to hardest
+
+        Returns:
+            NDArray[np.int64]:
+                An array of shape (n, 2), holding the ball index and pocket index of
+                each of the n viable candidates, ordered by required precision. Ties are
+                ordered by ball, then by pocket.
+        """
+        candidates = np.argwhere(self.viable)
+        order = np.argsort(
+            self.precisions[candidates[:, 0], candidates[:, 1]], kind="stable"
+        )
+        return candidates[order]
+
+    def viable_pockets(self, ball_id: str) -> list[tuple[str, float]]:
+        """The viable pockets of an object ball, easiest first
+
+        Returns:
+            list of (pocket_id, required_precision), like ``viable_pockets``
+        """
+        i = self.ball_ids.index(ball_id)
+        viable = np.flatnonzero(self.viable[i])
+        order = np.argsort(self.precisions[i, viable], kind="stable")
+        return [
+            (self.pocket_ids[j], float(self.precisions[i, j])) for j in viable[order]
+        ]
+
+    def easiest_pocket(self, ball_id: str) -> str | None:
+        """The ID of the easiest pocket for an object ball, like ``pick_easiest_pot``"""
+        pockets = self.viable_pockets(ball_id)
+        return pockets[0][0] if pockets else None
+
+
+def evaluate_pots(
+    system: System,
+    ball_ids: Sequence[str] | None = None,
+    max_cut: float = 80,
+) -> PotCandidates:
+    """Evaluate potting each object ball into each pocket
+
+    Every ball in the system, including the cue ball, can occlude a path or take up the
+    room needed by the cue ball, just like in ``pick_easiest_pot``.
+
+    Args:
+        system:
+            The system. The cue ball is ``system.cue.cue_ball_id``.
+        ball_ids:
+            The object balls to evaluate. By default, every ball other than the cue
+            ball that isn't pocketed.
+        max_cut:
+            The largest cut angle, in degrees, of a viable candidate.
+
+    Returns:
+        PotCandidates: The evaluation of every candidate.
+    """
+    cue_id = system.cue.cue_ball_id
+
+    if ball_ids is None:
+        ball_ids = [
+            ball.id
+            for ball in system.balls.values()
+            if ball.id != cue_id and ball.state.s != const.pocketed
+        ]
+
+    return _evaluate(
+        system.balls[cue_id],
+        [system.balls[ball_id] for ball_id in ball_ids],
+        system.table,
+        system.balls.values(),
+        max_cut,
+    )
+
+
+def _evaluate(
+    cue: Ball,
+    objects: list[Ball],
+    table: Table,
+    balls: Iterable[Ball],
+    max_cut: float,
+) -> PotCandidates:
+    pockets = table_geometry(table)
+    balls = list(balls)
+    all_ids = [ball.id for ball in balls]
+
+    # Positions and radii of every ball (axis N) and of the object balls (axis B)
+    xyz = np.array([ball.xyz for ball in balls]).reshape(-1, 3)
+    xy = xyz[:, :2]
+    radii = np.array([ball.params.R for ball in balls])
+    obj_xyz = np.array([ball.xyz for ball in objects]).reshape(-1, 3)
+    obj_xy = obj_xyz[:, :2]
+    obj_R = np.array([ball.params.R for ball in objects], dtype=np.float64)
+    cue_xy = cue.xyz[:2]
+
+    # Which of the N balls is each object ball (B, N), and the cue ball (N,)
+    is_object = np.array(
+        [[ball.id == _id for _id in all_ids] for ball in objects], dtype=np.bool_
+    ).reshape(len(objects), len(balls))
+    is_cue = np.array([_id == cue.id for _id in all_ids], dtype=np.bool_)
+    obj_pocketed = np.array(
+        [ball.state.s == const.pocketed for ball in objects], dtype=np.bool_
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        potting_points = _potting_points(obj_xyz, obj_R, pockets)
+
+        to_pocket = potting_points - obj_xy[:, None, :]
+        unit = to_pocket / np.linalg.norm(to_pocket, axis=-1, keepdims=True)
+        shadow = obj_xy[:, None, :] - unit * (2 * obj_R)[:, None, None]
+
+        aim = (obj_xy - cue_xy)[:, None, :]
+        cut_angles = np.abs(_angle(aim, to_pocket))
+        precisions = np.abs(
+            np.abs(_angle(aim, pockets.ltip - obj_xy[:, None, :]))
+            - np.abs(_angle(aim, pockets.rtip - obj_xy[:, None, :]))
+        )
+
+        # The object ball's path to the potting point, past every ball other than
+        # itself. A pocketed ball's path is never occluded.
+        hits = _paths_hit_balls(obj_xy[:, None, :], potting_points, xy, radii)
+        hits &= ~is_object[:, None, :]
+        pocket_occluded = hits.any(axis=-1) & ~obj_pocketed[:, None]
+
+        # The cue ball's path to the shadow ball, past every ball other than itself
+        # and the object ball
+        hits = _paths_hit_balls(cue_xy[None, None, :], shadow, xy, radii)
+        hits &= ~is_object[:, None, :] & ~is_cue
+        object_ball_occluded = hits.any(axis=-1)
+        if cue.state.s == const.pocketed:
+            object_ball_occluded[:] = False
+
+        R = obj_R[:, None]
+        in_bounds = (
+            (shadow[..., 0] >= R)
+            & (shadow[..., 0] <= table.w - R)
+            & (shadow[..., 1] >= R)
+            & (shadow[..., 1] <= table.l - R)
+        )
+        overlaps = (
+            np.linalg.norm(xy - shadow[:, :, None, :], axis=-1) < 2 * radii
+        ) & ~is_object[:, None, :]
+        room_for_cue_ball = in_bounds & ~overlaps.any(axis=-1)
+
+        jaw_in_way = _jaw_in_way(obj_xyz, obj_R, potting_points, pockets)
+
+    return PotCandidates(
+        ball_ids=[ball.id for ball in objects],
+        pocket_ids=pockets.ids,
+        potting_points=potting_points,
+        shadow_ball_centers=shadow,
+        cut_angles=cut_angles,
+        precisions=precisions,
+        pocket_occluded=pocket_occluded,
+        room_for_cue_ball=room_for_cue_ball,
+        jaw_in_way=jaw_in_way,
+        object_ball_occluded=object_ball_occluded,
+        max_cut=max_cut,
+    )
+
+
+def _angle(v1: NDArray[np.float64], v2: NDArray[np.float64]) -> NDArray[np.float64]:
+    """The signed angle from v1 to v2 in degrees, broadcasting over leading axes"""
+    det = v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0]
+    dot = v1[..., 0] * v2[..., 0] + v1[..., 1] * v2[..., 1]
+    return np.degrees(np.arctan2(det, dot))
+
+
+def _potting_points(
+    xyz: NDArray[np.float64], R: NDArray[np.float64], pockets: TableGeometry
+) -> NDArray[np.float64]:
+    """The potting point of each ball (axis B) and pocket (axis P), of shape (B, P, 2)"""
+    xy = xyz[:, None, :2]
+
+    # Corner pockets: is the ball in the jaws (on the pocket's side of the tips)?
+    def side(point: NDArray[np.float64]) -> NDArray[np.float64]:
+        a, b = pockets.ltip, pockets.rtip
+        return (b[..., 0] - a[..., 0]) * (point[..., 1] - a[..., 1]) - (
+            point[..., 0] - a[..., 0]
+        ) * (b[..., 1] - a[..., 1])
+
+    in_jaws = side(xy) * side(pockets.center[:, :2]) >= 0
+
+    # Otherwise, aim off of the adjacent cushion intersection, away from the rail that
+    # the ball is heading more directly towards
+    to_aci = pockets.aci - xy
+    lunit = _pointing_along(pockets.lrail_unit, to_aci)
+    runit = _pointing_along(pockets.rrail_unit, to_aci)
+    theta_l = np.abs(_angle(to_aci, lunit))
+    theta_r = np.abs(_angle(to_aci, runit))
+    closer_to_left = theta_l < theta_r
+    theta = np.where(closer_to_left, 45.0 - theta_l, 45.0 - theta_r)
+    offset_dir = np.where(closer_to_left[..., None], -runit, -lunit)
+    offset_mag = np.sin(np.pi / 90 * theta) * R[:, None]
+    corner = pockets.aci + offset_dir * offset_mag[..., None]
+    corner = np.where(in_jaws[..., None], pockets.center[:, :2], corner)
+
+    return np.where(pockets.corner[:, None], corner, pockets.mbj)
+
+
+def _pointing_along(
+    unit: NDArray[np.float64], vector: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Flip the unit vectors that point away from the vectors"""
+    flip = np.sum(vector * unit, axis=-1) < 0
+    return np.where(flip[..., None], -unit, unit)
+
+
+def _paths_hit_balls(
+    start: NDArray[np.float64],
+    end: NDArray[np.float64],
+    xy: NDArray[np.float64],
+    radii: NDArray[np.float64],
+) -> NDArray[np.bool_]:
+    """Whether the ball paths from start to end pass within two radii of each ball
+
+    ``start`` and ``end`` broadcast to shape (B, P, 2), and the result has shape
+    (B, P, N) for the N balls. Only the balls whose closest point on the path's line is
+    between start and end are considered.
+    """
+    diff = (end - start)[:, :, None, :]
+    t = np.sum((xy - start[:, :, None, :]) * diff, axis=-1) / np.sum(
+        diff * diff, axis=-1
+    )
+    closest = start[:, :, None, :] + diff * t[..., None]
+    distance = np.linalg.norm(closest - xy, axis=-1)
+    return ~((t < 0) | (t > 1)) & (distance < 2 * radii)
+
+
+def _jaw_in_way(
+    xyz: NDArray[np.float64],
+    R: NDArray[np.float64],
+    potting_points: NDArray[np.float64],
+    pockets: TableGeometry,
+) -> NDArray[np.bool_]:
+    """Whether the closest jaw tip is in the way of each ball's path (side pockets)"""
+    xy = xyz[:, None, :2]
+
+    use_left = np.linalg.norm(pockets.ljaw_center - xyz[:, None, :], axis=-1) < (
+        np.linalg.norm(pockets.rjaw_center - xyz[:, None, :], axis=-1)
+    )
+    tip = np.where(use_left[..., None], pockets.ljaw_center, pockets.rjaw_center)[
+        ..., :2
+    ]
+    radius = np.where(use_left, pockets.ljaw_radius, pockets.rjaw_radius)
+
+    diff = potting_points - xy
+    t = np.sum((tip - xy) * diff, axis=-1) / np.sum(diff * diff, axis=-1)
+    closest = xy + diff * t[..., None]
+    in_way = np.linalg.norm(closest - tip, axis=-1) < radius + R[:, None]
+
+    return in_way & ~pockets.corner
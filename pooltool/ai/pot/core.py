@@ -9,19 +9,17 @@ import math
 from collections.abc import Iterable
 from math import degrees
 
-import attrs
 import numpy as np
 from numpy.typing import NDArray
 
 import pooltool.constants as const
+from pooltool.ai.pot.geometry import pocket_geometry, pocket_jaw_map
 from pooltool.objects import Ball, BallState, Pocket, Table
 from pooltool.ptmath import (
     are_points_on_same_side,
-    find_intersection_2D,
     norm2d,
     norm3d,
     point_on_line_closest_to_point,
-    unit_vector,
     unit_vector_slow,
 )
 from pooltool.system.datatypes import System
@@ -38,56 +36,10 @@ def angle_between_vectors(v1: NDArray[np.float64], v2: NDArray[np.float64]) -> f
     return degrees(angle)
 
 
-@attrs.define(frozen=True)
-class Jaw:
-    """Jaw IDs for a pocket
-
-    Left and right are defined relative to the shooter
-    """
-
-    left_edge: str
-    left_rail: str
-    left_tip: str
-    right_edge: str
-    right_rail: str
-    right_tip: str
-    corner: bool
-
-
-pocket_jaw_map: dict[str, Jaw] = {
-    "lb": Jaw("1", "18", "1t", "2", "3", "2t", True),
-    "lc": Jaw("4", "3", "4t", "5", "6", "5t", False),
-    "lt": Jaw("7", "6", "7t", "8", "9", "8t", True),
-    "rb": Jaw("16", "15", "16t", "17", "18", "17t", True),
-    "rc": Jaw("13", "12", "13t", "14", "15", "14t", False),
-    "rt": Jaw("10", "9", "10t", "11", "12", "11t", True),
-}
-
-
 def potting_point_side(_: Ball, table: Table, pocket: Pocket) -> Coordinate:
-    jaw = pocket_jaw_map[pocket.id]
-    lrail = table.cushion_segments.linear[jaw.left_rail]
-    rrail = table.cushion_segments.linear[jaw.right_rail]
-
-    # Unfortunately, we don't know which two endpoints of each cushion segment define the
-    # jaws of the pocket, so we calculate distances between the two left points against
-    # the two right points. The minimum distance are the pocket jaws, and for these two
-    # points we calculate the "midpoint between jaws" (MBJ). That's our potting point.
-
-    min_dist = np.inf
-    MBJ = np.empty(2)
-    for pl, pr in (
-        (lrail.p1, rrail.p1),
-        (lrail.p1, rrail.p2),
-        (lrail.p2, rrail.p1),
-        (lrail.p2, rrail.p2),
-    ):
-        dist = norm3d(pl - pr)
-        if dist < min_dist:
-            min_dist = dist
-            MBJ = (pl + (pr - pl) / 2)[:2]
-
-    return MBJ
+    mbj = pocket_geometry(table, pocket.id).mbj
+    assert mbj is not None
+    return mbj.copy()
 
 
 def potting_point_corner(ball: Ball, table: Table, pocket: Pocket) -> Coordinate:
@@ -96,30 +48,24 @@ def potting_point_corner(ball: Ball, table: Table, pocket: Pocket) -> Coordinate
     if potting_point is not None:
         return potting_point
 
-    jaw = pocket_jaw_map[pocket.id]
-    lrail = table.cushion_segments.linear[jaw.left_rail]
-    rrail = table.cushion_segments.linear[jaw.right_rail]
+    geometry = pocket_geometry(table, pocket.id)
+    assert geometry.aci is not None
+    assert geometry.lrail_unit is not None
+    assert geometry.rrail_unit is not None
 
     # adjacent cushion intersection
-    ACI = find_intersection_2D(
-        l1x=lrail.lx,
-        l1y=lrail.ly,
-        l10=lrail.l0,
-        l2x=rrail.lx,
-        l2y=rrail.ly,
-        l20=rrail.l0,
-    )
+    ACI = geometry.aci
 
     ball_to_ACI = ACI - ball.xyz[:2]
 
-    lrail_unit = unit_vector(lrail.p2 - lrail.p1)[:2]
-    rrail_unit = unit_vector(rrail.p2 - rrail.p1)[:2]
+    lrail_unit = geometry.lrail_unit
+    rrail_unit = geometry.rrail_unit
 
     # Point the cushion unit vectors towards the pocket
     if np.dot(ball_to_ACI, lrail_unit) < 0:
-        lrail_unit *= -1
+        lrail_unit = -lrail_unit
     if np.dot(ball_to_ACI, rrail_unit) < 0:
-        rrail_unit *= -1
+        rrail_unit = -rrail_unit
 
     theta_lrail = np.abs(angle_between_vectors(ball_to_ACI, lrail_unit))
     theta_rrail = np.abs(angle_between_vectors(ball_to_ACI, rrail_unit))
@@ -154,33 +100,14 @@ def potting_point_jaw_treatment(
         If None, the ball is not considered in the jaws of the pocket.
     """
 
-    jaw = pocket_jaw_map[pocket.id]
-    lrail = table.cushion_segments.linear[jaw.left_rail]
-    ledge = table.cushion_segments.linear[jaw.left_edge]
-    rrail = table.cushion_segments.linear[jaw.right_rail]
-    redge = table.cushion_segments.linear[jaw.right_edge]
-
-    # Find intersection of edge and rail for left and right
-    lpoint = find_intersection_2D(
-        l1x=lrail.lx,
-        l1y=lrail.ly,
-        l10=lrail.l0,
-        l2x=ledge.lx,
-        l2y=ledge.ly,
-        l20=ledge.l0,
-    )
-    rpoint = find_intersection_2D(
-        l1x=rrail.lx,
-        l1y=rrail.ly,
-        l10=rrail.l0,
-        l2x=redge.lx,
-        l2y=redge.ly,
-        l20=redge.l0,
-    )
+    # The intersections of edge and rail for left and right
+    geometry = pocket_geometry(table, pocket.id)
 
-    # Consider the line between lpoint and rpoint. Is the center of object ball on the
-    # same side of this line as the pocket center? If so, it's considered in the jaws
-    in_jaws = are_points_on_same_side(lpoint, rpoint, ball.xyz, pocket.center)
+    # Consider the line between the two. Is the center of object ball on the same side
+    # of this line as the pocket center? If so, it's considered in the jaws
+    in_jaws = are_points_on_same_side(
+        geometry.ltip, geometry.rtip, ball.xyz, pocket.center
+    )
 
     return pocket.center[:2] if in_jaws else None
 
@@ -299,28 +226,24 @@ def is_jaw_in_way(ball: Ball, table: Table, pocket: Pocket) -> bool:
     the jaw tip radius plus the ball radius, then the object ball would hit the close
     cushion, in which case this function returns True.
     """
-    if pocket_jaw_map[pocket.id].corner:
+    if pocket_geometry(table, pocket.id).corner:
         # Only side pockets have this problem
         return False
 
-    jaw = pocket_jaw_map[pocket.id]
-    ljaw_tip = table.cushion_segments.circular[jaw.left_tip]
-    rjaw_tip = table.cushion_segments.circular[jaw.right_tip]
+    geometry = pocket_geometry(table, pocket.id)
 
     # We consider the jaw tip closest to the ball
-    jaw_tip = (
-        ljaw_tip
-        if norm3d(ljaw_tip.center - ball.xyz) < norm3d(rjaw_tip.center - ball.xyz)
-        else rjaw_tip
+    jaw_center, jaw_radius = (
+        (geometry.ljaw_center, geometry.ljaw_radius)
+        if norm3d(geometry.ljaw_center - ball.xyz)
+        < norm3d(geometry.rjaw_center - ball.xyz)
+        else (geometry.rjaw_center, geometry.rjaw_radius)
     )
 
     closest_point_to_jaw = point_on_line_closest_to_point(
-        ball.xyz[:2], get_potting_point(ball, table, pocket), jaw_tip.center[:2]
-    )
-    return (
-        norm2d(closest_point_to_jaw - jaw_tip.center[:2])
-        < jaw_tip.radius + ball.params.R
+        ball.xyz[:2], get_potting_point(ball, table, pocket), jaw_center[:2]
     )
+    return norm2d(closest_point_to_jaw - jaw_center[:2]) < jaw_radius + ball.params.R
 
 
 def open_pockets(ball: Ball, table: Table, balls: Iterable[Ball]) -> set[str]:
@@ -353,28 +276,8 @@ def required_precision(
     value is exactly the variance in phi, within which you will still pot the ball. But,
     it _is_ still a proxy for how difficult the pot is.
     """
-    jaw = pocket_jaw_map[pocket.id]
-    lrail = table.cushion_segments.linear[jaw.left_rail]
-    ledge = table.cushion_segments.linear[jaw.left_edge]
-    rrail = table.cushion_segments.linear[jaw.right_rail]
-    redge = table.cushion_segments.linear[jaw.right_edge]
-
-    ltip = find_intersection_2D(
-        l1x=lrail.lx,
-        l1y=lrail.ly,
-        l10=lrail.l0,
-        l2x=ledge.lx,
-        l2y=ledge.ly,
-        l20=ledge.l0,
-    )
-    rtip = find_intersection_2D(
-        l1x=rrail.lx,
-        l1y=rrail.ly,
-        l10=rrail.l0,
-        l2x=redge.lx,
-        l2y=redge.ly,
-        l20=redge.l0,
-    )
+    geometry = pocket_geometry(table, pocket.id)
+    ltip, rtip = geometry.ltip, geometry.rtip
 
     phi_left = np.abs(
         calc_cut_angle(
@@ -0,0 +1,338 @@
+"""The jaw geometry of a table's pockets, computed once per table
+
+Aiming at a pocket requires the points where each jaw's rail meets its edge, where the
+two rails adjacent to a corner pocket intersect, the directions of those rails, and so
+on. None of that depends on where the balls are, so rather than intersecting the same
+cushion segments for every ball and pocket, :func:`pocket_geometry` computes all of it
+once per pocket and memoizes the result. :func:`table_geometry` does the same for every
+pocket of a table at once:
+
+>>> import pooltool as pt
+>>> from pooltool.ai.pot.geometry import table_geometry
+>>> table = pt.Table.default()
+>>> geometry = table_geometry(table)
+>>> assert table_geometry(table.copy()) is geometry
+
+The memo is keyed on the identities of a pocket's center and of the cushion segments
+around it. Those are immutable (frozen, with read-only arrays), so a table whose
+geometry changes (e.g. with :meth:`pooltool.objects.Table.set_cushion_height`, or by
+replacing a pocket or cushion segment) necessarily holds different objects and gets
+freshly computed geometry.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from operator import itemgetter
+from typing import TypeVar
+
+import attrs
+import numpy as np
+from numpy.typing import NDArray
+
+from pooltool.objects import LinearCushionSegment, Table
+from pooltool.ptmath import find_intersection_2D, norm3d, unit_vector
+
+Coordinate = NDArray[np.float64]
+
+
+@attrs.define(frozen=True)
+class Jaw:
+    """Jaw IDs for a pocket
+
+    Left and right are defined relative to the shooter
+    """
+
+    left_edge: str
+    left_rail: str
+    left_tip: str
+    right_edge: str
+    right_rail: str
+    right_tip: str
+    corner: bool
+
+
+pocket_jaw_map: dict[str, Jaw] = {
+    "lb": Jaw("1", "18", "1t", "2", "3", "2t", True),
+    "lc": Jaw("4", "3", "4t", "5", "6", "5t", False),
+    "lt": Jaw("7", "6", "7t", "8", "9", "8t", True),
+    "rb": Jaw("16", "15", "16t", "17", "18", "17t", True),
+    "rc": Jaw("13", "12", "13t", "14", "15", "14t", False),
+    "rt": Jaw("10", "9", "10t", "11", "12", "11t", True),
+}
+
+
+@attrs.define(frozen=True)
+class PocketGeometry:
+    """The jaw geometry of a pocket
+
+    All arrays are read-only.
+
+    Attributes:
+        id:
+            The pocket ID.
+        corner:
+            Whether this is a corner pocket.
+        center:
+            The pocket's center, of shape (3,).
+        ltip:
+            The intersection of the left jaw's rail and edge, of shape (2,).
+        rtip:
+            The intersection of the right jaw's rail and edge, of shape (2,).
+        ljaw_center:
+            The center of the left jaw's circular tip, of shape (3,).
+        ljaw_radius:
+            The radius of the left jaw's circular tip.
+        rjaw_center:
+            The center of the right jaw's circular tip, of shape (3,).
+        rjaw_radius:
+            The radius of the right jaw's circular tip.
+        mbj:
+            The midpoint between the jaws, of shape (2,). None for corner pockets.
+        aci:
+            The intersection of the adjacent left and right rails, of shape (2,). None
+            for side pockets.
+        lrail_unit:
+            The unit vector of the left rail, of shape (2,). None for side pockets.
+        rrail_unit:
+            The unit vector of the right rail, of shape (2,). None for side pockets.
+    """
+
+    id: str
+    corner: bool
+    center: Coordinate
+    ltip: Coordinate
+    rtip: Coordinate
+    ljaw_center: Coordinate
+    ljaw_radius: float
+    rjaw_center: Coordinate
+    rjaw_radius: float
+    mbj: Coordinate | None = None
+    aci: Coordinate | None = None
+    lrail_unit: Coordinate | None = None
+    rrail_unit: Coordinate | None = None
+
+    def __attrs_post_init__(self):
+        for array in (
+            self.center,
+            self.ltip,
+            self.rtip,
+            self.ljaw_center,
+            self.rjaw_center,
+            self.mbj,
+            self.aci,
+            self.lrail_unit,
+            self.rrail_unit,
+        ):
+            if array is not None:
+                array.flags["WRITEABLE"] = False
+
+    @classmethod
+    def from_table(cls, table: Table, pocket_id: str) -> PocketGeometry:
+        jaw = pocket_jaw_map[pocket_id]
+        linear = table.cushion_segments.linear
+        circular = table.cushion_segments.circular
+
+        lrail, ledge = linear[jaw.left_rail], linear[jaw.left_edge]
+        rrail, redge = linear[jaw.right_rail], linear[jaw.right_edge]
+        ljaw, rjaw = circular[jaw.left_tip], circular[jaw.right_tip]
+
+        geometry = dict(
+            id=pocket_id,
+            corner=jaw.corner,
+            center=np.array(table.pockets[pocket_id].center, dtype=np.float64),
+            ltip=_intersection(lrail, ledge),
+            rtip=_intersection(rrail, redge),
+            ljaw_center=np.array(ljaw.center, dtype=np.float64),
+            ljaw_radius=ljaw.radius,
+            rjaw_center=np.array(rjaw.center, dtype=np.float64),
+            rjaw_radius=rjaw.radius,
+        )
+
+        if jaw.corner:
+            return cls(
+                **geometry,
+                aci=_intersection(lrail, rrail),
+                lrail_unit=unit_vector(lrail.p2 - lrail.p1)[:2],
+                rrail_unit=unit_vector(rrail.p2 - rrail.p1)[:2],
+            )
+
+        # Unfortunately, we don't know which two endpoints of each cushion segment
+        # define the jaws of the pocket, so we calculate distances between the two left
+        # points against the two right points. The minimum distance are the pocket
+        # jaws, and for these two points we calculate the "midpoint between jaws" (MBJ).
+        min_dist = np.inf
+        mbj = np.empty(2)
+        for pl, pr in (
+            (lrail.p1, rrail.p1),
+            (lrail.p1, rrail.p2),
+            (lrail.p2, rrail.p1),
+            (lrail.p2, rrail.p2),
+        ):
+            dist = norm3d(pl - pr)
+            if dist < min_dist:
+                min_dist = dist
+                mbj = (pl + (pr - pl) / 2)[:2]
+
+        return cls(**geometry, mbj=mbj)
+
+
+def _intersection(
+    line1: LinearCushionSegment, line2: LinearCushionSegment
+) -> Coordinate:
+    """The 2D intersection of the lines through two cushion segments"""
+    return np.array(
+        find_intersection_2D(
+            line1.lx, line1.ly, line1.l0, line2.lx, line2.ly, line2.l0
+        ),
+        dtype=np.float64,
+    )
+
+
+@attrs.define(frozen=True)
+class TableGeometry:
+    """The jaw geometry of every pocket of a table
+
+    Besides the per-pocket :class:`PocketGeometry`, the same quantities are stacked into
+    arrays whose first axis indexes the pockets, in table order. Quantities that don't
+    apply to a pocket (e.g. ``mbj`` of a corner pocket) are NaN. All arrays are
+    read-only.
+    """
+
+    pockets: dict[str, PocketGeometry]
+    ids: list[str]
+    corner: NDArray[np.bool_]
+    center: NDArray[np.float64]
+    ltip: NDArray[np.float64]
+    rtip: NDArray[np.float64]
+    ljaw_center: NDArray[np.float64]
+    ljaw_radius: NDArray[np.float64]
+    rjaw_center: NDArray[np.float64]
+    rjaw_radius: NDArray[np.float64]
+    mbj: NDArray[np.float64]
+    aci: NDArray[np.float64]
+    lrail_unit: NDArray[np.float64]
+    rrail_unit: NDArray[np.float64]
+
+    def __attrs_post_init__(self):
+        for field in attrs.fields(TableGeometry):
+            value = getattr(self, field.name)
+            if isinstance(value, np.ndarray):
+                value.flags["WRITEABLE"] = False
+
+    def __getitem__(self, pocket_id: str) -> PocketGeometry:
+        return self.pockets[pocket_id]
+
+    @classmethod
+    def from_pockets(cls, geometries: Iterable[PocketGeometry]) -> TableGeometry:
+        pockets = {geometry.id: geometry for geometry in geometries}
+        geometries = list(pockets.values())
+
+        def stack(name: str, shape: tuple[int, ...]) -> NDArray[np.float64]:
+            array = np.full((len(geometries), *shape), np.nan)
+            for i, geometry in enumerate(geometries):
+                value = getattr(geometry, name)
+                if value is not None:
+                    array[i] = value
+            return array
+
+        return cls(
+            pockets=pockets,
+            ids=list(pockets),
+            corner=np.array([g.corner for g in geometries], dtype=np.bool_),
+            center=stack("center", (3,)),
+            ltip=stack("ltip", (2,)),
+            rtip=stack("rtip", (2,)),
+            ljaw_center=stack("ljaw_center", (3,)),
+            ljaw_radius=stack("ljaw_radius", ()),
+            rjaw_center=stack("rjaw_center", (3,)),
+            rjaw_radius=stack("rjaw_radius", ()),
+            mbj=stack("mbj", (2,)),
+            aci=stack("aci", (2,)),
+            lrail_unit=stack("lrail_unit", (2,)),
+            rrail_unit=stack("rrail_unit", (2,)),
+        )
+
+
+# The number of pockets, and of tables, whose geometry is memoized
+CACHE_SIZE = 64
+
+# Each memo maps the identities of the objects that the geometry is computed from to
+# (those objects, the geometry). Holding onto the objects guarantees that their
+# identities can't be reused by other objects while the entry exists.
+_pocket_cache: OrderedDict[tuple, tuple[tuple, PocketGeometry]] = OrderedDict()
+_table_cache: OrderedDict[tuple, tuple[tuple, TableGeometry]] = OrderedDict()
+
+# Getters of the linear and circular cushion segments around each pocket
+_segment_getters: dict[str, tuple[itemgetter, itemgetter]] = {}
+
+T = TypeVar("T")
+
+
+def _memoized(
+    cache: OrderedDict[tuple, tuple[tuple, T]],
+    key: tuple,
+    dependencies: tuple,
+    compute: Callable[[], T],
+) -> T:
+    if (entry := cache.get(key)) is not None:
+        cache.move_to_end(key)
+        return entry[1]
+
+    value = compute()
+    cache[key] = (dependencies, value)
+    if len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+    return value
+
+
+def pocket_geometry(table: Table, pocket_id: str) -> PocketGeometry:
+    """Return the jaw geometry of a table's pocket
+
+    The geometry is memoized, so repeated calls for the same pocket of the same table,
+    or of copies of it, return the same object. The memo is invalidated as soon as the
+    pocket or any cushion segment around it is replaced.
+    """
+    if (getters := _segment_getters.get(pocket_id)) is None:
+        jaw = pocket_jaw_map[pocket_id]
+        getters = _segment_getters[pocket_id] = (
+            itemgetter(jaw.left_rail, jaw.left_edge, jaw.right_rail, jaw.right_edge),
+            itemgetter(jaw.left_tip, jaw.right_tip),
+        )
+
+    linear, circular = getters
+    dependencies = (
+        table.pockets[pocket_id].center,
+        *linear(table.cushion_segments.linear),
+        *circular(table.cushion_segments.circular),
+    )
+
+    return _memoized(
+        _pocket_cache,
+        (pocket_id, *map(id, dependencies)),
+        dependencies,
+        lambda: PocketGeometry.from_table(table, pocket_id),
+    )
+
+
+def table_geometry(table: Table) -> TableGeometry:
+    """Return the jaw geometry of every pocket of a table
+
+    Like :func:`pocket_geometry`, the geometry is memoized.
+    """
+    pockets = tuple(pocket_geometry(table, pocket_id) for pocket_id in table.pockets)
+
+    return _memoized(
+        _table_cache,
+        tuple(map(id, pockets)),
+        pockets,
+        lambda: TableGeometry.from_pockets(pockets),
+    )
+
+
+def clear_geometry_cache() -> None:
+    """Forget the memoized pocket geometry of every table"""
+    _pocket_cache.clear()
+    _table_cache.clear()
@@ -0,0 +1,472 @@
+"""An AI player that checks its candidate shots by simulating them
+
+:mod:`pooltool.ai.aim` and :mod:`pooltool.ai.pot` aim geometrically: they say where to
+hit the cue ball, but not what happens afterwards. :class:`SimulationAI` starts from
+their solutions, samples variations of them (in ``phi``, ``V0``, ``a``, ``b`` and
+``theta``), simulates each one, and scores the outcome with the game's ruleset. The
+search is anytime: whenever the per-turn time budget runs out, the best shot found so
+far is played.
+
+>>> import pooltool as pt
+>>> from pooltool.ai.search import SimulationAI
+>>> ai = SimulationAI(time_budget=2.0)
+>>> players = [pt.Player("AI", ai=ai), pt.Player("B")]
+>>> game = pt.get_ruleset(pt.GameType.NINEBALL)(players)
+>>> system = pt.System.example()
+>>> action = ai.decide(system, game)
+>>> ai.apply(system, action)
+>>> pt.simulate(system, inplace=True)
+
+Simulations can be fanned out over worker processes with ``workers``. The workers are
+started (and warmed up) on the first turn, or ahead of it with
+:meth:`SimulationAI.start`, and reused on every turn after that until
+:meth:`SimulationAI.close` is called.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any
+
+import attrs
+import numpy as np
+
+import pooltool.constants as const
+from pooltool.ai.action import Action
+from pooltool.ai.aim import at_ball
+from pooltool.ai.pot.batch import evaluate_pots
+from pooltool.ai.pot.core import calc_potting_angle
+from pooltool.evolution.event_based.parallel import SimulationPool
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.physics.engine import PhysicsEngine
+from pooltool.ruleset.datatypes import Ruleset, ShotInfo
+from pooltool.system.datatypes import System
+
+WIN_SCORE = 1000.0
+"""The score of a shot that wins the game (see :func:`score_shot`)"""
+
+Scorer = Callable[[Ruleset, System, ShotInfo], float]
+"""A callable that scores a simulated shot, given the game and the shot's info"""
+
+
+def score_shot(game: Ruleset, shot: System, info: ShotInfo) -> float:
+    """Score a simulated shot from the point of view of the player taking it
+
+    Winning the game scores :data:`WIN_SCORE`, and losing it scores the negative. Fouls
+    score -100, and keeping the turn scores 100. Points earned on the shot (as tallied
+    by the ruleset) are added on top.
+    """
+    player = info.player.name
+
+    if info.game_over:
+        if info.winner is None:
+            return 0.0
+        return WIN_SCORE if info.winner.name == player else -WIN_SCORE
+
+    if not info.legal:
+        return -100.0
+
+    points = info.score[player] - game.score[player]
+    return (0.0 if info.turn_over else 100.0) + points
+
+
+@attrs.define(frozen=True)
+class Candidate:
+    """A candidate shot
+
+    Attributes:
+        action:
+            The cue parameters.
+        ball_call:
+            The ball that the shot is meant to pot, if any. For games that require
+            calling the shot, this is the called ball.
+        pocket_call:
+            The pocket that the shot is meant to pot the ball into, if any.
+    """
+
+    action: Action
+    ball_call: str | None = None
+    pocket_call: str | None = None
+
+
+@attrs.define(frozen=True)
+class SearchResult:
+    """The outcome of a search
+
+    Attributes:
+        candidate:
+            The best candidate found. None if there was nothing to shoot at.
+        score:
+            The best candidate's score. ``-inf`` if no candidate was simulated in time.
+        evaluated:
+            The number of candidates that were simulated and scored.
+        elapsed:
+            The time taken, in seconds.
+        timed_out:
+            Whether the search was cut short by the time budget.
+    """
+
+    candidate: Candidate | None
+    score: float
+    evaluated: int
+    elapsed: float
+    timed_out: bool
+
+
+@attrs.define
+class SimulationAI:
+    """An AI player that picks the best of many simulated candidate shots
+
+    Candidates are generated from geometric solutions: a pot of each legal target ball
+    into each viable pocket (see :func:`pooltool.ai.pot.batch.evaluate_pots`), and a
+    full-ball hit on each target ball (see :func:`pooltool.ai.aim.at_ball`). These are
+    tried first, as is. Afterwards, random variations of them are tried, favoring the
+    easier pots, until the time budget or ``max_candidates`` is used up, or until a
+    candidate scores at least ``good_enough``.
+
+    Ball-in-hand placement isn't searched: the cue ball is shot from where it lies.
+
+    Attributes:
+        time_budget:
+            The time, in seconds, that each call to :meth:`decide` may take. A
+            simulation that is already running when the budget runs out is finished
+            (when ``workers`` is 1) or abandoned (otherwise), so the budget can be
+            overrun by up to one simulation.
+        workers:
+            The number of worker processes that simulate candidates. If 1, candidates
+            are simulated in the calling process.
+        max_candidates:
+            The most candidates simulated per turn.
+        good_enough:
+            The search stops as soon as a candidate scores at least this much. By
+            default, only a shot that wins the game ends the search early.
+        base_V0:
+            The cue speed of the geometric solutions.
+        V0_range:
+            The range that the cue speed of variations is sampled from.
+        phi_spread:
+            The standard deviation, in degrees, of the variations' aiming error.
+        spin:
+            The largest magnitude of the variations' ``a`` and ``b``.
+        max_theta:
+            The largest cue elevation, in degrees, of the variations.
+        seed:
+            The seed of the random number generator that samples the variations.
+        scorer:
+            Scores each simulated candidate (see :func:`score_shot`).
+        engine:
+            The physics engine that simulates the candidates.
+        simulate_kwargs:
+            Keyword arguments forwarded to :func:`pooltool.evolution.simulate`, e.g.
+            ``max_events`` to bound the cost of each candidate.
+        last_result:
+            The result of the last search.
+    """
+
+    time_budget: float = 2.0
+    workers: int = 1
+    max_candidates: int = 500
+    good_enough: float = WIN_SCORE
+    base_V0: float = 2.0
+    V0_range: tuple[float, float] = (0.8, 5.0)
+    phi_spread: float = 0.5
+    spin: float = 0.3
+    max_theta: float = 5.0
+    seed: int | None = None
+    scorer: Scorer = score_shot
+    engine: PhysicsEngine | None = None
+    simulate_kwargs: dict[str, Any] = attrs.field(factory=dict)
+
+    last_result: SearchResult | None = attrs.field(init=False, default=None)
+    _rng: np.random.Generator = attrs.field(init=False)
+    _pool: SimulationPool | None = attrs.field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        if self.workers < 1:
+            raise ValueError(f"workers must be at least 1, not {self.workers}")
+
+        self._rng = np.random.default_rng(self.seed)
+
+    def decide(
+        self,
+        system: System,
+        game: Ruleset,
+        callback: Callable[[Action], None] | None = None,
+    ) -> Action:
+        """Search for the best shot
+
+        If the game requires calling the shot, the chosen shot's ball and pocket are
+        called in ``game.shot_constraints``.
+
+        Args:
+            system:
+                The system, with the balls where they lie. It is not modified.
+            game:
+                The game. Its active player is the one taking the shot.
+            callback:
+                Called with the best action so far, each time a better one is found.
+
+        Returns:
+            Action: The best action found.
+        """
+        result = self.search(system, game, callback)
+
+        if result.candidate is None:
+            # Nothing to aim at. Shoot along the table's long axis.
+            return Action(V0=self.base_V0, phi=90.0, theta=0.0, a=0.0, b=0.0)
+
+        if game.shot_constraints.call_shot:
+            game.shot_constraints = attrs.evolve(
+                game.shot_constraints,
+                ball_call=result.candidate.ball_call,
+                pocket_call=result.candidate.pocket_call,
+            )
+
+        return result.candidate.action
+
+    def apply(self, system: System, action: Action) -> None:
+        """Set the system's cue to the action"""
+        action.apply(system.cue)
+
+    def search(
+        self,
+        system: System,
+        game: Ruleset,
+        callback: Callable[[Action], None] | None = None,
+    ) -> SearchResult:
+        """Simulate and score candidates until the time budget runs out
+
+        See :meth:`decide`, which plays the best candidate of the search.
+        """
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+
+        base = system.copy()
+        base.reset_history()
+
+        candidates = self.candidates(base, game)
+        first = next(candidates, None)
+        if first is None:
+            self.last_result = SearchResult(None, -math.inf, 0, 0.0, False)
+            return self.last_result
+
+        best, best_score = first, -math.inf
+        evaluated = 0
+
+        def consider(candidate: Candidate, shot: System) -> bool:
+            """Score a simulated candidate, and return whether to stop searching"""
+            nonlocal best, best_score, evaluated
+            evaluated += 1
+
+            score = self._score(game, shot, candidate)
+            if score > best_score:
+                best, best_score = candidate, score
+                if callback is not None:
+                    callback(candidate.action)
+
+            return best_score >= self.good_enough
+
+        remaining = _chain(first, candidates, self.max_candidates)
+
+        if self.workers == 1:
+            timed_out = self._search_serially(base, remaining, consider, deadline)
+        else:
+            timed_out = self._search_in_parallel(base, remaining, consider, deadline)
+
+        self.last_result = SearchResult(
+            best, best_score, evaluated, time.perf_counter() - start, timed_out
+        )
+        return self.last_result
+
+    def candidates(self, system: System, game: Ruleset) -> Iterator[Candidate]:
+        """Generate candidate shots, geometric solutions first
+
+        After the geometric solutions, variations of them are generated without end.
+        """
+        constraints = game.shot_constraints
+        cue = system.balls[system.cue.cue_ball_id]
+
+        on_table = [
+            ball_id
+            for ball_id, ball in system.balls.items()
+            if ball_id != cue.id and ball.state.s != const.pocketed
+        ]
+        targets = [ball_id for ball_id in on_table if ball_id in constraints.hittable]
+        if not targets:
+            targets = on_table
+
+        if not targets:
+            return
+
+        pots = evaluate_pots(system, ball_ids=targets)
+
+        bases: list[Candidate] = []
+        for i, j in pots.ranked():
+            ball = system.balls[pots.ball_ids[i]]
+            pocket = system.table.pockets[pots.pocket_ids[j]]
+            phi = calc_potting_angle(cue, ball, system.table, pocket)
+            bases.append(Candidate(self._action(phi), ball.id, pocket.id))
+
+        for ball_id in targets:
+            pocket_call = pots.easiest_pocket(ball_id)
+            if pocket_call is None and constraints.call_shot and pots.pocket_ids:
+                pocket_call = pots.pocket_ids[0]
+            phi = at_ball(system, ball_id)
+            bases.append(Candidate(self._action(phi), ball_id, pocket_call))
+
+        yield from bases
+
+        # Easier pots (listed first) are varied more often
+        weights = 1 / np.arange(1, len(bases) + 1)
+        weights /= weights.sum()
+
+        while True:
+            base = bases[self._rng.choice(len(bases), p=weights)]
+            yield attrs.evolve(base, action=self._vary(base.action))
+
+    def start(self) -> None:
+        """Start the worker processes and wait until they're warmed up
+
+        Otherwise, this happens at the start of the first search, eating into its time
+        budget. Does nothing if ``workers`` is 1 or the workers are already started.
+        """
+        if self.workers == 1 or self._pool is not None:
+            return
+
+        self._pool = SimulationPool(workers=self.workers, engine=self.engine)
+        self._pool.map([System.example() for _ in range(self.workers)])
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self) -> SimulationAI:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _action(self, phi: float) -> Action:
+        return Action(V0=self.base_V0, phi=phi, theta=0.0, a=0.0, b=0.0)
+
+    def _vary(self, action: Action) -> Action:
+        rng = self._rng
+        return Action(
+            V0=rng.uniform(*self.V0_range),
+            phi=(action.phi + rng.normal(0.0, self.phi_spread)) % 360,
+            theta=rng.uniform(0.0, self.max_theta),
+            a=rng.uniform(-self.spin, self.spin),
+            b=rng.uniform(-self.spin, self.spin),
+        )
+
+    def _prepare(self, base: System, candidate: Candidate) -> System:
+        shot = base.copy()
+        self.apply(shot, candidate.action)
+        return shot
+
+    def _score(self, game: Ruleset, shot: System, candidate: Candidate) -> float:
+        # The candidate's call is made for the duration of the scoring, since the
+        # ruleset judges the shot against the called ball and pocket
+        constraints = game.shot_constraints
+        if constraints.call_shot:
+            game.shot_constraints = attrs.evolve(
+                constraints,
+                ball_call=candidate.ball_call,
+                pocket_call=candidate.pocket_call,
+            )
+
+        try:
+            info = game.build_shot_info(shot)
+        finally:
+            game.shot_constraints = constraints
+
+        return self.scorer(game, shot, info)
+
+    def _search_serially(
+        self,
+        base: System,
+        candidates: Iterator[Candidate],
+        consider: Callable[[Candidate, System], bool],
+        deadline: float,
+    ) -> bool:
+        for candidate in candidates:
+            if time.perf_counter() >= deadline:
+                return True
+
+            shot = simulate(
+                self._prepare(base, candidate),
+                engine=self.engine,
+                inplace=True,
+                **self.simulate_kwargs,
+            )
+            if consider(candidate, shot):
+                break
+
+        return False
+
+    def _search_in_parallel(
+        self,
+        base: System,
+        candidates: Iterator[Candidate],
+        consider: Callable[[Candidate, System], bool],
+        deadline: float,
+    ) -> bool:
+        if self._pool is None:
+            self._pool = SimulationPool(workers=self.workers, engine=self.engine)
+
+        pool = self._pool
+        pending: dict[Future[System], Candidate] = {}
+
+        def submit() -> None:
+            # Each worker is kept busy with one simulation, so that few are left
+            # running when the search ends
+            while len(pending) < self.workers:
+                candidate = next(candidates, None)
+                if candidate is None:
+                    return
+                shot = self._prepare(base, candidate)
+                pending[pool.submit(shot, **self.simulate_kwargs)] = candidate
+
+        timed_out = False
+        submit()
+
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                timed_out = True
+                break
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            stop = False
+            for future in done:
+                candidate = pending.pop(future)
+                stop = consider(candidate, future.result()) or stop
+
+            if stop:
+                break
+
+            submit()
+
+        for future in pending:
+            future.cancel()
+
+        return timed_out
+
+
+def _chain(
+    first: Candidate, rest: Iterator[Candidate], limit: int
+) -> Iterator[Candidate]:
+    """The first candidate followed by the rest, up to ``limit`` candidates in all"""
+    if limit < 1:
+        return
+
+    yield first
+    for count, candidate in enumerate(rest, start=2):
+        if count > limit:
+            return
+        yield candidate
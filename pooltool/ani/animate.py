@@ -222,6 +222,10 @@ class Interface(ShowBase):
     def __init__(self, config: ShowBaseConfig):
         self.showbase_config = config
         self._window_ready = False
+
+        # Apply Panda3D settings from the config, before the window is opened
+        settings.read().apply_panda_settings()
+
         super().__init__(self, windowType=self.showbase_config.window_type)
 
         self.openMainWindow(
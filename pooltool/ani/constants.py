@@ -5,7 +5,6 @@ from __future__ import annotations
 from pathlib import Path
 
 import pooltool as pt
-from pooltool.utils import panda_path
 
 menu_text_scale = 0.07
 menu_text_scale_small = 0.04
@@ -45,9 +44,9 @@ model_dir: Path = Path(pt.__file__).parent / "models"
 
 logo_dir = Path(pt.__file__).parent / "logo"
 logo_paths = {
-    "default": panda_path(logo_dir / "logo.png"),
-    "small": panda_path(logo_dir / "logo_small.png"),
-    "smaller": panda_path(logo_dir / "logo_smaller.png"),
-    "pt": panda_path(logo_dir / "logo_pt.png"),
-    "pt_smaller": panda_path(logo_dir / "logo_pt_smaller.png"),
+    "default": logo_dir / "logo.png",
+    "small": logo_dir / "logo_small.png",
+    "smaller": logo_dir / "logo_smaller.png",
+    "pt": logo_dir / "logo_pt.png",
+    "pt_smaller": logo_dir / "logo_pt_smaller.png",
 }
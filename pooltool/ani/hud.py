@@ -338,7 +338,7 @@ class Logo(BaseHUDElement):
         BaseHUDElement.__init__(self)
 
         self.img = OnscreenImage(
-            image=logo_paths["pt_smaller"],
+            image=panda_path(logo_paths["pt_smaller"]),
             pos=(0.94, 0, 0.89),
             parent=Global.render2d,
             scale=(0.08 * 0.49, 1, 0.08),
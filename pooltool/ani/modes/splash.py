@@ -12,6 +12,7 @@ from pooltool.ani.fonts import load_font
 from pooltool.ani.globals import Global
 from pooltool.ani.modes.datatypes import BaseMode, Mode
 from pooltool.ani.mouse import MouseMode, mouse
+from pooltool.utils import panda_path
 
 
 class SplashMode(BaseMode):
@@ -59,7 +60,7 @@ class SplashMode(BaseMode):
 
         # Add the pooltool logo below
         self.logo_image = OnscreenImage(
-            image=logo_paths["default"],
+            image=panda_path(logo_paths["default"]),
             pos=(0, 0, -0.2),
             parent=self.splash_frame,
             scale=(1.4 * 0.2, 1, 1.4 * 0.18),
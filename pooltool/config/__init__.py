@@ -8,7 +8,6 @@ from pathlib import Path
 from typing import Any
 
 import attrs
-from panda3d.core import WindowProperties, loadPrcFileData
 
 from pooltool.config.paths import GENERAL_CONFIG
 from pooltool.game.datatypes import GameType
@@ -67,6 +66,8 @@ class SystemConfig:
 
     def apply_settings(self) -> None:
         """Apply Panda3D configuration settings at runtime."""
+        from panda3d.core import WindowProperties, loadPrcFileData
+
         loadPrcFileData(
             "", f"show-frame-rate-meter {'#t' if self.show_frame_rate else '#f'}"
         )
@@ -391,6 +392,3 @@ class SettingsProxy(Settings):
 
 
 settings = SettingsProxy(GENERAL_CONFIG)
-
-# Apply Panda3D settings from the config
-settings.read().apply_panda_settings()
@@ -1,10 +1,25 @@
 """Shot evolution algorithm routines and utilities"""
 
-from pooltool.evolution.continuous import continuize, interpolate_ball_states
+from pooltool.evolution.continuous import (
+    continuize,
+    interpolate_ball_states,
+    interpolate_ball_states_array,
+    interpolate_system_states_array,
+)
+from pooltool.evolution.event_based.context import SimulationContext
+from pooltool.evolution.event_based.parallel import simulate_many
+from pooltool.evolution.event_based.profile import SimulationProfile
 from pooltool.evolution.event_based.simulate import simulate
+from pooltool.evolution.event_based.warmup import warmup
 
 __all__ = [
     "continuize",
     "simulate",
+    "simulate_many",
+    "warmup",
+    "SimulationContext",
+    "SimulationProfile",
     "interpolate_ball_states",
+    "interpolate_ball_states_array",
+    "interpolate_system_states_array",
 ]
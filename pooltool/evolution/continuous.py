@@ -1,13 +1,16 @@
 """Module for building a time-dense system trajectory and interpolating ball states
 
-For an explanation, see :func:`continuize` and :func:`interpolate_ball_states`
+For an explanation, see :func:`continuize`, :func:`interpolate_ball_states` and
+:func:`interpolate_ball_states_array`
 """
 
 from collections.abc import Sequence
 
 import numpy as np
+from numba import jit
 from numpy.typing import NDArray
 
+import pooltool.constants as const
 import pooltool.physics.evolve as evolve
 from pooltool.events import filter_ball
 from pooltool.objects.ball.datatypes import Ball, BallHistory, BallState
@@ -109,88 +112,142 @@ def continuize(system: System, dt: float = 0.01, inplace: bool = False) -> Syste
     num_timestamps = int(system.events[-1].time // dt) + 1
 
     for ball in system.balls.values():
-        # Create a new history and add the zeroth event
-        history = BallHistory()
-        history.add(ball.history[0])
-
-        rvw, s = ball.history[0].rvw, ball.history[0].s
-
         # Get all events that the ball is involved in, even the null_event events
         # that mark the start and end times
         events = filter_ball(system.events, ball.id, keep_nonevent=True)
 
-        # Tracks which event is currently being handled
-        count = 0
-
-        # The elapsed simulation time (as of the last timepoint)
-        elapsed = 0.0
-
-        for n in range(num_timestamps):
-            if n == (num_timestamps - 1):
-                # We made it to the end. the difference between the final time and
-                # the elapsed time should be < dt
-                assert events[-1].time - elapsed < dt
-                break
-
-            if events[count + 1].time - elapsed > dt:
-                # This is the easy case. There is no upcoming event so we simply
-                # evolve the state an amount dt
-                evolve_time = dt
-
-            else:
-                # The next event (and perhaps an arbitrary number of subsequent
-                # events) occurs before the next timestamp. Find the last event
-                # between the current timestamp and the next timestamp. This will be
-                # used as a launching point to simulate the ball state to the next
-                # timestamp
-
-                while True:
-                    count += 1
-
-                    if events[count + 1].time - elapsed > dt:
-                        # OK, we found the last event between the current timestamp
-                        # and the next timestamp. It is events[count].
-                        break
-
-                # We need to get the ball's outgoing state from the event. We'll
-                # evolve the system from this state.
-                state = events[count].get_ball(ball.id, initial=False).state.copy()
-
-                rvw, s = state.rvw, state.s
-
-                # Since this event occurs between two timestamps, we won't be
-                # evolving a full dt. Instead, we evolve this much:
-                evolve_time = elapsed + dt - events[count].time
-
-            # Whether it was the hard path or the easy path, the ball state is
-            # properly defined and we know how much we need to simulate.
-            rvw, s = evolve.evolve_ball_motion(
-                state=s,
-                rvw=rvw,
-                R=ball.params.R,
-                m=ball.params.m,
-                u_s=ball.params.u_s,
-                u_sp=ball.params.u_sp,
-                u_r=ball.params.u_r,
-                g=ball.params.g,
-                t=evolve_time,
-            )
+        # The state each event launches the ball with, and the time it was launched.
+        # The first event launches the ball from its initial state, and null events
+        # that don't involve the ball carry on the launch of the preceding event.
+        num_events = len(events)
+        event_times = np.empty(num_events, dtype=np.float64)
+        launch_times = np.empty(num_events, dtype=np.float64)
+        launch_rvws = np.empty((num_events, 3, 3), dtype=np.float64)
+        launch_ss = np.empty(num_events, dtype=np.int64)
+
+        launch = ball.history[0]
+        launch_time = events[0].time
+        for idx, event in enumerate(events):
+            if idx > 0 and event.event_type.has_ball():
+                launch = event.get_ball(ball.id, initial=False).state
+                launch_time = event.time
+
+            event_times[idx] = event.time
+            launch_times[idx] = launch_time
+            launch_rvws[idx] = launch.rvw
+            launch_ss[idx] = launch.s
+
+        # The history holds the initial state, the states at each timepoint except the
+        # last, and the final state
+        rvws = np.empty((num_timestamps + 1, 3, 3), dtype=np.float64)
+        ss = np.empty(num_timestamps + 1, dtype=np.int64)
+        ts = np.empty(num_timestamps + 1, dtype=np.float64)
+
+        elapsed = _evolve_timepoints(
+            event_times,
+            launch_times,
+            launch_rvws,
+            launch_ss,
+            ball.params.R,
+            ball.params.m,
+            ball.params.u_s,
+            ball.params.u_sp,
+            ball.params.u_r,
+            ball.params.g,
+            dt,
+            rvws[1:-1],
+            ss[1:-1],
+            ts[1:-1],
+        )
+
+        # We made it to the end. the difference between the final time and the elapsed
+        # time should be < dt
+        assert events[-1].time - elapsed < dt
 
-            history.add(BallState(rvw, s, elapsed + dt))
-            elapsed += dt
+        initial, final = ball.history[0], ball.history[-1]
+        rvws[0], ss[0], ts[0] = initial.rvw, initial.s, initial.t
 
         # There is a finale. The final state is missing from the continuous history,
         # whose final state is within dt of the true final state. We add the final
         # state to the continous history even though this breaks the promise of
         # uniformly spaced timestamps
-        history.add(ball.history[-1])
+        rvws[-1], ss[-1], ts[-1] = final.rvw, final.s, final.t
 
         # Attach the newly created history to the ball
-        ball.history_cts = history
+        ball.history_cts = BallHistory.from_vectorization((rvws, ss, ts), copy=False)
 
     return system
 
 
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evolve_timepoints(
+    event_times: NDArray[np.float64],
+    launch_times: NDArray[np.float64],
+    launch_rvws: NDArray[np.float64],
+    launch_ss: NDArray[np.int64],
+    R: float,
+    m: float,
+    u_s: float,
+    u_sp: float,
+    u_r: float,
+    g: float,
+    dt: float,
+    rvws: NDArray[np.float64],
+    ss: NDArray[np.int64],
+    ts: NDArray[np.float64],
+) -> float:
+    """Evaluate a ball's state at uniformly spaced timepoints
+
+    (just-in-time compiled)
+
+    Each timepoint is evolved directly from the launch state of the last event that
+    precedes it, and written into the preallocated output arrays ``rvws``, ``ss``,
+    and ``ts``, whose length is the number of timepoints.
+
+    Returns:
+        float: The time of the last timepoint.
+    """
+    # Tracks which event is currently being handled
+    count = 0
+
+    # The elapsed simulation time (as of the last timepoint)
+    elapsed = 0.0
+
+    # The last event may fall exactly on the last timepoint, so there may be no next
+    # event to compare against. The bounds are checked explicitly, since numba doesn't.
+    last = len(event_times) - 1
+
+    for n in range(len(ts)):
+        if count < last and event_times[count + 1] - elapsed <= dt:
+            # The next event (and perhaps an arbitrary number of subsequent events)
+            # occurs before the next timestamp. Find the last event between the
+            # current timestamp and the next timestamp.
+            while True:
+                count += 1
+
+                if count == last or event_times[count + 1] - elapsed > dt:
+                    break
+
+        rvw, s = evolve.evolve_ball_motion(
+            launch_ss[count],
+            launch_rvws[count],
+            R,
+            m,
+            u_s,
+            u_sp,
+            u_r,
+            g,
+            elapsed + dt - launch_times[count],
+        )
+
+        rvws[n] = rvw
+        ss[n] = s
+        ts[n] = elapsed + dt
+        elapsed += dt
+
+    return elapsed
+
+
 def interpolate_ball_states(
     ball: Ball,
     timestamps: NDArray[np.float64] | Sequence[float],
@@ -246,8 +303,12 @@ def interpolate_ball_states(
     if not np.all(np.diff(timestamps) >= 0):
         raise ValueError("Timestamps must be in ascending order")
 
-    min_time = history[0].t
-    max_time = history[-1].t
+    # Only the states that are returned are created, so the history is read as arrays
+    rvws, ss, ts = history.vectorize()
+    history_len = len(ts)
+
+    min_time = float(ts[0])
+    max_time = float(ts[-1])
 
     if not extrapolate and (timestamps[0] < min_time or timestamps[-1] > max_time):
         raise ValueError(
@@ -255,39 +316,37 @@ def interpolate_ball_states(
         )
 
     result_states = []
-    history_array = history.states
-    history_len = len(history_array)
 
     idx = 0
 
     for t in timestamps:
         if t < min_time:
-            result_states.append(history_array[0].copy())
+            result_states.append(_history_state(rvws, ss, ts, 0))
             continue
         elif t > max_time:
-            result_states.append(history_array[-1].copy())
+            result_states.append(_history_state(rvws, ss, ts, history_len - 1))
             continue
 
         # Find the nearest preceding state in history
-        while idx < history_len - 1 and history_array[idx + 1].t <= t:
+        while idx < history_len - 1 and ts[idx + 1] <= t:
             idx += 1
 
         # Go back one step if we've advanced too far
-        if history_array[idx].t > t and idx > 0:
+        if ts[idx] > t and idx > 0:
             idx -= 1
 
         # Get the reference state to evolve from
-        ref_state = history_array[idx]
+        ref_t = float(ts[idx])
 
-        if abs(ref_state.t - t) < 1e-10:
+        if abs(ref_t - t) < 1e-10:
             # The timestamp exactly matches a history state, use it directly
-            result_states.append(ref_state.copy())
+            result_states.append(_history_state(rvws, ss, ts, idx))
             continue
 
-        evolve_time = t - ref_state.t
+        evolve_time = t - ref_t
         rvw, s = evolve.evolve_ball_motion(
-            state=ref_state.s,
-            rvw=ref_state.rvw,
+            state=int(ss[idx]),
+            rvw=rvws[idx],
             R=params.R,
             m=params.m,
             u_s=params.u_s,
@@ -300,3 +359,186 @@ def interpolate_ball_states(
         result_states.append(BallState(rvw=rvw, s=s, t=t))
 
     return result_states
+
+
+def _history_state(
+    rvws: NDArray[np.float64],
+    ss: NDArray[np.float64],
+    ts: NDArray[np.float64],
+    idx: int,
+) -> BallState:
+    """Create a copy of the state at an index of a vectorized history"""
+    return BallState(rvws[idx].copy(), int(ss[idx]), float(ts[idx]))
+
+
+def interpolate_ball_states_array(
+    ball: Ball,
+    timestamps: NDArray[np.float64] | Sequence[float],
+    *,
+    extrapolate: bool = False,
+) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """Calculate exact ball states at arbitrary timestamps, as arrays
+
+    This is the array counterpart of :func:`interpolate_ball_states`, and produces the
+    same states. Rather than evolving the ball timestamp by timestamp in Python, the
+    reference state of every timestamp is found with a single :func:`numpy.searchsorted`
+    against the history times, and the states are evolved by a just-in-time compiled
+    kernel. No :class:`pooltool.objects.BallState` objects are created, which makes this
+    suited for sampling many shots at high (e.g. camera) frame rates.
+
+    Unlike :func:`interpolate_ball_states`, the timestamps don't have to be in
+    ascending order.
+
+    Args:
+        ball:
+            The Ball object containing the history and physical parameters.
+        timestamps:
+            A sequence or numpy array of timestamps at which to calculate ball states.
+            Shape (T,).
+        extrapolate:
+            If True, timestamps outside the history's time range will use the nearest boundary
+            state (initial or final). If False (default), a ValueError is raised for timestamps
+            outside the range.
+
+    Returns:
+        A length 2 tuple of the kinematic states (shape (T, 3, 3)) and the motion states
+        (shape (T,)) at the given timestamps.
+
+    Raises:
+        ValueError:
+            If history is empty or if timestamps are out of range and extrapolate is False.
+
+    Examples:
+        >>> import pooltool as pt
+        >>> import numpy as np
+        >>> system = pt.simulate(pt.System.example())
+        >>> # Sample the cue ball's trajectory at 240 frames per second
+        >>> timestamps = np.arange(0, system.t, 1 / 240)
+        >>> rvws, ss = pt.interpolate_ball_states_array(system.balls["cue"], timestamps)
+        >>> rvws.shape == (len(timestamps), 3, 3)
+        True
+
+    See Also:
+        - :func:`interpolate_system_states_array`
+    """
+    history = ball.history
+
+    if history.empty:
+        raise ValueError("Cannot interpolate from empty history")
+
+    timestamps = np.asarray(timestamps, dtype=np.float64).reshape(-1)
+    rvws, ss, ts = history.vectorize()
+
+    if len(timestamps):
+        min_time, max_time = ts[0], ts[-1]
+        out_of_range = timestamps.min() < min_time or timestamps.max() > max_time
+        if not extrapolate and out_of_range:
+            raise ValueError(
+                f"Timestamps must be within history time range ({min_time}, {max_time})"
+            )
+
+    # The reference state of each timestamp is the last one that doesn't succeed it.
+    # Timestamps before the history are clamped to the initial state.
+    idxs = np.maximum(np.searchsorted(ts, timestamps, side="right") - 1, 0)
+
+    params = ball.params
+    return _evolve_from_references(
+        rvws,
+        ss.astype(np.int64),
+        ts,
+        idxs,
+        timestamps,
+        params.R,
+        params.m,
+        params.u_s,
+        params.u_sp,
+        params.u_r,
+        params.g,
+    )
+
+
+def interpolate_system_states_array(
+    system: System,
+    timestamps: NDArray[np.float64] | Sequence[float],
+    *,
+    extrapolate: bool = False,
+) -> dict[str, tuple[NDArray[np.float64], NDArray[np.int64]]]:
+    """Calculate exact states of every ball at arbitrary timestamps, as arrays
+
+    This calls :func:`interpolate_ball_states_array` for each ball of the system.
+
+    Args:
+        system:
+            A simulated system.
+        timestamps:
+            A sequence or numpy array of timestamps at which to calculate ball states.
+            Shape (T,).
+        extrapolate:
+            See :func:`interpolate_ball_states_array`.
+
+    Returns:
+        A dictionary mapping each ball ID to its kinematic states (shape (T, 3, 3))
+        and motion states (shape (T,)) at the given timestamps.
+
+    Examples:
+        >>> import pooltool as pt
+        >>> import numpy as np
+        >>> system = pt.simulate(pt.System.example())
+        >>> timestamps = np.arange(0, system.t, 1 / 240)
+        >>> states = pt.interpolate_system_states_array(system, timestamps)
+        >>> rvws, ss = states["cue"]
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64).reshape(-1)
+
+    return {
+        ball_id: interpolate_ball_states_array(
+            ball, timestamps, extrapolate=extrapolate
+        )
+        for ball_id, ball in system.balls.items()
+    }
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evolve_from_references(
+    ref_rvws: NDArray[np.float64],
+    ref_ss: NDArray[np.int64],
+    ref_ts: NDArray[np.float64],
+    idxs: NDArray[np.int64],
+    timestamps: NDArray[np.float64],
+    R: float,
+    m: float,
+    u_s: float,
+    u_sp: float,
+    u_r: float,
+    g: float,
+) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """Evolve each timestamp's reference state up to the timestamp
+
+    (just-in-time compiled)
+
+    Timestamps that (nearly) coincide with their reference state, or that come before
+    or after the history, take the reference state as is.
+    """
+    num_timestamps = len(timestamps)
+    rvws = np.empty((num_timestamps, 3, 3), dtype=np.float64)
+    ss = np.empty(num_timestamps, dtype=np.int64)
+
+    min_time, max_time = ref_ts[0], ref_ts[-1]
+
+    for k in range(num_timestamps):
+        idx = idxs[k]
+        t = timestamps[k]
+        evolve_time = t - ref_ts[idx]
+
+        if t < min_time or t > max_time or abs(evolve_time) < 1e-10:
+            rvws[k] = ref_rvws[idx]
+            ss[k] = ref_ss[idx]
+            continue
+
+        rvw, s = evolve.evolve_ball_motion(
+            ref_ss[idx], ref_rvws[idx], R, m, u_s, u_sp, u_r, g, evolve_time
+        )
+        rvws[k] = rvw
+        ss[k] = s
+
+    return rvws, ss
@@ -0,0 +1,182 @@
+"""A struct-of-arrays representation of ball states for the event-based simulation
+
+For an explanation, see :class:`BallStateArrays`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import attrs
+import numpy as np
+from numpy.typing import NDArray
+
+import pooltool.physics.evolve as evolve
+from pooltool.events import Event
+from pooltool.events.utils import event_type_to_ball_indices
+from pooltool.objects.ball.datatypes import Ball, BallHistory, BallState
+from pooltool.system.datatypes import System
+
+
+def ball_params_matrix(balls: Sequence[Ball]) -> NDArray[np.float64]:
+    """Pack the parameters of balls into an (N, 6) matrix
+
+    The columns are ``R``, ``m``, ``u_s``, ``u_sp``, ``u_r``, and ``g``.
+    """
+    return np.array(
+        [
+            [
+                ball.params.R,
+                ball.params.m,
+                ball.params.u_s,
+                ball.params.u_sp,
+                ball.params.u_r,
+                ball.params.g,
+            ]
+            for ball in balls
+        ],
+        dtype=np.float64,
+    ).reshape(len(balls), 6)
+
+
+def involved_ball_ids(event: Event) -> list[str]:
+    """Return the IDs of the balls that take part in an event"""
+    return [
+        event.ids[idx]
+        for idx in sorted(event_type_to_ball_indices.get(event.event_type, ()))
+    ]
+
+
+@attrs.define
+class BallStateArrays:
+    """All ball states of a system, packed into contiguous arrays
+
+    Rather than building a new :class:`pooltool.objects.BallState` for every ball at
+    every event, and pulling each ball's parameters one attribute at a time, the event
+    loop keeps:
+
+    (1) the kinematic states of all balls in one ``(N, 3, 3)`` array (:attr:`rvw`),
+    (2) the motion states in one ``(N,)`` integer array (:attr:`s`), and
+    (3) the ball parameters in one ``(N, 6)`` parameter matrix (:attr:`params`).
+
+    Every ball is evolved with a single numba call per event (see
+    :func:`pooltool.physics.evolve.evolve_ball_motions`), and the ball histories are
+    recorded as array snapshots. Balls and ball histories are only rebuilt at the end of
+    the simulation (see :meth:`unpack`).
+
+    While packed, the ``rvw`` attribute of each ball's state is a view into
+    :attr:`rvw`, so the collision detection and resolution code operates on the arrays
+    transparently. Resolvers that replace a ball's state outright are accounted for by
+    :meth:`sync`.
+
+    Attributes:
+        ids:
+            The ball IDs, in the order of the arrays' first axis.
+        rvw:
+            The kinematic states of all balls. Shape (N, 3, 3).
+        s:
+            The motion states of all balls. Shape (N,).
+        params:
+            The ball parameters. Shape (N, 6), where the columns are ``R``, ``m``,
+            ``u_s``, ``u_sp``, ``u_r``, and ``g``.
+    """
+
+    ids: list[str]
+    rvw: NDArray[np.float64]
+    s: NDArray[np.int64]
+    params: NDArray[np.float64]
+
+    _index: dict[str, int] = attrs.field(init=False)
+    _rvw_history: list[NDArray[np.float64]] = attrs.field(init=False, factory=list)
+    _s_history: list[NDArray[np.int64]] = attrs.field(init=False, factory=list)
+    _t_history: list[float] = attrs.field(init=False, factory=list)
+
+    def __attrs_post_init__(self) -> None:
+        self._index = {ball_id: idx for idx, ball_id in enumerate(self.ids)}
+
+    @classmethod
+    def pack(cls, shot: System) -> BallStateArrays:
+        """Pack the ball states of a system into arrays
+
+        The ``rvw`` attribute of each ball's state is replaced with a view into the
+        packed array.
+        """
+        balls = list(shot.balls.values())
+
+        arrays = cls(
+            ids=[ball.id for ball in balls],
+            rvw=np.array([ball.state.rvw for ball in balls], dtype=np.float64),
+            s=np.array([ball.state.s for ball in balls], dtype=np.int64),
+            params=ball_params_matrix(balls),
+        )
+
+        for idx, ball in enumerate(balls):
+            ball.state.rvw = arrays.rvw[idx]
+
+        return arrays
+
+    def evolve(self, dt: float) -> None:
+        """Evolve every ball an amount of time dt"""
+        evolve.evolve_ball_motions(self.s, self.rvw, self.params, dt)
+
+    def sync(self, shot: System, ball_ids: list[str]) -> None:
+        """Copy the states of the given balls back into the arrays
+
+        Resolvers may assign a brand new state to a ball (rather than modifying the
+        state's view into the arrays). The new state is copied into the arrays and the
+        ball's state is re-pointed at its view.
+        """
+        for ball_id in ball_ids:
+            idx = self._index[ball_id]
+            state = shot.balls[ball_id].state
+            self.rvw[idx] = state.rvw
+            self.s[idx] = state.s
+            state.rvw = self.rvw[idx]
+
+    def record(self, shot: System, event: Event, states: bool = True) -> None:
+        """The array counterpart to :meth:`pooltool.System._update_history`"""
+        shot.t = event.time
+        if states:
+            self._rvw_history.append(self.rvw.copy())
+            self._s_history.append(self.s.copy())
+            self._t_history.append(event.time)
+        shot.events.append(event)
+
+    def rerecord(self) -> None:
+        """Overwrite the most recently recorded states with the current states"""
+        self._rvw_history[-1] = self.rvw.copy()
+        self._s_history[-1] = self.s.copy()
+
+    def unpack(self, shot: System) -> None:
+        """Build each ball's history from the recorded states
+
+        Each ball's state is set to the last state of its history, which is independent
+        of the arrays. If no states were recorded, the histories are left empty and
+        each ball is given an independent copy of its current state.
+        """
+        if not self._t_history:
+            for idx, ball_id in enumerate(self.ids):
+                ball = shot.balls[ball_id]
+                ball.state = BallState(self.rvw[idx].copy(), ball.state.s, shot.t)
+            return
+
+        rvws = np.array(self._rvw_history)
+        ss = np.array(self._s_history)
+        ts = np.array(self._t_history)
+
+        for idx, ball_id in enumerate(self.ids):
+            ball = shot.balls[ball_id]
+            ball.history = BallHistory.from_vectorization(
+                (rvws[:, idx], ss[:, idx], ts)
+            )
+            ball.state = ball.history[-1]
+
+    def unpacked(self, shot: System) -> System:
+        """Return a copy of a packed system, as it stands after the last recorded event
+
+        Unlike :meth:`unpack`, the arrays and the system are left untouched, so the
+        simulation can carry on.
+        """
+        copy = shot.copy()
+        self.unpack(copy)
+        return copy
@@ -0,0 +1,252 @@
+"""Broad-phase pruning of collision checks with swept bounding boxes
+
+For an explanation, see :class:`BroadPhase`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import attrs
+import numpy as np
+from numba import jit
+from numpy.typing import NDArray
+
+import pooltool.constants as const
+import pooltool.ptmath as ptmath
+from pooltool.evolution.event_based.arrays import ball_params_matrix
+from pooltool.evolution.event_based.cache import TransitionCache
+from pooltool.evolution.event_based.solve import get_u
+from pooltool.objects.table.components import (
+    CircularCushionSegment,
+    LinearCushionSegment,
+    Pocket,
+)
+from pooltool.objects.table.datatypes import Table
+from pooltool.system.datatypes import System
+
+Box = tuple[float, float, float, float]
+"""An axis-aligned bounding box in the table plane: (xmin, xmax, ymin, ymax)"""
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def swept_bounding_boxes(
+    rvws: NDArray[np.float64],
+    ss: NDArray[np.int64],
+    params: NDArray[np.float64],
+    dts: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Get the bounding box of each ball center's path over a time window
+
+    (just-in-time compiled)
+
+    Until its next transition, a ball center follows a parabola (or a line, or stays
+    put). The bounding box covers the parabola's endpoints and, if it falls within the
+    window, its vertex.
+
+    Args:
+        rvws:
+            The kinematic states of the N balls. Shape (N, 3, 3).
+        ss:
+            The motion states of the N balls. Shape (N,).
+        params:
+            The ball parameters. Shape (N, 6), where the columns are ``R``, ``m``,
+            ``u_s``, ``u_sp``, ``u_r``, and ``g``.
+        dts:
+            The length of each ball's time window. This should not extend beyond the
+            ball's next transition. Shape (N,).
+
+    Returns:
+        NDArray[np.float64]:
+            The bounding boxes as rows of (xmin, xmax, ymin, ymax). Shape (N, 4).
+            Windows of infinite length produce unbounded boxes.
+    """
+    num_balls = len(ss)
+    boxes = np.empty((num_balls, 4), dtype=np.float64)
+
+    for i in range(num_balls):
+        rvw = rvws[i]
+        s = ss[i]
+        cx, cy = rvw[0, 0], rvw[0, 1]
+
+        if s == const.spinning or s == const.pocketed or s == const.stationary:
+            boxes[i, 0], boxes[i, 1] = cx, cx
+            boxes[i, 2], boxes[i, 3] = cy, cy
+            continue
+
+        tau = dts[i]
+        if not np.isfinite(tau):
+            boxes[i, 0], boxes[i, 1] = -np.inf, np.inf
+            boxes[i, 2], boxes[i, 3] = -np.inf, np.inf
+            continue
+
+        R = params[i, 0]
+        mu = params[i, 2] if s == const.sliding else params[i, 4]
+        g = params[i, 5]
+
+        phi = ptmath.angle(rvw[1])
+        v = ptmath.norm3d(rvw[1])
+        u = get_u(rvw, R, phi, s)
+
+        K = -0.5 * mu * g
+        cos_phi = np.cos(phi)
+        sin_phi = np.sin(phi)
+
+        ax = K * (u[0] * cos_phi - u[1] * sin_phi)
+        ay = K * (u[0] * sin_phi + u[1] * cos_phi)
+        bx = v * cos_phi
+        by = v * sin_phi
+
+        boxes[i, 0], boxes[i, 1] = _parabola_extent(cx, bx, ax, tau)
+        boxes[i, 2], boxes[i, 3] = _parabola_extent(cy, by, ay, tau)
+
+    return boxes
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _parabola_extent(c: float, b: float, a: float, tau: float) -> tuple[float, float]:
+    """Min and max of c + b*t + a*t^2 over 0 <= t <= tau"""
+    end = c + b * tau + a * tau**2
+    lo, hi = min(c, end), max(c, end)
+
+    if a != 0.0:
+        t_vertex = -b / (2 * a)
+        if 0.0 < t_vertex < tau:
+            vertex = c + b * t_vertex + a * t_vertex**2
+            lo, hi = min(lo, vertex), max(hi, vertex)
+
+    return lo, hi
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def overlapping_pairs(
+    boxes: NDArray[np.float64],
+    params: NDArray[np.float64],
+    idx1: NDArray[np.int64],
+    idx2: NDArray[np.int64],
+    margin: float,
+) -> NDArray[np.bool_]:
+    """Check which ball pairs have bounding boxes within striking distance
+
+    (just-in-time compiled)
+
+    Two balls may only collide if their boxes, each grown by the larger of the two
+    radii (plus ``margin``), overlap.
+
+    Returns:
+        NDArray[np.bool_]: True for each pair that may collide. Shape (M,).
+    """
+    num_pairs = len(idx1)
+    overlaps = np.empty(num_pairs, dtype=np.bool_)
+
+    for k in range(num_pairs):
+        i, j = idx1[k], idx2[k]
+        pad = 2 * max(params[i, 0], params[j, 0]) + margin
+        overlaps[k] = (
+            boxes[i, 0] - pad <= boxes[j, 1]
+            and boxes[j, 0] - pad <= boxes[i, 1]
+            and boxes[i, 2] - pad <= boxes[j, 3]
+            and boxes[j, 2] - pad <= boxes[i, 3]
+        )
+
+    return overlaps
+
+
+@attrs.define
+class BroadPhase:
+    """Swept bounding box pruning for the collision checks of a simulation
+
+    Every uncached ball-ball, ball-cushion and ball-pocket pair would otherwise reach a
+    quartic or quadratic solve. Instead, before each round of collision detection,
+    :meth:`update` bounds the path of every ball from the current time up to the ball's
+    next transition (see :class:`pooltool.evolution.event_based.cache.TransitionCache`).
+    Pairs whose bounding boxes are out of reach of each other are assigned an infinite
+    collision time without being solved.
+
+    This is safe because a cached collision time is only ever used until either object
+    takes part in an event, and a ball's transition is such an event. A collision that
+    would happen after a transition is recomputed once the transition happens. For this
+    to hold, transition events have to be resolved (see the ``include`` argument of
+    :func:`pooltool.evolution.simulate`).
+
+    Attributes:
+        linear:
+            The bounding box of each linear cushion segment.
+        circular:
+            The bounding box of each circular cushion segment.
+        pockets:
+            The bounding box of each pocket.
+        margin:
+            Extra distance added to every overlap check, to stay clear of round-off.
+    """
+
+    linear: dict[str, Box]
+    circular: dict[str, Box]
+    pockets: dict[str, Box]
+    margin: float = 1e-6
+
+    boxes: NDArray[np.float64] = attrs.field(init=False, repr=False)
+    _ball_boxes: dict[str, Box] = attrs.field(init=False, repr=False, factory=dict)
+
+    @classmethod
+    def from_table(cls, table: Table) -> BroadPhase:
+        return cls(
+            linear=cls.linear_boxes(table.cushion_segments.linear.values()),
+            circular=cls.circle_boxes(table.cushion_segments.circular.values()),
+            pockets=cls.circle_boxes(table.pockets.values()),
+        )
+
+    @staticmethod
+    def linear_boxes(segments: Iterable[LinearCushionSegment]) -> dict[str, Box]:
+        """Get the bounding box of each linear cushion segment"""
+        return {
+            segment.id: _segment_box(segment.p1, segment.p2) for segment in segments
+        }
+
+    @staticmethod
+    def circle_boxes(
+        circles: Iterable[CircularCushionSegment | Pocket],
+    ) -> dict[str, Box]:
+        """Get the bounding box of each circular cushion segment or pocket"""
+        return {
+            circle.id: _circle_box(circle.a, circle.b, circle.radius)
+            for circle in circles
+        }
+
+    def update(self, shot: System, transition_cache: TransitionCache) -> None:
+        """Bound the path of every ball until its next transition"""
+        balls = list(shot.balls.values())
+
+        self.boxes = swept_bounding_boxes(
+            rvws=np.array([ball.state.rvw for ball in balls], dtype=np.float64),
+            ss=np.array([ball.state.s for ball in balls], dtype=np.int64),
+            params=ball_params_matrix(balls),
+            dts=np.array(
+                [transition_cache.transitions[ball.id].time - shot.t for ball in balls],
+                dtype=np.float64,
+            ),
+        )
+        self._ball_boxes = {
+            ball.id: tuple(box) for ball, box in zip(balls, self.boxes.tolist())
+        }
+
+    def may_collide(self, ball_id: str, R: float, box: Box) -> bool:
+        """Check whether a ball of radius R may reach the given box"""
+        xmin, xmax, ymin, ymax = self._ball_boxes[ball_id]
+        pad = R + self.margin
+        return (
+            xmin - pad <= box[1]
+            and box[0] - pad <= xmax
+            and ymin - pad <= box[3]
+            and box[2] - pad <= ymax
+        )
+
+
+def _segment_box(p1: NDArray[np.float64], p2: NDArray[np.float64]) -> Box:
+    x1, y1, x2, y2 = float(p1[0]), float(p1[1]), float(p2[0]), float(p2[1])
+    return (min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2))
+
+
+def _circle_box(a: float, b: float, r: float) -> Box:
+    a, b, r = float(a), float(b), float(r)
+    return (a - r, a + r, b - r, b + r)
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import heapq
+from collections.abc import Hashable, Iterable, Mapping
+from itertools import count
+
 import attrs
 import numpy as np
 
@@ -27,6 +31,72 @@ def _null() -> dict[str, Event]:
     return {"null": null_event(time=np.inf)}
 
 
+@attrs.define
+class EventHeap:
+    """An indexed min-heap of event times that supports lazy deletion
+
+    Each key (e.g. a ball ID or a pair of object IDs) is associated with at most one
+    live time. Pushing a key that's already present overwrites its time, and discarding
+    a key removes it. Neither operation searches the heap: superseded heap entries are
+    left in place and skipped over when they surface in :meth:`peek`.
+
+    Ties are broken the same way ``min(d, key=d.get)`` breaks them for a dictionary
+    ``d`` that undergoes the same sequence of assignments and deletions. That is,
+    overwriting a key keeps its position, whereas discarding and then re-pushing a key
+    moves it to the back. This guarantees that the heap and a linear scan select
+    the same event.
+    """
+
+    _heap: list[tuple[float, int, Hashable]] = attrs.field(init=False, factory=list)
+    _entries: dict[Hashable, tuple[float, int]] = attrs.field(init=False, factory=dict)
+    _counter: count = attrs.field(init=False, factory=count)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, key: Hashable, time: float) -> None:
+        """Set the time associated with ``key``"""
+        entry = self._entries.get(key)
+        order = next(self._counter) if entry is None else entry[1]
+        self._entries[key] = (time, order)
+        heapq.heappush(self._heap, (time, order, key))
+
+        # Stale entries are only removed when they surface. If too many accumulate,
+        # rebuild the heap from the live entries.
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(t, o, k) for k, (t, o) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, key: Hashable) -> None:
+        """Remove ``key`` if present"""
+        self._entries.pop(key, None)
+
+    def peek(self) -> Hashable:
+        """Return the key with the smallest time
+
+        Raises:
+            ValueError: If the heap is empty.
+        """
+        heap = self._heap
+        entries = self._entries
+
+        while heap:
+            time, order, key = heap[0]
+            if entries.get(key) == (time, order):
+                return key
+            heapq.heappop(heap)
+
+        raise ValueError("peek on an empty EventHeap")
+
+    @classmethod
+    def from_dict(cls, times: dict) -> EventHeap:
+        """Create a heap from a mapping of keys to times, respecting its order"""
+        heap = cls()
+        for key, time in times.items():
+            heap.push(key, time)
+        return heap
+
+
 @attrs.define
 class TransitionCache:
     """A cache for managing and retrieving the next transition events for balls.
@@ -37,6 +107,10 @@ class TransitionCache:
     Attributes:
         transitions:
             A dictionary mapping ball IDs to their corresponding next event.
+        use_heap:
+            If True, the next transition is tracked with an :class:`EventHeap`, making
+            :meth:`get_next` logarithmic rather than linear in the number of balls. If
+            False, :meth:`get_next` scans every transition. Both select the same event.
 
     See Also:
         - For practical and historical reasons, events are cached differently depending
@@ -45,28 +119,59 @@ class TransitionCache:
     """
 
     transitions: dict[str, Event] = attrs.field(factory=_null)
+    use_heap: bool = attrs.field(default=True)
+
+    _heap: EventHeap = attrs.field(init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._heap = EventHeap.from_dict(
+            {ball_id: event.time for ball_id, event in self.transitions.items()}
+            if self.use_heap
+            else {}
+        )
 
     def get_next(self) -> Event:
+        if self.use_heap:
+            return self.transitions[self._heap.peek()]
+
         return min(
             (trans for trans in self.transitions.values()), key=lambda event: event.time
         )
 
     def copy(self) -> TransitionCache:
         return TransitionCache(
-            transitions={k: v.copy() for k, v in self.transitions.items()}
+            transitions={k: v.copy() for k, v in self.transitions.items()},
+            use_heap=self.use_heap,
         )
 
-    def update(self, event: Event) -> None:
-        """Update transition cache for all balls in Event"""
+    def update(self, event: Event, balls: Mapping[str, Ball] | None = None) -> None:
+        """Update transition cache for all balls in Event
+
+        Args:
+            event:
+                The event that was just resolved.
+            balls:
+                The balls of the system. By default, the post-event ball states are read
+                from the event's agents. Pass the balls if the event was resolved
+                without snapshotting the agents' states.
+        """
         for agent in event.agents:
             if agent.agent_type == AgentType.BALL:
-                assert isinstance(ball := agent.final, Ball)
-                self.transitions[agent.id] = _next_transition(ball)
+                if balls is None:
+                    assert isinstance(ball := agent.final, Ball)
+                else:
+                    ball = balls[agent.id]
+                transition = _next_transition(ball)
+                self.transitions[agent.id] = transition
+
+                if self.use_heap:
+                    self._heap.push(agent.id, transition.time)
 
     @classmethod
-    def create(cls, shot: System) -> TransitionCache:
+    def create(cls, shot: System, use_heap: bool = True) -> TransitionCache:
         return cls(
-            {ball_id: _next_transition(ball) for ball_id, ball in shot.balls.items()}
+            {ball_id: _next_transition(ball) for ball_id, ball in shot.balls.items()},
+            use_heap=use_heap,
         )
 
 
@@ -115,7 +220,9 @@ class CollisionCache:
     ensuring that outdated data does not persist in the cache. For example, if a
     ball-transition event for ball with ID "6" is passed to :meth:`invalidate`, all
     cached event times involving ball ID "6" are removed from the cache, since they are
-    no longer valid.
+    no longer valid. A reverse index from ball IDs to the cached keys that involve them
+    is maintained, so invalidation only visits the affected entries rather than every
+    cached entry.
 
     Attributes:
         times:
@@ -123,6 +230,15 @@ class CollisionCache:
             dictionary mapping tuples of object IDs to their corresponding collision
             times.
 
+            Note:
+                Populate it with :meth:`set_time` rather than by direct assignment, so that
+                the heaps and the ball index stay in sync.
+        use_heap:
+            If True, the earliest collision of each event type is tracked with an
+            :class:`EventHeap`, making :meth:`get_next` logarithmic rather than linear
+            in the number of cached events. If False, :meth:`get_next` scans every
+            cached event. Both select the same event.
+
     Properties:
         size:
             The total number of cached events.
@@ -134,13 +250,99 @@ class CollisionCache:
     """
 
     times: dict[EventType, dict[tuple[str, str], float]] = attrs.field(factory=dict)
+    use_heap: bool = attrs.field(default=True)
+
+    _heaps: dict[EventType, EventHeap] = attrs.field(
+        init=False, factory=dict, repr=False, eq=False
+    )
+    _ball_index: dict[str, set[tuple[EventType, tuple[str, str]]]] = attrs.field(
+        init=False, factory=dict, repr=False, eq=False
+    )
+
+    def __attrs_post_init__(self) -> None:
+        if self.use_heap:
+            self._heaps = {
+                event_type: EventHeap.from_dict(event_times)
+                for event_type, event_times in self.times.items()
+            }
+
+        for event_type, event_times in self.times.items():
+            for key in event_times:
+                self._index(event_type, key)
+
+    def _index(self, event_type: EventType, key: tuple[str, str]) -> None:
+        for idx in event_type_to_ball_indices.get(event_type, ()):
+            self._ball_index.setdefault(key[idx], set()).add((event_type, key))
 
     @property
     def size(self) -> int:
         return sum(len(cache) for cache in self.times.values())
 
     def copy(self) -> CollisionCache:
-        return CollisionCache(times={k: v.copy() for k, v in self.times.items()})
+        return CollisionCache(
+            times={k: v.copy() for k, v in self.times.items()},
+            use_heap=self.use_heap,
+        )
+
+    def get_times(self, event_type: EventType) -> dict[tuple[str, str], float]:
+        """Return the cached times for an event type
+
+        The returned dictionary should be treated as read-only. Add to it with
+        :meth:`set_time`.
+        """
+        if event_type not in self.times:
+            self.times[event_type] = {}
+            if self.use_heap:
+                self._heaps[event_type] = EventHeap()
+
+        return self.times[event_type]
+
+    def set_time(
+        self, event_type: EventType, key: tuple[str, str], time: float
+    ) -> None:
+        """Cache the collision time of an object pair"""
+        self.get_times(event_type)[key] = time
+        self._index(event_type, key)
+
+        if self.use_heap:
+            self._heaps[event_type].push(key, time)
+
+    def set_times(
+        self,
+        event_type: EventType,
+        items: Iterable[tuple[tuple[str, str], float]],
+    ) -> None:
+        """Cache the collision times of many object pairs
+
+        Equivalent to calling :meth:`set_time` for each ``(key, time)`` pair in
+        ``items``, in order.
+        """
+        event_times = self.get_times(event_type)
+        ball_indices = event_type_to_ball_indices.get(event_type, ())
+        heap = self._heaps[event_type] if self.use_heap else None
+
+        for key, time in items:
+            event_times[key] = time
+
+            for idx in ball_indices:
+                self._ball_index.setdefault(key[idx], set()).add((event_type, key))
+
+            if heap is not None:
+                heap.push(key, time)
+
+    def get_next(self, event_type: EventType) -> tuple[str, str]:
+        """Return the object pair with the earliest cached collision time
+
+        Raises:
+            ValueError: If there are no cached times for this event type.
+        """
+        if self.use_heap:
+            if event_type not in self._heaps:
+                raise ValueError(f"No cached times for {event_type}")
+            return self._heaps[event_type].peek()  # type: ignore
+
+        cache = self.times.get(event_type, {})
+        return min(cache, key=lambda k: cache[k])
 
     def _get_invalid_ball_ids(self, event: Event) -> set[str]:
         return {
@@ -149,25 +351,25 @@ class CollisionCache:
         }
 
     def invalidate(self, event: Event) -> None:
-        invalid_ball_ids = self._get_invalid_ball_ids(event)
+        """Remove all cached times that involve a ball participating in ``event``"""
+        for ball_id in self._get_invalid_ball_ids(event):
+            # Entries of a ball-ball pair are indexed under both balls. After one ball
+            # is invalidated, the other ball's index still refers to the pair, so some
+            # referred keys may no longer be cached. These are skipped.
+            for event_type, key in self._ball_index.pop(ball_id, ()):
+                event_times = self.times[event_type]
 
-        for event_type, event_times in self.times.items():
-            keys_to_delete = []
+                if key not in event_times:
+                    continue
 
-            for key in event_times:
-                # Identify which indices in the key should be checked based on the event type
-                ball_indices = event_type_to_ball_indices.get(event_type, [])
-
-                # Check if any of the relevant ball IDs in the key match the invalid IDs
-                if any(key[idx] in invalid_ball_ids for idx in ball_indices):
-                    keys_to_delete.append(key)
-
-            for key in keys_to_delete:
                 del event_times[key]
 
+                if self.use_heap:
+                    self._heaps[event_type].discard(key)
+
     @classmethod
-    def create(cls) -> CollisionCache:
-        return cls()
+    def create(cls, use_heap: bool = True) -> CollisionCache:
+        return cls(use_heap=use_heap)
 
 
 def _unstructure_collision_cache(cache: CollisionCache) -> dict:
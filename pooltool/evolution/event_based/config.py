@@ -1,4 +1,7 @@
+import attrs
+
 from pooltool.events.datatypes import EventType
+from pooltool.utils.strenum import StrEnum, auto
 
 INCLUDED_EVENTS = {
     EventType.NONE,
@@ -12,3 +15,52 @@ INCLUDED_EVENTS = {
     EventType.ROLLING_SPINNING,
     EventType.SLIDING_ROLLING,
 }
+
+
+class RecordMode(StrEnum):
+    """An Enum for how much of a simulation is recorded
+
+    Attributes:
+        FULL:
+            Every event is recorded, including the states of the objects involved
+            before and after the event, and every ball's state is added to its history
+            at every event.
+        EVENTS_ONLY:
+            Every event is recorded, including the states of the objects involved
+            before and after the event. Ball histories are left empty, so the system
+            can't be continuized.
+        FINAL_STATE:
+            Only the final ball states are kept. Events are recorded without the
+            states of the objects involved, and ball histories are left empty.
+    """
+
+    FULL = auto()
+    EVENTS_ONLY = auto()
+    FINAL_STATE = auto()
+
+
+@attrs.frozen
+class _Strategy:
+    """Alternative implementations of the event loop, for A/B benchmarks and tests
+
+    Each alternative selects the same events as the default, which is the supported
+    path of :func:`pooltool.evolution.simulate`.
+
+    Attributes:
+        heap:
+            If True, the next event is found with per-event-type min-heaps that are
+            updated as the caches change. If False, every cached event time is scanned
+            for each step of the simulation (see
+            :class:`pooltool.evolution.event_based.cache.EventHeap`).
+        broadphase:
+            If True, ball-ball, ball-cushion and ball-pocket pairs that can't come into
+            contact before their next transition are ruled out with swept bounding
+            boxes, rather than with a quartic or quadratic solve (see
+            :class:`pooltool.evolution.event_based.broadphase.BroadPhase`).
+    """
+
+    heap: bool = True
+    broadphase: bool = True
+
+
+DEFAULT_STRATEGY = _Strategy()
@@ -0,0 +1,299 @@
+"""Setup work that is shared by every simulation on the same table
+
+For an explanation, see :class:`SimulationContext`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import attrs
+import numpy as np
+from numpy.typing import NDArray
+
+from pooltool.evolution.event_based.broadphase import Box, BroadPhase
+from pooltool.objects.table.components import (
+    CircularCushionSegment,
+    LinearCushionSegment,
+    Pocket,
+)
+from pooltool.objects.table.datatypes import Table
+from pooltool.physics.engine import PhysicsEngine
+
+LinearRow = tuple[
+    str, float, float, float, NDArray[np.float64], NDArray[np.float64], int
+]
+"""A linear cushion segment: (id, lx, ly, l0, p1, p2, direction)"""
+
+CircleRow = tuple[str, float, float, float]
+"""A circular cushion segment or pocket: (id, a, b, radius)"""
+
+
+@attrs.define
+class LinearCushionArrays:
+    """The geometry of a table's linear cushion segments as flat arrays
+
+    Attributes:
+        ids:
+            The segment IDs, in the order of the table's segments.
+        lx:
+            The :math:`l_x` coefficient of each segment. Shape (S,).
+        ly:
+            The :math:`l_y` coefficient of each segment. Shape (S,).
+        l0:
+            The :math:`l_0` coefficient of each segment. Shape (S,).
+        p1:
+            The start point of each segment. Shape (S, 3).
+        p2:
+            The end point of each segment. Shape (S, 3).
+        direction:
+            The :class:`pooltool.objects.CushionDirection` of each segment. Shape (S,).
+        boxes:
+            The bounding box of each segment (see
+            :class:`pooltool.evolution.event_based.broadphase.BroadPhase`).
+        sources:
+            The segments the arrays were built from.
+        rows:
+            The same geometry, one tuple of python scalars (and read-only point
+            arrays) per segment, for fast iteration.
+    """
+
+    ids: tuple[str, ...]
+    lx: NDArray[np.float64]
+    ly: NDArray[np.float64]
+    l0: NDArray[np.float64]
+    p1: NDArray[np.float64]
+    p2: NDArray[np.float64]
+    direction: NDArray[np.int64]
+    boxes: dict[str, Box]
+    sources: tuple[LinearCushionSegment, ...] = attrs.field(repr=False)
+
+    rows: list[LinearRow] = attrs.field(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        for array in (self.lx, self.ly, self.l0, self.p1, self.p2, self.direction):
+            array.flags["WRITEABLE"] = False
+
+        self.rows = list(
+            zip(
+                self.ids,
+                self.lx.tolist(),
+                self.ly.tolist(),
+                self.l0.tolist(),
+                list(self.p1),
+                list(self.p2),
+                self.direction.tolist(),
+            )
+        )
+
+    @classmethod
+    def from_segments(
+        cls, segments: Iterable[LinearCushionSegment]
+    ) -> LinearCushionArrays:
+        segments = list(segments)
+        return cls(
+            ids=tuple(segment.id for segment in segments),
+            lx=np.array([segment.lx for segment in segments], dtype=np.float64),
+            ly=np.array([segment.ly for segment in segments], dtype=np.float64),
+            l0=np.array([segment.l0 for segment in segments], dtype=np.float64),
+            p1=np.array([segment.p1 for segment in segments], dtype=np.float64),
+            p2=np.array([segment.p2 for segment in segments], dtype=np.float64),
+            direction=np.array(
+                [segment.direction for segment in segments], dtype=np.int64
+            ),
+            boxes=BroadPhase.linear_boxes(segments),
+            sources=tuple(segments),
+        )
+
+    def describes(self, segments: Iterable[LinearCushionSegment]) -> bool:
+        """Whether the arrays hold the geometry of these segments
+
+        Each segment must be the one the arrays were built from, or have the same ID,
+        end points and direction.
+        """
+        segments = tuple(segments)
+        return len(segments) == len(self.sources) and all(
+            segment is source
+            or (
+                segment.id == source.id
+                and segment.direction == source.direction
+                and segment.p1.tolist() == source.p1.tolist()
+                and segment.p2.tolist() == source.p2.tolist()
+            )
+            for segment, source in zip(segments, self.sources)
+        )
+
+
+@attrs.define
+class CircleArrays:
+    """The geometry of a table's circular cushion segments or pockets as flat arrays
+
+    Attributes:
+        ids:
+            The segment (or pocket) IDs, in the order of the table's.
+        a:
+            The x-coordinate of each center. Shape (S,).
+        b:
+            The y-coordinate of each center. Shape (S,).
+        radius:
+            The radius of each circle. Shape (S,).
+        boxes:
+            The bounding box of each circle (see
+            :class:`pooltool.evolution.event_based.broadphase.BroadPhase`).
+        sources:
+            The segments (or pockets) the arrays were built from.
+        rows:
+            The same geometry, one tuple of python scalars per circle, for fast
+            iteration.
+    """
+
+    ids: tuple[str, ...]
+    a: NDArray[np.float64]
+    b: NDArray[np.float64]
+    radius: NDArray[np.float64]
+    boxes: dict[str, Box]
+    sources: tuple[CircularCushionSegment | Pocket, ...] = attrs.field(repr=False)
+
+    rows: list[CircleRow] = attrs.field(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        for array in (self.a, self.b, self.radius):
+            array.flags["WRITEABLE"] = False
+
+        self.rows = list(
+            zip(self.ids, self.a.tolist(), self.b.tolist(), self.radius.tolist())
+        )
+
+    @classmethod
+    def from_circles(
+        cls, circles: Iterable[CircularCushionSegment | Pocket]
+    ) -> CircleArrays:
+        circles = list(circles)
+        return cls(
+            ids=tuple(circle.id for circle in circles),
+            a=np.array([circle.a for circle in circles], dtype=np.float64),
+            b=np.array([circle.b for circle in circles], dtype=np.float64),
+            radius=np.array([circle.radius for circle in circles], dtype=np.float64),
+            boxes=BroadPhase.circle_boxes(circles),
+            sources=tuple(circles),
+        )
+
+    def describes(self, circles: Iterable[CircularCushionSegment | Pocket]) -> bool:
+        """Whether the arrays hold the geometry of these segments (or pockets)
+
+        Each circle must be the one the arrays were built from, or have the same ID,
+        center and radius. Other attributes, such as the balls a pocket contains, are
+        ignored.
+        """
+        circles = tuple(circles)
+        return len(circles) == len(self.sources) and all(
+            circle is source
+            or (
+                circle.id == source.id
+                and circle.radius == source.radius
+                and (
+                    circle.center is source.center
+                    or circle.center.tolist() == source.center.tolist()
+                )
+            )
+            for circle, source in zip(circles, self.sources)
+        )
+
+
+@attrs.define
+class SimulationContext:
+    """Table and engine dependent setup, built once and shared by many simulations
+
+    Shot-search workloads simulate thousands of variants of one table layout. Without
+    a context, every call to :func:`pooltool.evolution.simulate` reads the cushion and
+    pocket geometry off the table again, and rebuilds the bounding boxes used for
+    broad-phase pruning. A context does this once, so that each simulation only pays
+    for the work that depends on the balls.
+
+    A context may be passed to any number of simulations, as long as their systems are
+    played on the context's table (or a copy of it). It isn't modified by them. If a
+    system's cushion segments or pockets differ from the ones the context was built
+    from, :func:`pooltool.evolution.simulate` raises a ``ValueError`` (see
+    :meth:`validate`).
+
+    Attributes:
+        table:
+            The table the context was built from.
+        engine:
+            The physics engine used by simulations that don't pass one.
+        linear:
+            The table's linear cushion segments.
+        circular:
+            The table's circular cushion segments.
+        pockets:
+            The table's pockets.
+
+    Examples:
+        >>> import pooltool as pt
+        >>> system = pt.System.example()
+        >>> context = pt.evolution.SimulationContext.create(system.table)
+        >>> for phi in range(0, 360, 10):
+        >>>     system.strike(phi=phi)
+        >>>     result = pt.simulate(system, context=context)
+    """
+
+    table: Table
+    engine: PhysicsEngine
+    linear: LinearCushionArrays
+    circular: CircleArrays
+    pockets: CircleArrays
+
+    @classmethod
+    def create(
+        cls, table: Table, engine: PhysicsEngine | None = None
+    ) -> SimulationContext:
+        """Build the context of a table
+
+        Args:
+            table:
+                The table that simulations using this context are played on.
+            engine:
+                The physics engine. Defaults to a default-constructed
+                :class:`pooltool.physics.PhysicsEngine`.
+        """
+        return cls(
+            table=table,
+            engine=engine if engine is not None else PhysicsEngine(),
+            linear=LinearCushionArrays.from_segments(
+                table.cushion_segments.linear.values()
+            ),
+            circular=CircleArrays.from_circles(
+                table.cushion_segments.circular.values()
+            ),
+            pockets=CircleArrays.from_circles(table.pockets.values()),
+        )
+
+    def validate(self, table: Table) -> None:
+        """Check that the context holds the geometry of a table
+
+        Raises:
+            ValueError:
+                If the table's cushion segments or pockets aren't the ones the context
+                was built from, or equal to them.
+        """
+        for name, arrays, objects in (
+            ("linear cushion segments", self.linear, table.cushion_segments.linear),
+            (
+                "circular cushion segments",
+                self.circular,
+                table.cushion_segments.circular,
+            ),
+            ("pockets", self.pockets, table.pockets),
+        ):
+            if not arrays.describes(objects.values()):
+                raise ValueError(
+                    f"The shot's table has different {name} than the context's"
+                )
+
+    def broadphase(self) -> BroadPhase:
+        """Create a broad phase for one simulation, reusing the table's boxes"""
+        return BroadPhase(
+            linear=self.linear.boxes,
+            circular=self.circular.boxes,
+            pockets=self.pockets.boxes,
+        )
@@ -211,7 +211,7 @@ def simulate_with_snapshots(
 
     step = 0
     while not sim.done:
-        system_pre_evolve = sim.shot.copy()
+        system_pre_evolve = sim.arrays.unpacked(sim.shot)
 
         event = sim.step()
 
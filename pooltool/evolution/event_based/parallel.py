@@ -0,0 +1,244 @@
+"""Simulate many systems across a pool of worker processes
+
+For an explanation, see :func:`simulate_many` and :class:`SimulationPool`.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Any
+
+from pooltool.events import EventType
+from pooltool.evolution.event_based.config import INCLUDED_EVENTS
+from pooltool.evolution.event_based.simulate import DEFAULT_ENGINE, simulate
+from pooltool.evolution.event_based.warmup import warmup as warmup_kernels
+from pooltool.physics.engine import PhysicsEngine
+from pooltool.system.datatypes import System
+
+# Each worker process holds its own engine. It is set once by the pool initializer so
+# that the engine isn't pickled and shipped alongside every system.
+_worker_engine: PhysicsEngine | None = None
+
+
+def _init_worker(engine: PhysicsEngine, warmup: bool) -> None:
+    global _worker_engine
+    _worker_engine = engine
+
+    if warmup:
+        warmup_kernels(engine)
+
+
+def _simulate_in_worker(shot: System, **kwargs: Any) -> System:
+    return simulate(shot, engine=_worker_engine, inplace=True, **kwargs)
+
+
+class SimulationPool:
+    """A reusable pool of warmed-up simulation worker processes
+
+    Starting a worker process costs numba compilation (or, at best, numba cache
+    loading) for every jitted kernel the simulation touches. A ``SimulationPool``
+    pays this cost once per worker, when the pool is created, and then reuses the
+    workers for as many calls to :meth:`imap` / :meth:`map` as you like.
+
+    Args:
+        workers:
+            The number of worker processes. Defaults to ``os.cpu_count()``.
+        engine:
+            The physics engine used by every worker. Defaults to the same engine that
+            :func:`pooltool.evolution.simulate` defaults to.
+        warmup:
+            If True, each worker warms up (see
+            :func:`pooltool.evolution.event_based.warmup.warmup`) as soon as it starts,
+            so that the first real simulation isn't slowed down by JIT compilation.
+
+    Examples:
+        The pool is a context manager. Workers are shut down when the block exits:
+
+        >>> import pooltool as pt
+        >>> from pooltool.evolution.event_based.parallel import SimulationPool
+        >>> systems = [pt.System.example() for _ in range(100)]
+        >>> with SimulationPool(workers=4) as pool:
+        >>>     first_batch = pool.map(systems)
+        >>>     second_batch = pool.map(systems, t_final=1.0)
+
+    See Also:
+        - :func:`simulate_many`
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        engine: PhysicsEngine | None = None,
+        warmup: bool = True,
+    ) -> None:
+        self.workers: int = workers if workers is not None else (os.cpu_count() or 1)
+        self.engine: PhysicsEngine = engine if engine is not None else DEFAULT_ENGINE
+
+        if self.workers < 1:
+            raise ValueError(f"workers must be at least 1, not {self.workers}")
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.engine, warmup),
+        )
+
+    def imap(
+        self,
+        systems: Iterable[System],
+        *,
+        chunksize: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[System]:
+        """Simulate systems, yielding each one as soon as it (and its predecessors) finish
+
+        Args:
+            systems:
+                The systems to simulate. They are not modified.
+            chunksize:
+                The number of systems sent to a worker at a time. For many short
+                simulations, values larger than 1 reduce inter-process overhead.
+            **kwargs:
+                Keyword arguments forwarded to :func:`pooltool.evolution.simulate`
+                (``continuous``, ``dt``, ``t_final``, ``include``, ``max_events``).
+
+        Returns:
+            Iterator[System]:
+                The simulated systems, in the same order as ``systems``.
+        """
+        func = partial(_simulate_in_worker, **kwargs)
+        yield from self._executor.map(func, systems, chunksize=chunksize)
+
+    def submit(self, system: System, **kwargs: Any) -> Future[System]:
+        """Schedule a single simulation, returning a future for the simulated system
+
+        Unlike :meth:`imap`, each simulation can be waited on (e.g. with
+        :func:`concurrent.futures.as_completed`) or cancelled individually, which suits
+        searches that stop once they run out of time.
+
+        Args:
+            system:
+                The system to simulate. It is not modified.
+            **kwargs:
+                Keyword arguments forwarded to :func:`pooltool.evolution.simulate`.
+        """
+        return self._executor.submit(_simulate_in_worker, system, **kwargs)
+
+    def map(
+        self,
+        systems: Iterable[System],
+        *,
+        chunksize: int = 1,
+        **kwargs: Any,
+    ) -> list[System]:
+        """Simulate systems and return them all at once
+
+        This is :meth:`imap`, collected into a list.
+        """
+        return list(self.imap(systems, chunksize=chunksize, **kwargs))
+
+    def close(self) -> None:
+        """Shut down the worker processes"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> SimulationPool:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def simulate_many(
+    systems: Iterable[System],
+    engine: PhysicsEngine | None = None,
+    workers: int | None = None,
+    chunksize: int = 1,
+    continuous: bool = False,
+    dt: float | None = None,
+    t_final: float | None = None,
+    include: set[EventType] = INCLUDED_EVENTS,
+    max_events: int = 0,
+    pool: SimulationPool | None = None,
+) -> Iterator[System]:
+    """Simulate many systems in parallel
+
+    The systems are fanned out over a pool of worker processes. Each worker loads the
+    physics engine and warms up the numba kernels once, then simulates systems until
+    there are none left. Simulated systems are streamed back in the same order as
+    ``systems``: each is yielded as soon as it, and every system before it, is
+    finished.
+
+    Args:
+        systems:
+            The systems you would like simulated. They are not modified.
+        engine:
+            The physics engine used to simulate every system. Ignored if ``pool`` is
+            passed, since the pool's workers already hold an engine.
+        workers:
+            The number of worker processes. Defaults to ``os.cpu_count()``. If 1, the
+            systems are simulated serially in the calling process and no pool is
+            created. Ignored if ``pool`` is passed.
+        chunksize:
+            The number of systems sent to a worker at a time. For many short
+            simulations, values larger than 1 reduce inter-process overhead.
+        continuous:
+            See :func:`pooltool.evolution.simulate`.
+        dt:
+            See :func:`pooltool.evolution.simulate`.
+        t_final:
+            See :func:`pooltool.evolution.simulate`.
+        include:
+            See :func:`pooltool.evolution.simulate`.
+        max_events:
+            See :func:`pooltool.evolution.simulate`.
+        pool:
+            An existing :class:`SimulationPool`. Pass one if you call this function
+            repeatedly, so that worker startup and warm-up are paid only once.
+
+    Returns:
+        Iterator[System]:
+            The simulated systems, in the same order as ``systems``.
+
+    Examples:
+        Simulate a batch of shots with differing cue angles:
+
+        >>> import pooltool as pt
+        >>> systems = []
+        >>> for phi in range(0, 360, 10):
+        >>>     system = pt.System.example()
+        >>>     system.strike(phi=phi)
+        >>>     systems.append(system)
+        >>> simulated = list(pt.simulate_many(systems, workers=4))
+        >>> assert all(system.simulated for system in simulated)
+
+        Results can be consumed as they arrive:
+
+        >>> for system in pt.simulate_many(systems, workers=4):
+        >>>     print(system.t)
+
+    See Also:
+        - :func:`pooltool.evolution.simulate`
+        - :class:`SimulationPool`
+    """
+    kwargs: dict[str, Any] = dict(
+        continuous=continuous,
+        dt=dt,
+        t_final=t_final,
+        include=include,
+        max_events=max_events,
+    )
+
+    if pool is not None:
+        yield from pool.imap(systems, chunksize=chunksize, **kwargs)
+        return
+
+    if workers == 1:
+        for system in systems:
+            yield simulate(system, engine=engine, **kwargs)
+        return
+
+    with SimulationPool(workers=workers, engine=engine) as _pool:
+        yield from _pool.imap(systems, chunksize=chunksize, **kwargs)
@@ -0,0 +1,206 @@
+#! /usr/bin/env python
+"""Per-phase timing of the event-based simulation
+
+Pass a :class:`SimulationProfile` as the ``profile`` argument of
+:func:`pooltool.evolution.simulate`, and it's filled with the time spent in each phase
+of the simulation's event loop, along with the collision cache's hit and miss counts:
+
+>>> import pooltool as pt
+>>> from pooltool.evolution.event_based.profile import SimulationProfile
+>>> profile = SimulationProfile()
+>>> system = pt.simulate(pt.System.example(), profile=profile)
+>>> print(profile.report())  # doctest: +SKIP
+
+A profile accumulates over every simulation it's passed to, so a batch of shots can be
+profiled as a whole.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import attrs
+
+from pooltool.events import EventType
+from pooltool.evolution.event_based.cache import CollisionCache
+
+
+@attrs.define
+class SimulationProfile:
+    """Timings and cache statistics of one or more simulations
+
+    All times are wall-clock times in seconds, measured with
+    :func:`time.perf_counter`.
+
+    Attributes:
+        detect:
+            The time spent detecting the next event of each type. Collisions are keyed
+            by their event type (e.g. the time spent in
+            :func:`pooltool.evolution.event_based.simulate.get_next_ball_ball_collision`
+            is keyed by ``EventType.BALL_BALL``). Finding the next transition, which is
+            read off the transition cache, is keyed by ``EventType.NONE``.
+        broadphase:
+            The time spent updating the bounding boxes of the broad phase (see
+            :class:`pooltool.evolution.event_based.broadphase.BroadPhase`).
+        evolve:
+            The time spent evolving the balls from one event to the next.
+        resolve:
+            The time spent resolving events, keyed by event type (see
+            :meth:`pooltool.physics.resolve.Resolver.resolve`).
+        history:
+            The time spent recording events and ball histories.
+        cache_update:
+            The time spent updating the transition cache and invalidating the collision
+            cache after each event.
+        total:
+            The time spent in the simulation as a whole. This includes time not
+            attributed to any of the above phases, e.g. copying the system.
+        hits:
+            For each collision event type, the number of object pairs whose collision
+            time was read from the collision cache rather than calculated.
+        misses:
+            For each collision event type, the number of object pairs whose collision
+            time was calculated (or ruled out by the broad phase) and then cached.
+        events:
+            The number of events of each type that were resolved.
+        simulations:
+            The number of simulations profiled.
+    """
+
+    detect: dict[EventType, float] = attrs.field(factory=dict)
+    broadphase: float = 0.0
+    evolve: float = 0.0
+    resolve: dict[EventType, float] = attrs.field(factory=dict)
+    history: float = 0.0
+    cache_update: float = 0.0
+    total: float = 0.0
+    hits: dict[EventType, int] = attrs.field(factory=dict)
+    misses: dict[EventType, int] = attrs.field(factory=dict)
+    events: dict[EventType, int] = attrs.field(factory=dict)
+    simulations: int = 0
+
+    @property
+    def accounted(self) -> float:
+        """The total time spent in the profiled phases"""
+        return (
+            sum(self.detect.values())
+            + self.broadphase
+            + self.evolve
+            + sum(self.resolve.values())
+            + self.history
+            + self.cache_update
+        )
+
+    def hit_rate(self, event_type: EventType) -> float:
+        """The fraction of collision time lookups that were cache hits
+
+        Returns:
+            float: The hit rate, or NaN if there were no lookups.
+        """
+        hits = self.hits.get(event_type, 0)
+        lookups = hits + self.misses.get(event_type, 0)
+        return hits / lookups if lookups else float("nan")
+
+    @contextmanager
+    def timing(self, phase: str) -> Iterator[None]:
+        """Add the time spent in the block to ``phase``
+
+        Args:
+            phase:
+                The name of a scalar timing attribute, e.g. ``"evolve"``.
+        """
+        start = time.perf_counter()
+        yield
+        setattr(self, phase, getattr(self, phase) + time.perf_counter() - start)
+
+    @contextmanager
+    def detecting(
+        self, event_type: EventType, collision_cache: CollisionCache | None = None
+    ) -> Iterator[None]:
+        """Time a detection of the next event, counting collision cache hits and misses
+
+        Each detector looks up every object pair of its event type, so the entries that
+        are cached beforehand are hits, and those cached by the detector are misses.
+        """
+        before = (
+            0
+            if collision_cache is None
+            else len(collision_cache.times.get(event_type, ()))
+        )
+        start = time.perf_counter()
+        yield
+        _add(self.detect, event_type, time.perf_counter() - start)
+
+        if collision_cache is not None:
+            after = len(collision_cache.times.get(event_type, ()))
+            _add(self.hits, event_type, before)
+            _add(self.misses, event_type, after - before)
+
+    @contextmanager
+    def resolving(self, event_type: EventType) -> Iterator[None]:
+        """Time the resolution of an event"""
+        start = time.perf_counter()
+        yield
+        _add(self.resolve, event_type, time.perf_counter() - start)
+        _add(self.events, event_type, 1)
+
+    def merge(self, other: SimulationProfile) -> None:
+        """Add the timings and counts of another profile to this one"""
+        for phase in ("broadphase", "evolve", "history", "cache_update", "total"):
+            setattr(self, phase, getattr(self, phase) + getattr(other, phase))
+
+        for name in ("detect", "resolve", "hits", "misses", "events"):
+            mine = getattr(self, name)
+            for key, value in getattr(other, name).items():
+                _add(mine, key, value)
+
+        self.simulations += other.simulations
+
+    def as_dict(self) -> dict[str, Any]:
+        """A plain dictionary of the profile, with event types as strings"""
+        data = attrs.asdict(self)
+        for name, value in data.items():
+            if isinstance(value, dict):
+                data[name] = {str(key): count for key, count in value.items()}
+        return data
+
+    def report(self) -> str:
+        """A human readable table of the profile"""
+        rows: list[tuple[str, float]] = [
+            (f"detect {event_type}", duration)
+            for event_type, duration in self.detect.items()
+        ]
+        rows.append(("broadphase", self.broadphase))
+        rows.append(("evolve", self.evolve))
+        rows.extend(
+            (f"resolve {event_type}", duration)
+            for event_type, duration in self.resolve.items()
+        )
+        rows.append(("history", self.history))
+        rows.append(("cache update", self.cache_update))
+        rows.append(("other", self.total - self.accounted))
+
+        width = max(len(name) for name, _ in rows)
+        lines = [
+            f"{self.simulations} simulation(s), {sum(self.events.values())} events, "
+            f"{self.total * 1e3:.2f} ms"
+        ]
+        for name, duration in sorted(rows, key=lambda row: -row[1]):
+            share = duration / self.total if self.total else 0.0
+            lines.append(f"  {name:<{width}}  {duration * 1e3:9.3f} ms  {share:6.1%}")
+
+        lines.append("collision cache hit rates:")
+        for event_type in self.hits:
+            lines.append(
+                f"  {event_type!s:<{width}}  {self.hit_rate(event_type):6.1%} "
+                f"({self.hits[event_type]} hits, {self.misses[event_type]} misses)"
+            )
+
+        return "\n".join(lines)
+
+
+def _add(counts: dict, key: Any, value: float) -> None:
+    counts[key] = counts.get(key, 0) + value
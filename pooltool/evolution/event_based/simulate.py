@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import time
+from contextlib import AbstractContextManager, nullcontext
 from itertools import combinations
+from typing import Any
 
 import attrs
 import numpy as np
@@ -22,14 +25,43 @@ from pooltool.events import (
 )
 from pooltool.evolution.continuous import continuize
 from pooltool.evolution.event_based import solve
+from pooltool.evolution.event_based.arrays import (
+    BallStateArrays,
+    ball_params_matrix,
+    involved_ball_ids,
+)
+from pooltool.evolution.event_based.broadphase import BroadPhase, overlapping_pairs
 from pooltool.evolution.event_based.cache import CollisionCache, TransitionCache
-from pooltool.evolution.event_based.config import INCLUDED_EVENTS
+from pooltool.evolution.event_based.config import (
+    DEFAULT_STRATEGY,
+    INCLUDED_EVENTS,
+    RecordMode,
+    _Strategy,
+)
+from pooltool.evolution.event_based.context import (
+    CircleArrays,
+    LinearCushionArrays,
+    SimulationContext,
+)
+from pooltool.evolution.event_based.profile import SimulationProfile
+from pooltool.evolution.event_based.stop import StopCondition
 from pooltool.objects.ball.datatypes import BallState
 from pooltool.physics.engine import PhysicsEngine
 from pooltool.system.datatypes import System
 
 DEFAULT_ENGINE = PhysicsEngine()
 
+_UNTIMED = nullcontext()
+
+
+def _profiled(
+    profile: SimulationProfile | None, method: str, *args: Any
+) -> AbstractContextManager:
+    """Return ``profile.<method>(*args)``, or a null context if not profiling"""
+    if profile is None:
+        return _UNTIMED
+    return getattr(profile, method)(*args)
+
 
 def _system_has_energy(system: System) -> bool:
     """Check whether the system has any energy.
@@ -58,56 +90,134 @@ class _SimulationState:
     t_final: float | None = None
     include: set[EventType] = INCLUDED_EVENTS
     max_events: int = 0
+    context: SimulationContext | None = None
+    record: RecordMode = attrs.field(default=RecordMode.FULL, converter=RecordMode)
+    stop_when: StopCondition | None = None
+    profile: SimulationProfile | None = None
+    strategy: _Strategy = DEFAULT_STRATEGY
 
     done: bool = attrs.field(init=False, default=False)
     num_events: int = attrs.field(init=False, default=0)
     collision_cache: CollisionCache = attrs.field(init=False)
     transition_cache: TransitionCache = attrs.field(init=False)
+    arrays: BallStateArrays = attrs.field(init=False)
+    broadphase: BroadPhase | None = attrs.field(init=False, default=None)
 
     def __attrs_post_init__(self) -> None:
-        self.collision_cache = CollisionCache.create()
-        self.transition_cache = TransitionCache.create(self.shot)
+        if self.context is None:
+            self.context = SimulationContext.create(self.shot.table, self.engine)
+
+        self.collision_cache = CollisionCache.create(use_heap=self.strategy.heap)
+        self.transition_cache = TransitionCache.create(
+            self.shot, use_heap=self.strategy.heap
+        )
+
+        # Pruning relies on transitions invalidating the cached collision times of
+        # the transitioning ball, so it is only done if transitions are resolved
+        if self.strategy.broadphase and all(
+            event_type in self.include
+            for event_type in EventType
+            if event_type.is_transition()
+        ):
+            self.broadphase = self.context.broadphase()
 
     def init(self) -> None:
         self.shot.reset_history()
-        self.shot._update_history(null_event(time=0))
+        self.arrays = BallStateArrays.pack(self.shot)
+        self._update_history(null_event(time=0))
 
     def step(self) -> Event:
         event = get_next_event(
             self.shot,
             transition_cache=self.transition_cache,
             collision_cache=self.collision_cache,
+            broadphase=self.broadphase,
+            context=self.context,
+            profile=self.profile,
         )
 
         if event.time == np.inf:
-            self.shot._update_history(null_event(time=self.shot.t))
-            self.done = True
+            self._update_history(null_event(time=self.shot.t))
+            self._finish()
             return event
 
-        self.evolve(self.shot, event.time - self.shot.t)
+        with _profiled(self.profile, "timing", "evolve"):
+            self.arrays.evolve(event.time - self.shot.t)
 
         if event.event_type in self.include:
-            self.engine.resolver.resolve(self.shot, event)
+            with _profiled(self.profile, "resolving", event.event_type):
+                self._resolve(event)
+
+        self._update_history(event)
 
-        self.shot._update_history(event)
+        if self.stop_when is not None and self.stop_when(self.shot, event):
+            self.num_events += 1
+            self._finish()
+            return event
 
         if self.t_final is not None and self.shot.t >= self.t_final:
-            self.shot._update_history(null_event(time=self.shot.t))
-            self.done = True
+            self._update_history(null_event(time=self.shot.t))
+            self._finish()
 
         if self.max_events > 0 and self.num_events > self.max_events:
-            self.shot.stop_balls()
-            self.done = True
+            self._stop_balls()
+            self._finish()
 
         self.num_events += 1
 
         return event
 
     def update_caches(self, event: Event) -> None:
+        with _profiled(self.profile, "timing", "cache_update"):
+            self._update_caches(event)
+
+    def _update_caches(self, event: Event) -> None:
         if event.event_type in self.include:
-            self.transition_cache.update(event)
+            # Without snapshots, the post-event states are read off the balls, which
+            # haven't changed since the event was resolved
+            self.transition_cache.update(
+                event, balls=None if self._snapshot else self.shot.balls
+            )
             self.collision_cache.invalidate(event)
 
+    @property
+    def _snapshot(self) -> bool:
+        return self.record is not RecordMode.FINAL_STATE
+
+    @property
+    def _record_states(self) -> bool:
+        return self.record is RecordMode.FULL
+
+    def _resolve(self, event: Event) -> None:
+        ball_ids = involved_ball_ids(event)
+
+        # The evolved balls keep their old timestamps until the simulation is over.
+        # Only the balls taking part in the event need to be current, since their
+        # states are snapshotted by the resolver.
+        for ball_id in ball_ids:
+            self.shot.balls[ball_id].state.t = event.time
+
+        self.engine.resolver.resolve(self.shot, event, snapshot=self._snapshot)
+        self.arrays.sync(self.shot, ball_ids)
+
+    def _update_history(self, event: Event) -> None:
+        with _profiled(self.profile, "timing", "history"):
+            self.arrays.record(self.shot, event, states=self._record_states)
+
+    def _stop_balls(self) -> None:
+        self.shot.stop_balls()
+
+        if not self._record_states:
+            return
+
+        # The stopped states overwrite the last recorded states
+        self.arrays.sync(self.shot, self.arrays.ids)
+        self.arrays.rerecord()
+
+    def _finish(self) -> None:
+        self.done = True
+        self.arrays.unpack(self.shot)
+
     @staticmethod
     def evolve(shot: System, dt: float):
         """Evolves system an amount of time dt.
@@ -141,6 +251,11 @@ def simulate(
     t_final: float | None = None,
     include: set[EventType] = INCLUDED_EVENTS,
     max_events: int = 0,
+    context: SimulationContext | None = None,
+    record: RecordMode | str = RecordMode.FULL,
+    stop_when: StopCondition | None = None,
+    profile: SimulationProfile | None = None,
+    _strategy: _Strategy = DEFAULT_STRATEGY,
 ) -> System:
     """Run a simulation on a system and return it
 
@@ -152,6 +267,7 @@ def simulate(
             The engine holds all of the physics. You can instantiate your very own
             :class:`pooltool.physics.PhysicsEngine` object, or you can modify
             ``~/.config/pooltool/physics/resolver.json`` to change the default engine.
+            If ``context`` is passed, this defaults to the context's engine.
         inplace:
             By default, a copy of the passed system is simulated and returned. This
             leaves the passed system unmodified. If inplace is set to True, the passed
@@ -172,6 +288,42 @@ def simulate(
         max_events:
             If this is greater than 0, and the shot has more than this many events, the
             simulation is stopped and the balls are set to stationary.
+        context:
+            The table-dependent setup of the simulation: the cushion and pocket
+            geometry, and the bounding boxes of the broad phase. By default it's built
+            from the system's table for every call. When simulating many shots on the
+            same table, build it once and pass it to each call (see
+            :class:`pooltool.evolution.event_based.context.SimulationContext`). A
+            ``ValueError`` is raised if the context wasn't built from the system's
+            table, or an equal one.
+        record:
+            How much of the simulation is recorded. By default (``"full"``), every
+            event is recorded along with copies of the states of the objects it
+            involves, and every ball's history holds its state at every event. With
+            ``"events_only"``, ball histories are left empty. With ``"final_state"``,
+            events are additionally recorded without the copied object states (their
+            agents' ``initial`` and ``final`` are None). Either is cheaper than the
+            default if only the outcome of the shot is of interest, but neither can be
+            combined with ``continuous`` (see
+            :class:`pooltool.evolution.event_based.config.RecordMode`).
+        stop_when:
+            If set, this is called with the system and the event after each event is
+            processed. If it returns True, the simulation ends right there: the event
+            is the last one recorded, and balls that are in motion are left in motion.
+            Predefined conditions, such as stopping at the first ball-ball collision
+            or once the cue ball is pocketed, are found in
+            :mod:`pooltool.evolution.event_based.stop`.
+        profile:
+            If set, the time spent in each phase of the simulation (detecting each
+            type of event, evolving the balls, resolving each type of event, and
+            recording the history), and the hit and miss counts of the collision cache,
+            are added to this profile. Pass the same profile to many simulations to
+            profile them as a whole (see
+            :class:`pooltool.evolution.event_based.profile.SimulationProfile`).
+        _strategy:
+            Private. Selects an alternative implementation of the event loop, for A/B
+            benchmarks and tests. Every alternative selects the same events as the
+            default (see :class:`pooltool.evolution.event_based.config._Strategy`).
 
     Returns:
         System: The simulated system.
@@ -215,16 +367,46 @@ def simulate(
         >>> system = pt.simulate(pt.System.example(), continuous=True)
         >>> for ball in system.balls.values(): assert len(ball.history_cts) > 0
 
+        You can end the simulation early with `stop_when`, for example once the cue
+        ball first contacts another ball
+
+        >>> import pooltool as pt
+        >>> from pooltool.evolution.event_based.stop import FirstBallBallCollision
+        >>> system = pt.System.example()
+        >>> system.strike(V0=2, phi=pt.aim.at_ball(system, "1"))
+        >>> system = pt.simulate(system, stop_when=FirstBallBallCollision("cue"))
+        >>> assert system.events[-1].event_type == pt.EventType.BALL_BALL
+
     See Also:
         - :func:`pooltool.evolution.continuize`
     """
+    start = time.perf_counter()
+
+    record = RecordMode(record)
+    if continuous and record is not RecordMode.FULL:
+        raise ValueError(f"continuous requires ball histories, but {record=}")
+
+    if context is not None:
+        context.validate(shot.table)
+
     if not inplace:
         shot = shot.copy()
 
     if not engine:
-        engine = DEFAULT_ENGINE
-
-    sim = _SimulationState(shot, engine, t_final, include, max_events)
+        engine = context.engine if context is not None else DEFAULT_ENGINE
+
+    sim = _SimulationState(
+        shot,
+        engine,
+        t_final,
+        include,
+        max_events,
+        context,
+        record,
+        stop_when,
+        profile,
+        _strategy,
+    )
     sim.init()
 
     while not sim.done:
@@ -235,6 +417,10 @@ def simulate(
     if continuous:
         continuize(sim.shot, dt=0.01 if dt is None else dt, inplace=True)
 
+    if profile is not None:
+        profile.total += time.perf_counter() - start
+        profile.simulations += 1
+
     return sim.shot
 
 
@@ -243,6 +429,9 @@ def get_next_event(
     *,
     transition_cache: TransitionCache | None = None,
     collision_cache: CollisionCache | None = None,
+    broadphase: BroadPhase | None = None,
+    context: SimulationContext | None = None,
+    profile: SimulationProfile | None = None,
 ) -> Event:
     # If not passed, unpopulated caches are initialized to pass to delegate functions.
     # These empty caches will be populated by the delegate functions, but then thrown
@@ -252,6 +441,10 @@ def get_next_event(
     if collision_cache is None:
         collision_cache = CollisionCache.create()
 
+    if broadphase is not None:
+        with _profiled(profile, "timing", "broadphase"):
+            broadphase.update(shot, transition_cache)
+
     # Start by assuming next event doesn't happen
     event = null_event(time=np.inf)
 
@@ -261,37 +454,56 @@ def get_next_event(
     # at t=0, we still call the remaining detection functions to fully populate the
     # collision cache, which is needed by debug/introspection tools.
     if shot.t == 0:
-        stick_ball_event = get_next_stick_ball_collision(
-            shot, collision_cache=collision_cache
-        )
+        with _profiled(profile, "detecting", EventType.STICK_BALL, collision_cache):
+            stick_ball_event = get_next_stick_ball_collision(
+                shot, collision_cache=collision_cache
+            )
         if stick_ball_event.time < event.time:
             event = stick_ball_event
 
-    transition_event = transition_cache.get_next()
+    with _profiled(profile, "detecting", EventType.NONE):
+        transition_event = transition_cache.get_next()
     if transition_event.time < event.time:
         event = transition_event
 
-    ball_ball_event = get_next_ball_ball_collision(
-        shot, collision_cache=collision_cache
-    )
+    with _profiled(profile, "detecting", EventType.BALL_BALL, collision_cache):
+        ball_ball_event = get_next_ball_ball_collision(
+            shot, collision_cache=collision_cache, broadphase=broadphase
+        )
     if ball_ball_event.time < event.time:
         event = ball_ball_event
 
-    ball_circular_cushion_event = get_next_ball_circular_cushion_event(
-        shot, collision_cache=collision_cache
-    )
+    with _profiled(
+        profile, "detecting", EventType.BALL_CIRCULAR_CUSHION, collision_cache
+    ):
+        ball_circular_cushion_event = get_next_ball_circular_cushion_event(
+            shot,
+            collision_cache=collision_cache,
+            broadphase=broadphase,
+            context=context,
+        )
     if ball_circular_cushion_event.time < event.time:
         event = ball_circular_cushion_event
 
-    ball_linear_cushion_event = get_next_ball_linear_cushion_collision(
-        shot, collision_cache=collision_cache
-    )
+    with _profiled(
+        profile, "detecting", EventType.BALL_LINEAR_CUSHION, collision_cache
+    ):
+        ball_linear_cushion_event = get_next_ball_linear_cushion_collision(
+            shot,
+            collision_cache=collision_cache,
+            broadphase=broadphase,
+            context=context,
+        )
     if ball_linear_cushion_event.time < event.time:
         event = ball_linear_cushion_event
 
-    ball_pocket_event = get_next_ball_pocket_collision(
-        shot, collision_cache=collision_cache
-    )
+    with _profiled(profile, "detecting", EventType.BALL_POCKET, collision_cache):
+        ball_pocket_event = get_next_ball_pocket_collision(
+            shot,
+            collision_cache=collision_cache,
+            broadphase=broadphase,
+            context=context,
+        )
     if ball_pocket_event.time < event.time:
         event = ball_pocket_event
 
@@ -303,7 +515,7 @@ def get_next_stick_ball_collision(
 ) -> Event:
     """Returns next stick-ball collision"""
 
-    cache = collision_cache.times.setdefault(EventType.STICK_BALL, {})
+    cache = collision_cache.get_times(EventType.STICK_BALL)
 
     obj_ids = (shot.cue.id, shot.cue.cue_ball_id)
 
@@ -315,9 +527,9 @@ def get_next_stick_ball_collision(
         )
 
     if shot.t == 0 and not _system_has_energy(shot) and shot.cue.V0 > 0:
-        cache[obj_ids] = 0.0
+        collision_cache.set_time(EventType.STICK_BALL, obj_ids, 0.0)
     else:
-        cache[obj_ids] = np.inf
+        collision_cache.set_time(EventType.STICK_BALL, obj_ids, np.inf)
 
     return stick_ball_collision(
         stick=shot.cue,
@@ -329,62 +541,52 @@ def get_next_stick_ball_collision(
 def get_next_ball_ball_collision(
     shot: System,
     collision_cache: CollisionCache,
+    broadphase: BroadPhase | None = None,
 ) -> Event:
     """Returns next ball-ball collision"""
 
-    cache = collision_cache.times.setdefault(EventType.BALL_BALL, {})
+    cache = collision_cache.get_times(EventType.BALL_BALL)
 
-    for ball1, ball2 in combinations(shot.balls.values(), 2):
-        ball_pair = (ball1.id, ball2.id)
-        if ball_pair in cache:
-            continue
+    balls = list(shot.balls.values())
 
-        ball1_state = ball1.state
-        ball1_params = ball1.params
+    # Gather the uncached pairs, then solve them all in one batch
+    idx1: list[int] = []
+    idx2: list[int] = []
+    for i, j in combinations(range(len(balls)), 2):
+        if (balls[i].id, balls[j].id) not in cache:
+            idx1.append(i)
+            idx2.append(j)
 
-        ball2_state = ball2.state
-        ball2_params = ball2.params
+    if idx1:
+        rvws = np.array([ball.state.rvw for ball in balls], dtype=np.float64)
+        ss = np.array([ball.state.s for ball in balls], dtype=np.int64)
+        params = ball_params_matrix(balls)
+        pairs1 = np.array(idx1, dtype=np.int64)
+        pairs2 = np.array(idx2, dtype=np.int64)
 
-        if ball1_state.s == const.pocketed or ball2_state.s == const.pocketed:
-            cache[ball_pair] = np.inf
-        elif (
-            ball1_state.s in const.nontranslating
-            and ball2_state.s in const.nontranslating
-        ):
-            cache[ball_pair] = np.inf
-        elif (
-            ptmath.norm3d(ball1_state.rvw[0] - ball2_state.rvw[0])
-            < ball1_params.R + ball2_params.R
-        ):
-            # If balls are intersecting, avoid internal collisions
-            cache[ball_pair] = np.inf
+        if broadphase is None:
+            dtau_Es = solve.ball_ball_collision_times(rvws, ss, params, pairs1, pairs2)
         else:
-            dtau_E = solve.ball_ball_collision_time(
-                rvw1=ball1_state.rvw,
-                rvw2=ball2_state.rvw,
-                s1=ball1_state.s,
-                s2=ball2_state.s,
-                mu1=(
-                    ball1_params.u_s
-                    if ball1_state.s == const.sliding
-                    else ball1_params.u_r
-                ),
-                mu2=(
-                    ball2_params.u_s
-                    if ball2_state.s == const.sliding
-                    else ball2_params.u_r
-                ),
-                m1=ball1_params.m,
-                m2=ball2_params.m,
-                g1=ball1_params.g,
-                g2=ball2_params.g,
-                R=ball1_params.R,
+            # Only pairs that are within reach of each other are solved
+            overlaps = overlapping_pairs(
+                broadphase.boxes, params, pairs1, pairs2, broadphase.margin
             )
-            cache[ball_pair] = shot.t + dtau_E
+            dtau_Es = np.full(len(idx1), np.inf)
+            dtau_Es[overlaps] = solve.ball_ball_collision_times(
+                rvws, ss, params, pairs1[overlaps], pairs2[overlaps]
+            )
+
+        collision_cache.set_times(
+            EventType.BALL_BALL,
+            (
+                ((balls[i].id, balls[j].id), shot.t + dtau_E)
+                for i, j, dtau_E in zip(idx1, idx2, dtau_Es.tolist())
+            ),
+        )
 
     # The cache is now populated and up-to-date
 
-    ball_pair = min(cache, key=lambda k: cache[k])
+    ball_pair = collision_cache.get_next(EventType.BALL_BALL)
 
     return ball_ball_collision(
         ball1=shot.balls[ball_pair[0]],
@@ -396,44 +598,64 @@ def get_next_ball_ball_collision(
 def get_next_ball_circular_cushion_event(
     shot: System,
     collision_cache: CollisionCache,
+    broadphase: BroadPhase | None = None,
+    context: SimulationContext | None = None,
 ) -> Event:
     """Returns next ball-cushion collision (circular cushion segment)"""
 
     if not shot.table.has_circular_cushions:
         return null_event(np.inf)
 
-    cache = collision_cache.times.setdefault(EventType.BALL_CIRCULAR_CUSHION, {})
+    cache = collision_cache.get_times(EventType.BALL_CIRCULAR_CUSHION)
+
+    circular = (
+        context.circular
+        if context is not None
+        else CircleArrays.from_circles(shot.table.cushion_segments.circular.values())
+    )
 
     for ball in shot.balls.values():
         state = ball.state
         params = ball.params
 
-        for cushion in shot.table.cushion_segments.circular.values():
-            obj_ids = (ball.id, cushion.id)
+        for cushion_id, a, b, radius in circular.rows:
+            obj_ids = (ball.id, cushion_id)
 
             if obj_ids in cache:
                 continue
 
             if ball.state.s in const.nontranslating:
-                cache[obj_ids] = np.inf
+                collision_cache.set_time(
+                    EventType.BALL_CIRCULAR_CUSHION, obj_ids, np.inf
+                )
+                continue
+
+            if broadphase is not None and not broadphase.may_collide(
+                ball.id, params.R, broadphase.circular[cushion_id]
+            ):
+                collision_cache.set_time(
+                    EventType.BALL_CIRCULAR_CUSHION, obj_ids, np.inf
+                )
                 continue
 
             dtau_E = solve.ball_circular_cushion_collision_time(
                 rvw=state.rvw,
                 s=state.s,
-                a=cushion.a,
-                b=cushion.b,
-                r=cushion.radius,
+                a=a,
+                b=b,
+                r=radius,
                 mu=(params.u_s if state.s == const.sliding else params.u_r),
                 m=params.m,
                 g=params.g,
                 R=params.R,
             )
-            cache[obj_ids] = shot.t + dtau_E
+            collision_cache.set_time(
+                EventType.BALL_CIRCULAR_CUSHION, obj_ids, shot.t + dtau_E
+            )
 
     # The cache is now populated and up-to-date
 
-    ball_id, cushion_id = min(cache, key=lambda k: cache[k])
+    ball_id, cushion_id = collision_cache.get_next(EventType.BALL_CIRCULAR_CUSHION)
 
     return ball_circular_cushion_collision(
         ball=shot.balls[ball_id],
@@ -443,47 +665,66 @@ def get_next_ball_circular_cushion_event(
 
 
 def get_next_ball_linear_cushion_collision(
-    shot: System, collision_cache: CollisionCache
+    shot: System,
+    collision_cache: CollisionCache,
+    broadphase: BroadPhase | None = None,
+    context: SimulationContext | None = None,
 ) -> Event:
     """Returns next ball-cushion collision (linear cushion segment)"""
 
     if not shot.table.has_linear_cushions:
         return null_event(np.inf)
 
-    cache = collision_cache.times.setdefault(EventType.BALL_LINEAR_CUSHION, {})
+    cache = collision_cache.get_times(EventType.BALL_LINEAR_CUSHION)
+
+    linear = (
+        context.linear
+        if context is not None
+        else LinearCushionArrays.from_segments(
+            shot.table.cushion_segments.linear.values()
+        )
+    )
 
     for ball in shot.balls.values():
         state = ball.state
         params = ball.params
 
-        for cushion in shot.table.cushion_segments.linear.values():
-            obj_ids = (ball.id, cushion.id)
+        for cushion_id, lx, ly, l0, p1, p2, direction in linear.rows:
+            obj_ids = (ball.id, cushion_id)
 
             if obj_ids in cache:
                 continue
 
             if ball.state.s in const.nontranslating:
-                cache[obj_ids] = np.inf
+                collision_cache.set_time(EventType.BALL_LINEAR_CUSHION, obj_ids, np.inf)
+                continue
+
+            if broadphase is not None and not broadphase.may_collide(
+                ball.id, params.R, broadphase.linear[cushion_id]
+            ):
+                collision_cache.set_time(EventType.BALL_LINEAR_CUSHION, obj_ids, np.inf)
                 continue
 
             dtau_E = solve.ball_linear_cushion_collision_time(
                 rvw=state.rvw,
                 s=state.s,
-                lx=cushion.lx,
-                ly=cushion.ly,
-                l0=cushion.l0,
-                p1=cushion.p1,
-                p2=cushion.p2,
-                direction=cushion.direction,
+                lx=lx,
+                ly=ly,
+                l0=l0,
+                p1=p1,
+                p2=p2,
+                direction=direction,
                 mu=(params.u_s if state.s == const.sliding else params.u_r),
                 m=params.m,
                 g=params.g,
                 R=params.R,
             )
 
-            cache[obj_ids] = shot.t + dtau_E
+            collision_cache.set_time(
+                EventType.BALL_LINEAR_CUSHION, obj_ids, shot.t + dtau_E
+            )
 
-    obj_ids = min(cache, key=lambda k: cache[k])
+    obj_ids = collision_cache.get_next(EventType.BALL_LINEAR_CUSHION)
 
     return ball_linear_cushion_collision(
         ball=shot.balls[obj_ids[0]],
@@ -495,44 +736,58 @@ def get_next_ball_linear_cushion_collision(
 def get_next_ball_pocket_collision(
     shot: System,
     collision_cache: CollisionCache,
+    broadphase: BroadPhase | None = None,
+    context: SimulationContext | None = None,
 ) -> Event:
     """Returns next ball-pocket collision"""
 
     if not shot.table.has_pockets:
         return null_event(np.inf)
 
-    cache = collision_cache.times.setdefault(EventType.BALL_POCKET, {})
+    cache = collision_cache.get_times(EventType.BALL_POCKET)
+
+    pockets = (
+        context.pockets
+        if context is not None
+        else CircleArrays.from_circles(shot.table.pockets.values())
+    )
 
     for ball in shot.balls.values():
         state = ball.state
         params = ball.params
 
-        for pocket in shot.table.pockets.values():
-            obj_ids = (ball.id, pocket.id)
+        for pocket_id, a, b, radius in pockets.rows:
+            obj_ids = (ball.id, pocket_id)
 
             if obj_ids in cache:
                 continue
 
             if ball.state.s in const.nontranslating:
-                cache[obj_ids] = np.inf
+                collision_cache.set_time(EventType.BALL_POCKET, obj_ids, np.inf)
+                continue
+
+            if broadphase is not None and not broadphase.may_collide(
+                ball.id, params.R, broadphase.pockets[pocket_id]
+            ):
+                collision_cache.set_time(EventType.BALL_POCKET, obj_ids, np.inf)
                 continue
 
             dtau_E = solve.ball_pocket_collision_time(
                 rvw=state.rvw,
                 s=state.s,
-                a=pocket.a,
-                b=pocket.b,
-                r=pocket.radius,
+                a=a,
+                b=b,
+                r=radius,
                 mu=(params.u_s if state.s == const.sliding else params.u_r),
                 m=params.m,
                 g=params.g,
                 R=params.R,
             )
-            cache[obj_ids] = shot.t + dtau_E
+            collision_cache.set_time(EventType.BALL_POCKET, obj_ids, shot.t + dtau_E)
 
     # The cache is now populated and up-to-date
 
-    ball_id, pocket_id = min(cache, key=lambda k: cache[k])
+    ball_id, pocket_id = collision_cache.get_next(EventType.BALL_POCKET)
 
     return ball_pocket_collision(
         ball=shot.balls[ball_id],
@@ -95,22 +95,27 @@ def get_u(
 
 
 @jit(nopython=True, cache=const.use_numba_cache)
-def ball_ball_collision_coeffs(
+def ball_ball_relative_motion(
     rvw1: NDArray[np.float64],
     rvw2: NDArray[np.float64],
     s1: int,
     s2: int,
     mu1: float,
     mu2: float,
-    m1: float,
-    m2: float,
     g1: float,
     g2: float,
     R: float,
-) -> tuple[float, float, float, float, float]:
-    """Get quartic coeffs required to determine the ball-ball collision time
+) -> tuple[float, float, float, float, float, float]:
+    """Get the in-plane trajectory of ball 2 relative to ball 1
 
     (just-in-time compiled)
+
+    The displacement of ball 2 from ball 1 is :math:`A t^2 + B t + C`, until either
+    ball changes motion state.
+
+    Returns:
+        tuple[float, float, float, float, float, float]:
+            The components (Ax, Ay, Bx, By, Cx, Cy).
     """
 
     c1x, c1y = rvw1[0, 0], rvw1[0, 1]
@@ -154,6 +159,13 @@ def ball_ball_collision_coeffs(
     Bx, By = b2x - b1x, b2y - b1y
     Cx, Cy = c2x - c1x, c2y - c1y
 
+    return Ax, Ay, Bx, By, Cx, Cy
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _quartic_coeffs(
+    Ax: float, Ay: float, Bx: float, By: float, Cx: float, Cy: float, R: float
+) -> tuple[float, float, float, float, float]:
     a = Ax**2 + Ay**2
     b = 2 * Ax * Bx + 2 * Ay * By
     c = Bx**2 + 2 * Ax * Cx + 2 * Ay * Cy + By**2
@@ -163,6 +175,93 @@ def ball_ball_collision_coeffs(
     return a, b, c, d, e
 
 
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_ball_collision_coeffs(
+    rvw1: NDArray[np.float64],
+    rvw2: NDArray[np.float64],
+    s1: int,
+    s2: int,
+    mu1: float,
+    mu2: float,
+    m1: float,
+    m2: float,
+    g1: float,
+    g2: float,
+    R: float,
+) -> tuple[float, float, float, float, float]:
+    """Get quartic coeffs required to determine the ball-ball collision time
+
+    (just-in-time compiled)
+    """
+    return _quartic_coeffs(
+        *ball_ball_relative_motion(rvw1, rvw2, s1, s2, mu1, mu2, g1, g2, R), R
+    )
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def straight_line_collision_time(
+    Ax: float, Ay: float, Bx: float, By: float, Cx: float, Cy: float, R: float
+) -> float:
+    """Get the collision time of 2 balls whose relative motion is a straight line
+
+    (just-in-time compiled)
+
+    When the relative acceleration is parallel to the relative velocity (see
+    :func:`ball_ball_relative_motion`), ball 2 moves along a line relative to ball 1.
+    This is the case when a rolling ball approaches a stationary or spinning one, when
+    a ball slides without any sideways slip (e.g. a stun, draw, or follow shot without
+    english) towards a stationary or spinning one, and when two rolling balls move
+    along a common line. Then the contact condition is a quadratic in the distance
+    :math:`s` travelled along the line, and :math:`s(t)` is itself a quadratic in time,
+    so the quartic is bypassed.
+
+    Returns:
+        float:
+            The time until collision (``np.inf`` if the balls don't collide), or
+            ``np.nan`` if the relative motion isn't a straight line, in which case the
+            quartic must be solved.
+    """
+    v = np.sqrt(Bx**2 + By**2)
+    if v == 0.0:
+        return np.nan
+
+    # Unit vector along the relative velocity
+    wx, wy = Bx / v, By / v
+
+    # The relative acceleration along, and perpendicular to, the line. The
+    # perpendicular component is nonzero only at the level of round-off (~1e-16) in
+    # the cases above, and otherwise orders of magnitude larger.
+    alpha = Ax * wx + Ay * wy
+    if abs(Ax * wy - Ay * wx) > 1e-12 * abs(alpha):
+        return np.nan
+
+    # Contact when |C + s w| = 2R, i.e. s^2 + 2 p s + q = 0
+    p = Cx * wx + Cy * wy
+    q = Cx**2 + Cy**2 - 4 * R**2
+    disc = p**2 - q
+    if disc < 0:
+        # The line misses
+        return np.inf
+
+    if q > 0:
+        if p >= 0:
+            # Both roots are behind
+            return np.inf
+        # The smaller root, in a form that avoids cancellation
+        s = q / (-p + np.sqrt(disc))
+    else:
+        # Already touching or intersecting, so the root where they separate
+        s = -p + np.sqrt(disc)
+
+    # Solve s = v t + alpha t^2 for the first time. If alpha < 0 and the distance is
+    # never reached, the balls come to rest (relative to one another) first.
+    disc_t = v**2 + 4 * alpha * s
+    if disc_t < 0:
+        return np.inf
+
+    return 2 * s / (v + np.sqrt(disc_t))
+
+
 @jit(nopython=True, cache=const.use_numba_cache)
 def ball_ball_collision_time(
     rvw1: NDArray[np.float64],
@@ -177,24 +276,115 @@ def ball_ball_collision_time(
     g2: float,
     R: float,
 ) -> float:
-    """Get the time until collision between 2 balls."""
-    return get_real_positive_smallest_root(
-        quartic.solve(
-            *ball_ball_collision_coeffs(
-                rvw1,
-                rvw2,
-                s1,
-                s2,
-                mu1,
-                mu2,
-                m1,
-                m2,
-                g1,
-                g2,
-                R,
-            )
+    """Get the time until collision between 2 balls.
+
+    Straight-line relative trajectories are solved in closed form (see
+    :func:`straight_line_collision_time`). Otherwise the quartic is solved.
+    """
+    motion = ball_ball_relative_motion(rvw1, rvw2, s1, s2, mu1, mu2, g1, g2, R)
+
+    time = straight_line_collision_time(*motion, R)
+    if not isnan(time):
+        return time
+
+    return get_real_positive_smallest_root(quartic.solve(*_quartic_coeffs(*motion, R)))
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_ball_collision_times(
+    rvws: NDArray[np.float64],
+    ss: NDArray[np.int64],
+    params: NDArray[np.float64],
+    idx1: NDArray[np.int64],
+    idx2: NDArray[np.int64],
+) -> NDArray[np.float64]:
+    """Get the time until collision for many ball pairs
+
+    (just-in-time compiled)
+
+    For each pair, this gives the same result as :func:`ball_ball_collision_time`,
+    except that pairs that can't collide are assigned ``np.inf`` without being solved.
+    A pair can't collide if either ball is pocketed, if neither ball is translating,
+    or if the balls are intersecting.
+
+    Pairs with straight-line relative trajectories are solved in closed form (see
+    :func:`straight_line_collision_time`). The quartic coefficients of the remaining
+    pairs are built in one pass and solved together with
+    :func:`pooltool.ptmath.roots.quartic.solve_many_smallest`.
+
+    Args:
+        rvws:
+            The kinematic states of the N balls. Shape (N, 3, 3).
+        ss:
+            The motion states of the N balls. Shape (N,).
+        params:
+            The ball parameters. Shape (N, 6), where the columns are ``R``, ``m``,
+            ``u_s``, ``u_sp``, ``u_r``, and ``g``.
+        idx1:
+            The index of the first ball of each of the M pairs. Shape (M,).
+        idx2:
+            The index of the second ball of each of the M pairs. Shape (M,).
+
+    Returns:
+        NDArray[np.float64]:
+            The time until collision for each pair. Shape (M,).
+    """
+    num_pairs = len(idx1)
+    times = np.full(num_pairs, np.inf)
+
+    coeffs = np.empty((num_pairs, 5), dtype=np.float64)
+    solved = np.empty(num_pairs, dtype=np.int64)
+    num_solved = 0
+
+    for k in range(num_pairs):
+        i, j = idx1[k], idx2[k]
+        s1, s2 = ss[i], ss[j]
+
+        if s1 == const.pocketed or s2 == const.pocketed:
+            continue
+
+        if (
+            s1 == const.spinning or s1 == const.pocketed or s1 == const.stationary
+        ) and (s2 == const.spinning or s2 == const.pocketed or s2 == const.stationary):
+            continue
+
+        if ptmath.norm3d(rvws[i, 0] - rvws[j, 0]) < params[i, 0] + params[j, 0]:
+            # If balls are intersecting, avoid internal collisions
+            continue
+
+        R = params[i, 0]
+        motion = ball_ball_relative_motion(
+            rvws[i],
+            rvws[j],
+            s1,
+            s2,
+            params[i, 2] if s1 == const.sliding else params[i, 4],
+            params[j, 2] if s2 == const.sliding else params[j, 4],
+            params[i, 5],
+            params[j, 5],
+            R,
         )
-    )
+
+        time = straight_line_collision_time(*motion, R)
+        if not isnan(time):
+            times[k] = time
+            continue
+
+        a, b, c, d, e = _quartic_coeffs(*motion, R)
+        coeffs[num_solved, 0] = a
+        coeffs[num_solved, 1] = b
+        coeffs[num_solved, 2] = c
+        coeffs[num_solved, 3] = d
+        coeffs[num_solved, 4] = e
+        solved[num_solved] = k
+        num_solved += 1
+
+    roots = quartic.solve_many_smallest(coeffs[:num_solved])
+
+    for n in range(num_solved):
+        times[solved[n]] = roots[n]
+
+    return times
 
 
 @jit(nopython=True, cache=const.use_numba_cache)
@@ -0,0 +1,86 @@
+"""Conditions for ending a simulation early
+
+Pass any of these (or any callable with the same signature) as the ``stop_when``
+argument of :func:`pooltool.evolution.simulate`. Each is called with the system and the
+event that was just processed, and returns True if the simulation should end there.
+
+The conditions are attrs classes rather than closures so that they can be pickled, and
+thereby passed to :class:`pooltool.evolution.event_based.parallel.SimulationPool`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import attrs
+
+from pooltool.events import Event, EventType
+from pooltool.system.datatypes import System
+
+StopCondition = Callable[[System, Event], bool]
+"""A callable that decides, after an event, whether a simulation should end"""
+
+
+@attrs.define(frozen=True)
+class FirstBallBallCollision:
+    """Stop at the first ball-ball collision
+
+    Attributes:
+        ball_id:
+            If set, only collisions involving this ball count. For example, use the cue
+            ball ID to stop once the first object ball is contacted.
+    """
+
+    ball_id: str | None = None
+
+    def __call__(self, shot: System, event: Event) -> bool:
+        if event.event_type != EventType.BALL_BALL:
+            return False
+
+        return self.ball_id is None or self.ball_id in event.ids
+
+
+@attrs.define(frozen=True)
+class BallPocketed:
+    """Stop once a given ball is pocketed
+
+    Attributes:
+        ball_id:
+            The ID of the ball.
+    """
+
+    ball_id: str
+
+    def __call__(self, shot: System, event: Event) -> bool:
+        return (
+            event.event_type == EventType.BALL_POCKET and event.ids[0] == self.ball_id
+        )
+
+
+@attrs.define(frozen=True)
+class CueBallScratched:
+    """Stop once the cue ball is pocketed
+
+    The cue ball is the one struck by the system's cue (``shot.cue.cue_ball_id``).
+    """
+
+    def __call__(self, shot: System, event: Event) -> bool:
+        return (
+            event.event_type == EventType.BALL_POCKET
+            and event.ids[0] == shot.cue.cue_ball_id
+        )
+
+
+@attrs.define(frozen=True)
+class AnyOf:
+    """Stop once any of several conditions is met
+
+    Attributes:
+        conditions:
+            The conditions, checked in order.
+    """
+
+    conditions: tuple[StopCondition, ...] = attrs.field(converter=tuple)
+
+    def __call__(self, shot: System, event: Event) -> bool:
+        return any(condition(shot, event) for condition in self.conditions)
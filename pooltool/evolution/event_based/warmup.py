@@ -0,0 +1,121 @@
+#! /usr/bin/env python
+"""Compile the simulation's jitted kernels ahead of the first simulation
+
+The first simulation in a fresh process pays for numba to compile (or, if its on-disk
+cache is warm, load) every kernel the simulation touches, e.g.
+:func:`pooltool.physics.evolve.evolve_ball_motion`, the quartic solvers, and the
+collision time solvers in :mod:`pooltool.evolution.event_based.solve`. This takes tens of
+seconds when nothing is cached, which dominates short-lived processes.
+
+:func:`warmup` pays that cost up front by exercising the kernels with the same argument
+types that a simulation uses. Since pooltool's kernels are cached to disk (see
+``pooltool.constants.use_numba_cache``), running it once, e.g. at install or image build
+time, means later processes only load the cached machine code:
+
+.. code-block:: bash
+
+    run-pooltool-warmup
+
+If pooltool is installed somewhere read-only, point ``NUMBA_CACHE_DIR`` at a writable
+directory, both when warming up and when simulating.
+"""
+
+from __future__ import annotations
+
+import time
+
+import click
+import numpy as np
+
+from pooltool.evolution.event_based.config import _Strategy
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
+from pooltool.objects.cue.datatypes import Cue
+from pooltool.objects.table.datatypes import Table
+from pooltool.physics.engine import PhysicsEngine
+from pooltool.ptmath.roots import quartic
+from pooltool.ptmath.roots.core import get_real_positive_smallest_roots
+from pooltool.system.datatypes import System
+
+
+def _break() -> System:
+    table = Table.default()
+    system = System(
+        cue=Cue(cue_ball_id="cue"),
+        table=table,
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+    system.strike(V0=8, phi=90.5, b=0.1)
+    return system
+
+
+def _english() -> System:
+    """A shot with side spin and elevation, so the cue ball slides sideways"""
+    system = System.example()
+    system.strike(V0=2, a=0.3, b=0.2, theta=10)
+    return system
+
+
+def _warmup_shots() -> list[System]:
+    return [System.example(), _break(), _english()]
+
+
+def warmup(engine: PhysicsEngine | None = None) -> float:
+    """Compile (or load from cache) the jitted kernels used by simulations
+
+    Representative shots (including a break, so that every event type and motion state
+    occurs) are simulated with each of the simulation's code paths (see
+    :func:`pooltool.evolution.simulate`), and the batch quartic solvers of
+    :mod:`pooltool.ptmath.roots.quartic` are called, so that every kernel in
+    :mod:`pooltool.ptmath`, :mod:`pooltool.physics.evolve` and
+    :mod:`pooltool.evolution.event_based.solve` that a simulation reaches is compiled
+    for the argument types it's called with.
+
+    :func:`pooltool.ptmath.roots.quartic.solve_many_smallest_parallel` is left out,
+    since running it starts numba's thread pool, and a process that forks afterwards
+    (e.g. to start a :class:`pooltool.evolution.event_based.parallel.SimulationPool`)
+    can deadlock.
+
+    Args:
+        engine:
+            The physics engine to simulate with. Its collision models may have jitted
+            kernels of their own. Defaults to the same engine that
+            :func:`pooltool.evolution.simulate` defaults to.
+
+    Returns:
+        float: The time taken, in seconds.
+
+    Example:
+        >>> import pooltool as pt
+        >>> pt.warmup()
+        >>> pt.simulate(pt.System.example())  # No JIT compilation
+    """
+    start = time.perf_counter()
+
+    for shot in _warmup_shots():
+        simulate(shot, engine=engine, inplace=True)
+
+    for kwargs in (
+        dict(continuous=True),
+        dict(_strategy=_Strategy(broadphase=False)),
+        dict(_strategy=_Strategy(heap=False)),
+    ):
+        for shot in _warmup_shots():
+            simulate(shot, engine=engine, inplace=True, **kwargs)
+
+    coeffs = np.random.default_rng(0).uniform(-1, 1, size=(4, 5))
+    get_real_positive_smallest_roots(quartic.solve_many(coeffs))
+    quartic.solve_many_smallest(coeffs)
+
+    return time.perf_counter() - start
+
+
+@click.command()
+def run() -> None:
+    """Compile pooltool's jitted kernels into numba's on-disk cache"""
+    click.echo(f"Warmed up in {warmup():.1f} s")
+
+
+if __name__ == "__main__":
+    run()
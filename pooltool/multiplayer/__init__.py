@@ -4,6 +4,7 @@
 from pooltool.multiplayer.client import MultiplayerClient
 from pooltool.multiplayer.server import MultiplayerServer
 from pooltool.multiplayer.protocol import (
+    Encoding,
     MessageType,
     GameMessage,
     PlayerInfo,
@@ -13,6 +14,7 @@ from pooltool.multiplayer.protocol import (
 __all__ = [
     "MultiplayerClient",
     "MultiplayerServer",
+    "Encoding",
     "MessageType",
     "GameMessage",
     "PlayerInfo",
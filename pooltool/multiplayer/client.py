@@ -15,8 +15,10 @@ import attrs
 
 from pooltool.multiplayer.protocol import (
     CueState,
+    Encoding,
     GameMessage,
     GameState,
+    MessageCodec,
     MessageType,
     PlayerInfo,
     RoomInfo,
@@ -30,7 +32,9 @@ class MultiplayerClient:
     """Client for connecting to multiplayer pool game servers.
 
     This client handles network communication with the server and provides
-    an event-driven interface for game state updates.
+    an event-driven interface for game state updates. Unless ``binary`` is False, the
+    client offers the binary encoding (see ``Encoding``) when it connects, and uses it
+    if the server accepts.
 
     Example:
         >>> client = MultiplayerClient()
@@ -42,6 +46,7 @@ class MultiplayerClient:
     port: int = 7777
     player_id: str = ""
     player_name: str = ""
+    binary: bool = True
 
     # Connection state
     is_connected: bool = False
@@ -68,6 +73,7 @@ class MultiplayerClient:
     _thread: threading.Thread | None = attrs.field(default=None, repr=False)
     _running: bool = attrs.field(default=False, repr=False)
     _message_queue: Queue = attrs.field(factory=Queue, repr=False)
+    _codec: MessageCodec = attrs.field(factory=MessageCodec, repr=False)
     _last_pong_time: float = attrs.field(default=0.0, repr=False)
     _ping_interval: float = attrs.field(default=5.0, repr=False)  # Send ping every 5 seconds
     _ping_timeout: float = attrs.field(default=15.0, repr=False)  # Disconnect if no pong for 15 seconds
@@ -281,19 +287,22 @@ class MultiplayerClient:
         )
 
         try:
-            json_data = message.to_json() + "\n"
             if self._loop and self._running:
                 asyncio.run_coroutine_threadsafe(
-                    self._async_send(json_data.encode()),
+                    self._async_send(message),
                     self._loop,
                 )
         except Exception as e:
             logger.error(f"Error sending message: {e}")
 
-    async def _async_send(self, data: bytes) -> None:
-        """Async send data to server."""
+    async def _async_send(self, message: GameMessage) -> None:
+        """Async send a message to server.
+
+        Messages are encoded here, in the network thread, so that they're encoded in
+        the order they're sent.
+        """
         if self._writer:
-            self._writer.write(data)
+            self._writer.write(self._codec.encode(message))
             await self._writer.drain()
 
     def _run_network_loop(self) -> None:
@@ -316,31 +325,43 @@ class MultiplayerClient:
                 self.port,
             )
 
-            # Send connect message
+            # Send connect message, offering the binary encoding
+            self._codec = MessageCodec()
+            connect_data: dict[str, Any] = {"name": self.player_name}
+            if self.binary:
+                connect_data["encodings"] = [Encoding.BINARY.value, Encoding.JSON.value]
             connect_msg = GameMessage(
                 msg_type=MessageType.CONNECT,
                 sender_id="",
-                data={"name": self.player_name},
+                data=connect_data,
                 timestamp=time.time(),
             )
-            self._writer.write((connect_msg.to_json() + "\n").encode())
+            self._writer.write(self._codec.encode(connect_msg))
             await self._writer.drain()
 
             # Initialize ping timing
             self._last_pong_time = time.time()
             last_ping_time = time.time()
 
-            # Listen for messages
+            # Listen for messages. A read that times out is kept pending rather than
+            # cancelled, since cancelling it could drop part of a binary frame.
+            read: asyncio.Future[GameMessage | None] | None = None
             while self._running:
                 try:
-                    data = await asyncio.wait_for(
-                        self._reader.readline(),
-                        timeout=0.5,
-                    )
-                    if not data:
+                    if read is None:
+                        read = asyncio.ensure_future(self._codec.read(self._reader))
+                    message = await asyncio.wait_for(asyncio.shield(read), timeout=0.5)
+                    read = None
+                    if message is None:
                         break
 
-                    message = GameMessage.from_json(data.decode().strip())
+                    # Switch encodings before anything else is sent
+                    if (
+                        message.msg_type == MessageType.CONNECT
+                        and message.data.get("encoding") == Encoding.BINARY.value
+                    ):
+                        self._codec.encoding = Encoding.BINARY
+
                     self._message_queue.put(message)
 
                 except asyncio.TimeoutError:
@@ -367,6 +388,9 @@ class MultiplayerClient:
                     logger.error(f"Error receiving message: {e}")
                     break
 
+            if read is not None:
+                read.cancel()
+
         except ConnectionRefusedError:
             logger.error(f"Connection refused to {self.host}:{self.port}")
             self._message_queue.put(
@@ -400,7 +424,7 @@ class MultiplayerClient:
                 timestamp=time.time(),
             )
             try:
-                self._writer.write((ping_msg.to_json() + "\n").encode())
+                self._writer.write(self._codec.encode(ping_msg))
                 await self._writer.drain()
             except Exception as e:
                 logger.error(f"Error sending ping: {e}")
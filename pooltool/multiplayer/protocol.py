@@ -3,11 +3,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import struct
 from enum import Enum
 from typing import Any
 
 import attrs
+import msgpack
+
+import pooltool.constants as const
 
 
 class MessageType(str, Enum):
@@ -43,6 +48,26 @@ class MessageType(str, Enum):
     ERROR = "error"
 
 
+class Encoding(str, Enum):
+    """Wire encodings of messages.
+
+    Every connection starts out with ``JSON``: newline-delimited ``GameMessage.to_json``.
+    A client that supports ``BINARY`` offers it in its ``CONNECT`` message
+    (``"encodings": ["binary", "json"]``), and if the server supports it too, the
+    server's ``CONNECT`` response says so (``"encoding": "binary"``). From then on, both
+    sides send length-prefixed msgpack frames (see ``MessageCodec``). Clients and servers
+    that don't know about encodings never offer or accept ``BINARY``, and keep talking
+    JSON.
+    """
+
+    JSON = "json"
+    BINARY = "binary"
+
+
+class ProtocolError(Exception):
+    """A message could not be decoded."""
+
+
 @attrs.define
 class PlayerInfo:
     """Information about a connected player."""
@@ -146,5 +171,240 @@ def serialize_ball_states(balls: dict) -> dict[str, str]:
     """Extract ball states from a balls dictionary."""
     states = {}
     for ball_id, ball in balls.items():
-        states[ball_id] = ball.state.s.name
+        states[ball_id] = const.state_dict[ball.state.s]
     return states
+
+
+# Binary frames start with this byte, which no JSON message can start with, followed by
+# the length of the msgpack payload as a big-endian uint32
+FRAME_MAGIC = 0xB1
+FRAME_HEADER = struct.Struct("!BI")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Ball states are found in the message data, or in its game state
+_BALL_STATE_PATHS = ("", "game_state")
+
+
+@attrs.define
+class BallStateEncoder:
+    """Encodes ball positions and states as deltas against the last ones sent.
+
+    Each encoded ball state has a sequence number. The first one, and any whose set of
+    balls differs from the last, is a keyframe that holds every ball. The others are
+    deltas that only hold the balls whose position or state changed, and name the
+    sequence number of the state they are relative to. Since messages are delivered
+    in order over a single TCP connection, any state that was sent has been received
+    by the time a later one is decoded, so the last state sent is the last one the peer
+    has acknowledged.
+    """
+
+    seq: int = 0
+    _positions: dict[str, tuple[float, float, float]] = attrs.field(factory=dict)
+    _states: dict[str, str] = attrs.field(factory=dict)
+
+    def encode(
+        self,
+        positions: dict[str, Any],
+        states: dict[str, str],
+    ) -> list[Any]:
+        """Encode ball positions and states.
+
+        Returns:
+            ``[seq, baseline, balls]``, where baseline is the sequence number of the
+            state that this one is relative to (0 for a keyframe), and balls is a list
+            of ``[ball_id, [x, y, z] or None, state or None]``, with None for anything
+            that is unchanged.
+        """
+        positions = {
+            ball_id: (float(pos[0]), float(pos[1]), float(pos[2]))
+            for ball_id, pos in positions.items()
+        }
+
+        keyframe = self.seq == 0 or positions.keys() != self._positions.keys()
+        baseline = 0 if keyframe else self.seq
+
+        balls = []
+        for ball_id, pos in positions.items():
+            state = states[ball_id]
+            pos_changed = keyframe or pos != self._positions[ball_id]
+            state_changed = keyframe or state != self._states[ball_id]
+            if pos_changed or state_changed:
+                balls.append(
+                    [
+                        ball_id,
+                        list(pos) if pos_changed else None,
+                        state if state_changed else None,
+                    ]
+                )
+
+        self.seq += 1
+        self._positions = positions
+        self._states = dict(states)
+
+        return [self.seq, baseline, balls]
+
+
+@attrs.define
+class BallStateDecoder:
+    """Decodes the ball states of a ``BallStateEncoder``."""
+
+    seq: int = 0
+    _positions: dict[str, tuple[float, float, float]] = attrs.field(factory=dict)
+    _states: dict[str, str] = attrs.field(factory=dict)
+
+    def decode(
+        self, encoded: list[Any]
+    ) -> tuple[dict[str, tuple[float, float, float]], dict[str, str]]:
+        """Decode ball positions and states.
+
+        Raises:
+            ProtocolError: If a delta is relative to a state that wasn't decoded.
+        """
+        seq, baseline, balls = encoded
+
+        if baseline == 0:
+            positions: dict[str, tuple[float, float, float]] = {}
+            states: dict[str, str] = {}
+        elif baseline == self.seq:
+            positions = dict(self._positions)
+            states = dict(self._states)
+        else:
+            raise ProtocolError(
+                f"Ball state {seq} is relative to {baseline}, but the last ball state "
+                f"received is {self.seq}"
+            )
+
+        for ball_id, pos, state in balls:
+            if pos is not None:
+                positions[ball_id] = tuple(pos)
+            if state is not None:
+                states[ball_id] = state
+
+        self.seq = seq
+        self._positions = positions
+        self._states = states
+
+        return dict(positions), dict(states)
+
+
+@attrs.define
+class MessageCodec:
+    """Encodes and decodes the messages of one connection.
+
+    Messages are encoded with ``encoding``, which starts out as ``Encoding.JSON`` and is
+    switched once ``Encoding.BINARY`` has been negotiated. Incoming messages may use
+    either encoding: a binary frame is recognized by its leading ``FRAME_MAGIC`` byte.
+
+    A binary frame's payload is the msgpack array ``[msg_type, sender_id, timestamp,
+    data, balls]``. If the data (or its ``game_state``) holds ``ball_positions`` and
+    ``ball_states`` for the same balls, these are taken out of it and sent as balls,
+    ``[path, encoded]``, where encoded is the output of ``BallStateEncoder.encode``.
+    Otherwise balls is None.
+
+    Since ball states are delta-encoded, a codec must only be used for one connection,
+    and every message it encodes must be sent.
+    """
+
+    encoding: Encoding = Encoding.JSON
+    _ball_encoder: BallStateEncoder = attrs.field(factory=BallStateEncoder)
+    _ball_decoder: BallStateDecoder = attrs.field(factory=BallStateDecoder)
+
+    def encode(self, message: GameMessage) -> bytes:
+        """Encode a message, ready to be written to the stream."""
+        if self.encoding == Encoding.JSON:
+            return (message.to_json() + "\n").encode()
+
+        data, balls = self._take_ball_states(message.data)
+        payload = msgpack.packb(
+            [message.msg_type.value, message.sender_id, message.timestamp, data, balls]
+        )
+        return FRAME_HEADER.pack(FRAME_MAGIC, len(payload)) + payload
+
+    def decode_frame(self, payload: bytes) -> GameMessage:
+        """Decode the payload of a binary frame.
+
+        Raises:
+            ProtocolError: If the payload is malformed.
+        """
+        try:
+            msg_type, sender_id, timestamp, data, balls = msgpack.unpackb(
+                payload, strict_map_key=False
+            )
+            if balls is not None:
+                path, encoded = balls
+                positions, states = self._ball_decoder.decode(encoded)
+                target = data[path] if path else data
+                target["ball_positions"] = positions
+                target["ball_states"] = states
+
+            return GameMessage(
+                msg_type=MessageType(msg_type),
+                sender_id=sender_id,
+                data=data,
+                timestamp=timestamp,
+            )
+        except ProtocolError:
+            raise
+        except Exception as e:
+            raise ProtocolError(f"Malformed binary frame: {e}") from e
+
+    async def read(self, reader: asyncio.StreamReader) -> GameMessage | None:
+        """Read the next message from a stream.
+
+        Returns:
+            The message, or None if the stream has ended.
+
+        Raises:
+            ProtocolError: If a binary frame is malformed, or is too large.
+            json.JSONDecodeError: If a JSON message is malformed.
+        """
+        try:
+            first = await reader.readexactly(1)
+            if first[0] != FRAME_MAGIC:
+                line = first + await reader.readline()
+                return GameMessage.from_json(line.decode().strip())
+
+            header = first + await reader.readexactly(FRAME_HEADER.size - 1)
+            _, size = FRAME_HEADER.unpack(header)
+            if size > MAX_FRAME_SIZE:
+                raise ProtocolError(f"Binary frame of {size} bytes is too large")
+
+            payload = await reader.readexactly(size)
+        except asyncio.IncompleteReadError:
+            return None
+
+        return self.decode_frame(payload)
+
+    def _take_ball_states(
+        self, data: dict[str, Any]
+    ) -> tuple[dict[str, Any], list[Any] | None]:
+        """Take ball states out of the message data, if there are any."""
+        for path in _BALL_STATE_PATHS:
+            source = data.get(path) if path else data
+            if not isinstance(source, dict):
+                continue
+
+            positions = source.get("ball_positions")
+            states = source.get("ball_states")
+            if (
+                not isinstance(positions, dict)
+                or not isinstance(states, dict)
+                or positions.keys() != states.keys()
+            ):
+                continue
+
+            # The ball states are encoded without modifying the caller's data
+            stripped = {
+                key: value
+                for key, value in source.items()
+                if key not in ("ball_positions", "ball_states")
+            }
+            try:
+                encoded = self._ball_encoder.encode(positions, states)
+            except (TypeError, ValueError, IndexError):
+                # Not ball positions after all. The encoder is left untouched.
+                continue
+
+            return ({**data, path: stripped} if path else stripped), [path, encoded]
+
+        return data, None
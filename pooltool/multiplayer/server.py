@@ -8,30 +8,126 @@ import json
 import logging
 import time
 import uuid
+from collections import deque
+from enum import Enum
 from typing import Callable
 
 import attrs
 
 from pooltool.multiplayer.protocol import (
+    Encoding,
     GameMessage,
     GameState,
+    MessageCodec,
     MessageType,
     PlayerInfo,
+    ProtocolError,
     RoomInfo,
 )
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a closing connection to send what's left, before aborting it
+CLOSE_TIMEOUT = 1.0
+
+
+class SlowClientPolicy(str, Enum):
+    """What to do about a client that can't keep up with the messages sent to it.
+
+    A client can't keep up when its outbound queue is full.
+    """
+
+    # Aim updates that are waiting to be sent are superseded by newer ones, and are
+    # dropped. If the queue is still full, the client is disconnected.
+    DROP_STALE = "drop_stale"
+
+    # The client is disconnected.
+    DISCONNECT = "disconnect"
+
+
+@attrs.define
+class OutboundMessage:
+    """A message waiting to be sent.
+
+    Messages are encoded right before they're sent, by the connection's codec, unless
+    they were encoded up front.
+    """
+
+    message: GameMessage
+    data: bytes | None = None
+
+    @property
+    def is_aim(self) -> bool:
+        return self.message.msg_type == MessageType.SHOT_AIM
+
+
+@attrs.define
+class OutboundQueue:
+    """A bounded queue of the messages waiting to be sent to a client."""
+
+    maxsize: int
+    drop_stale: bool = True
+    dropped: int = 0
+    _items: deque[OutboundMessage] = attrs.field(factory=deque)
+    _ready: asyncio.Event = attrs.field(factory=asyncio.Event)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: OutboundMessage) -> bool:
+        """Queue a message.
+
+        Returns:
+            False if the queue is full, in which case the message isn't queued.
+        """
+        if self.drop_stale and item.is_aim:
+            # A newer aim update supersedes the queued ones from the same sender
+            self._drop(
+                lambda queued: (
+                    queued.is_aim and queued.message.sender_id == item.message.sender_id
+                )
+            )
+
+        if len(self._items) >= self.maxsize and self.drop_stale:
+            self._drop(lambda queued: queued.is_aim)
+
+        if len(self._items) >= self.maxsize:
+            return False
+
+        self._items.append(item)
+        self._ready.set()
+        return True
+
+    async def get(self) -> OutboundMessage:
+        """Wait for the next message."""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+
+        return self._items.popleft()
+
+    def _drop(self, stale: Callable[[OutboundMessage], bool]) -> None:
+        kept = deque(queued for queued in self._items if not stale(queued))
+        self.dropped += len(self._items) - len(kept)
+        self._items = kept
+
 
 @attrs.define
 class ConnectedClient:
-    """Represents a connected client."""
+    """Represents a connected client.
+
+    Messages to the client are queued in its outbox, and written by its writer task, so
+    that a slow client doesn't hold up anyone sending to it.
+    """
 
     client_id: str
     writer: asyncio.StreamWriter
     reader: asyncio.StreamReader
     player_info: PlayerInfo
+    outbox: OutboundQueue
     room_id: str | None = None
+    codec: MessageCodec = attrs.field(factory=MessageCodec)
+    writer_task: asyncio.Task | None = None
 
 
 class MultiplayerServer:
@@ -40,6 +136,15 @@ class MultiplayerServer:
     This server manages client connections, game rooms, and message routing.
     It uses asyncio for non-blocking network operations.
 
+    Messages are exchanged as newline-delimited JSON, unless a client offers the binary
+    encoding when it connects (see ``Encoding``), in which case the server uses it for
+    that client.
+
+    Sending a message to a client only queues it, and every client has its own task that
+    writes its queued messages. So broadcasting to a room doesn't wait on any client.
+    Each client's queue holds at most ``max_queue`` messages, and ``slow_client_policy``
+    says what to do about a client whose queue is full.
+
     Example:
         >>> server = MultiplayerServer(host="0.0.0.0", port=7777)
         >>> asyncio.run(server.start())
@@ -50,10 +155,16 @@ class MultiplayerServer:
         host: str = "0.0.0.0",
         port: int = 7777,
         max_rooms: int = 100,
+        binary: bool = True,
+        max_queue: int = 256,
+        slow_client_policy: SlowClientPolicy = SlowClientPolicy.DROP_STALE,
     ):
         self.host = host
         self.port = port
         self.max_rooms = max_rooms
+        self.binary = binary
+        self.max_queue = max_queue
+        self.slow_client_policy = slow_client_policy
 
         self.clients: dict[str, ConnectedClient] = {}
         self.rooms: dict[str, RoomInfo] = {}
@@ -62,6 +173,9 @@ class MultiplayerServer:
         self._server: asyncio.Server | None = None
         self._running = False
 
+        # Disconnections of slow clients that are underway
+        self._disconnecting: set[asyncio.Task] = set()
+
         self._message_handlers: dict[MessageType, Callable] = {
             MessageType.CONNECT: self._handle_connect,
             MessageType.DISCONNECT: self._handle_disconnect,
@@ -100,6 +214,7 @@ class MultiplayerServer:
         # Disconnect all clients
         for client in list(self.clients.values()):
             await self._disconnect_client(client.client_id)
+        await asyncio.gather(*self._disconnecting, return_exceptions=True)
 
         if self._server:
             self._server.close()
@@ -107,12 +222,12 @@ class MultiplayerServer:
 
         logger.info("Multiplayer server stopped")
 
-    async def _handle_client(
+    def _add_client(
         self,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
-    ) -> None:
-        """Handle a new client connection."""
+    ) -> ConnectedClient:
+        """Register a new connection, and start writing to it."""
         client_id = str(uuid.uuid4())
         addr = writer.get_extra_info("peername")
         logger.info(f"New connection from {addr}, assigned ID: {client_id}")
@@ -129,20 +244,37 @@ class MultiplayerServer:
             writer=writer,
             reader=reader,
             player_info=player_info,
+            outbox=OutboundQueue(
+                maxsize=self.max_queue,
+                drop_stale=self.slow_client_policy == SlowClientPolicy.DROP_STALE,
+            ),
         )
+        client.writer_task = asyncio.create_task(self._write_messages(client))
         self.clients[client_id] = client
 
+        return client
+
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Handle a new client connection."""
+        client = self._add_client(reader, writer)
+        client_id = client.client_id
+
         try:
             while self._running:
-                data = await reader.readline()
-                if not data:
-                    break
-
                 try:
-                    message = GameMessage.from_json(data.decode().strip())
+                    message = await client.codec.read(reader)
+                    if message is None:
+                        break
                     await self._process_message(client_id, message)
                 except json.JSONDecodeError as e:
                     logger.warning(f"Invalid JSON from {client_id}: {e}")
+                except ProtocolError as e:
+                    logger.warning(f"Invalid binary frame from {client_id}: {e}")
+                    break
                 except Exception as e:
                     logger.error(f"Error processing message from {client_id}: {e}")
 
@@ -163,17 +295,9 @@ class MultiplayerServer:
 
     async def _send_message(self, client_id: str, message: GameMessage) -> None:
         """Send a message to a specific client."""
-        if client_id not in self.clients:
-            return
-
-        client = self.clients[client_id]
-        try:
-            data = message.to_json() + "\n"
-            client.writer.write(data.encode())
-            await client.writer.drain()
-        except Exception as e:
-            logger.error(f"Error sending to {client_id}: {e}")
-            await self._disconnect_client(client_id)
+        client = self.clients.get(client_id)
+        if client is not None:
+            self._queue_message(client, OutboundMessage(message))
 
     async def _broadcast_to_room(
         self,
@@ -185,10 +309,53 @@ class MultiplayerServer:
         if room_id not in self.rooms:
             return
 
+        # The JSON encoding of the message is the same for every client, so it's only
+        # done once
+        json_data: bytes | None = None
+
         room = self.rooms[room_id]
         for player in room.players:
-            if player.player_id != exclude_client:
-                await self._send_message(player.player_id, message)
+            client = self.clients.get(player.player_id)
+            if client is None or player.player_id == exclude_client:
+                continue
+
+            if client.codec.encoding == Encoding.JSON:
+                if json_data is None:
+                    json_data = client.codec.encode(message)
+                self._queue_message(client, OutboundMessage(message, json_data))
+            else:
+                self._queue_message(client, OutboundMessage(message))
+
+    def _queue_message(self, client: ConnectedClient, item: OutboundMessage) -> None:
+        """Queue a message for a client, or disconnect it if it can't keep up."""
+        if client.outbox.put(item):
+            return
+
+        logger.warning(
+            f"Disconnecting {client.client_id}: {len(client.outbox)} messages waiting "
+            f"to be sent"
+        )
+
+        # The client isn't reading, so its connection is closed without flushing it
+        client.writer.transport.abort()
+        task = asyncio.create_task(self._disconnect_client(client.client_id))
+        self._disconnecting.add(task)
+        task.add_done_callback(self._disconnecting.discard)
+
+    async def _write_messages(self, client: ConnectedClient) -> None:
+        """Write the messages queued for a client, for as long as it's connected."""
+        while True:
+            item = await client.outbox.get()
+            try:
+                data = item.data or client.codec.encode(item.message)
+                client.writer.write(data)
+                await client.writer.drain()
+            except Exception as e:
+                logger.error(f"Error sending to {client.client_id}: {e}")
+                task = asyncio.create_task(self._disconnect_client(client.client_id))
+                self._disconnecting.add(task)
+                task.add_done_callback(self._disconnecting.discard)
+                return
 
     async def _send_error(self, client_id: str, error_msg: str) -> None:
         """Send an error message to a specific client."""
@@ -202,23 +369,28 @@ class MultiplayerServer:
 
     async def _disconnect_client(self, client_id: str) -> None:
         """Disconnect a client and clean up their resources."""
-        if client_id not in self.clients:
+        client = self.clients.pop(client_id, None)
+        if client is None:
             return
 
-        client = self.clients[client_id]
-
         # Leave any room they're in
         if client.room_id:
             await self._leave_room(client_id, client.room_id)
+            client.room_id = None
+
+        # Stop writing to it, and close connection
+        if client.writer_task is not None:
+            client.writer_task.cancel()
 
-        # Close connection
         try:
             client.writer.close()
-            await client.writer.wait_closed()
+            await asyncio.wait_for(client.writer.wait_closed(), CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            # The client isn't reading what's left to be sent
+            client.writer.transport.abort()
         except Exception:
             pass
 
-        del self.clients[client_id]
         logger.info(f"Client {client_id} disconnected")
 
     async def _leave_room(self, client_id: str, room_id: str) -> None:
@@ -257,8 +429,18 @@ class MultiplayerServer:
 
     async def _handle_connect(self, client_id: str, message: GameMessage) -> None:
         """Handle client connection request."""
+        client = self.clients[client_id]
         name = message.data.get("name", f"Player_{client_id[:8]}")
-        self.clients[client_id].player_info.name = name
+        client.player_info.name = name
+
+        # Use the binary encoding if the client offers it. Clients that predate it
+        # don't offer any encodings, and keep receiving JSON.
+        encoding = (
+            Encoding.BINARY
+            if self.binary
+            and Encoding.BINARY.value in message.data.get("encodings", [])
+            else Encoding.JSON
+        )
 
         response = GameMessage(
             msg_type=MessageType.CONNECT,
@@ -267,10 +449,14 @@ class MultiplayerServer:
                 "success": True,
                 "player_id": client_id,
                 "name": name,
+                "encoding": encoding.value,
             },
             timestamp=time.time(),
         )
-        await self._send_message(client_id, response)
+        # The response itself is still JSON, so that any client can read it
+        response_data = client.codec.encode(response)
+        self._queue_message(client, OutboundMessage(response, response_data))
+        client.codec.encoding = encoding
 
     async def _handle_disconnect(self, client_id: str, message: GameMessage) -> None:
         """Handle client disconnect request."""
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterator, Sequence
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
 
 import numpy as np
 from attrs import define, evolve, field, validate
@@ -138,70 +139,180 @@ class BallState:
         )
 
 
-@define
+@define(init=False, eq=False, repr=False)
 class BallHistory:
-    """A container of BallState objects
+    """A container of time-increasing ball states
 
-    Attributes:
+    The states are stored column-wise, in growable arrays of kinematic states, motion
+    states, and times. Appending a state copies it into the arrays, and indexing the
+    history creates a :class:`pooltool.objects.BallState` on the spot. This keeps long
+    histories (in particular, continuized ones) compact, and lets :meth:`vectorize`
+    return views of the arrays rather than copies.
+
+    Args:
         states:
-            A list of time-increasing BallState objects (*default* = ``[]``).
+            Time-increasing states to initialize the history with (*default* = ``()``).
     """
 
-    states: list[BallState] = field(factory=list)
-    """A list of time-increasing BallState objects (*default* = ``[]``)"""
+    _rvw: NDArray[np.float64]
+    _s: NDArray[np.float64]
+    _t: NDArray[np.float64]
+    _size: int
+
+    def __init__(self, states: Iterable[BallState] = ()) -> None:
+        self.__attrs_init__(
+            rvw=np.empty((0, 3, 3), dtype=np.float64),
+            s=np.empty(0, dtype=np.float64),
+            t=np.empty(0, dtype=np.float64),
+            size=0,
+        )
+
+        for state in states:
+            self.add(state)
 
     def __getitem__(self, idx: int) -> BallState:
-        return self.states[idx]
+        """Create the state at a given index
+
+        The state is a copy. Modifying it doesn't modify the history.
+        """
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._size))]  # type: ignore
+
+        if idx < 0:
+            idx += self._size
+        if not 0 <= idx < self._size:
+            raise IndexError("BallHistory index out of range")
+
+        return BallState(self._rvw[idx].copy(), int(self._s[idx]), float(self._t[idx]))
+
+    def __setitem__(self, idx: int, state: BallState) -> None:
+        """Overwrite the state at a given index with a copy of another state"""
+        if idx < 0:
+            idx += self._size
+        if not 0 <= idx < self._size:
+            raise IndexError("BallHistory index out of range")
+
+        self._rvw[idx] = state.rvw
+        self._s[idx] = state.s
+        self._t[idx] = state.t
 
     def __len__(self) -> int:
-        return len(self.states)
+        return self._size
 
     def __iter__(self) -> Iterator[BallState]:
-        yield from self.states
+        for idx in range(self._size):
+            yield self[idx]
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, BallHistory):
+            return NotImplemented
+
+        n = self._size
+        return (
+            n == other._size
+            and np.array_equal(self._rvw[:n], other._rvw[:n], equal_nan=True)
+            and np.array_equal(self._s[:n], other._s[:n])
+            and np.array_equal(self._t[:n], other._t[:n])
+        )
+
+    def __repr__(self) -> str:
+        return f"BallHistory(states={self.states!r})"
+
+    def __getstate__(self) -> dict[str, Any]:
+        n = self._size
+        return {"rvw": self._rvw[:n], "s": self._s[:n], "t": self._t[:n]}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        if "states" in state:
+            # Pickled before histories were stored column-wise
+            self.__init__(state["states"])
+            return
+
+        other = BallHistory.from_vectorization((state["rvw"], state["s"], state["t"]))
+        self._rvw, self._s, self._t, self._size = (
+            other._rvw,
+            other._s,
+            other._t,
+            other._size,
+        )
+
+    @property
+    def states(self) -> tuple[BallState, ...]:
+        """The states of the history, as a tuple
+
+        Each state is created on the spot (see :meth:`__getitem__`), so the tuple is a
+        snapshot: it can't be modified, and modifying its states doesn't modify the
+        history. Use :meth:`add` and item assignment to modify the history instead.
+        """
+        return tuple(self)
 
     @property
     def empty(self) -> bool:
         """Returns whether or not the ball history is empty
 
         Returns:
-            bool: True if :attr:`states` has no length else False
+            bool: True if the history has no states else False
         """
-        return not bool(len(self.states))
+        return not self._size
 
     def add(self, state: BallState) -> None:
         """Append a state to the history
 
         Raises:
-            AssertionError: If ``state.t < self.states[-1]``
+            AssertionError: If ``state.t < self[-1].t``
 
         Notes:
-            - This appends ``state`` to :attr:`states`
-            - ``state`` is not copied before appending to the history, so they
-              share the same memory address.
+            - ``state`` is copied into the history, so modifying ``state`` afterwards
+              doesn't modify the history.
+            - The arrays grow geometrically, so appending is amortized constant time.
         """
-        if not self.empty:
-            assert state.t >= self.states[-1].t
+        n = self._size
+
+        if n:
+            assert state.t >= self._t[n - 1]
 
-        self.states.append(state)
+        if n == len(self._t):
+            self._reserve(max(2 * n, 8))
+
+        self._rvw[n] = state.rvw
+        self._s[n] = state.s
+        self._t[n] = state.t
+        self._size = n + 1
+
+    def _reserve(self, capacity: int) -> None:
+        n = self._size
+
+        rvw = np.empty((capacity, 3, 3), dtype=np.float64)
+        s = np.empty(capacity, dtype=np.float64)
+        t = np.empty(capacity, dtype=np.float64)
+
+        rvw[:n] = self._rvw[:n]
+        s[:n] = self._s[:n]
+        t[:n] = self._t[:n]
+
+        self._rvw, self._s, self._t = rvw, s, t
 
     def copy(self) -> BallHistory:
         """Create a copy"""
-        history = BallHistory()
-        for state in self.states:
-            history.add(state.copy())
-
-        return history
+        return BallHistory.from_vectorization(
+            (self._rvw[: self._size], self._s[: self._size], self._t[: self._size])
+        )
 
     def vectorize(
         self,
     ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
-        """Compile the attribute from each ball state into arrays
+        """Get the states of the history as arrays
 
-        This method unzips each :class:`pooltool.objects.BallState` in :attr:`states`,
-        resulting in an array of :attr:`pooltool.objects.BallState.rvw` values, an array
-        of :attr:`pooltool.objects.BallState.s` values, and an array of
+        This method returns an array of :attr:`pooltool.objects.BallState.rvw` values,
+        an array of :attr:`pooltool.objects.BallState.s` values, and an array of
         :attr:`pooltool.objects.BallState.t` values.
 
+        The arrays are views of the history's storage, so they aren't copied. Modifying
+        them modifies the history, and appending to the history may or may not be
+        reflected in them.
+
         The vectors have the following properties:
 
         >>> import pooltool as pt
@@ -248,18 +359,8 @@ class BallHistory:
                 "forgotten to continuize your shot (`pt.continuize(shot, inplace=True)`."
             )
 
-        num_states = len(self.states)
-
-        rvws = np.empty((num_states, 3, 3), dtype=np.float64)
-        ss = np.empty(num_states, dtype=np.float64)
-        ts = np.empty(num_states, dtype=np.float64)
-
-        for idx, state in enumerate(self.states):
-            rvws[idx] = state.rvw
-            ss[idx] = state.s
-            ts[idx] = state.t
-
-        return rvws, ss, ts
+        n = self._size
+        return self._rvw[:n], self._s[:n], self._t[:n]
 
     @staticmethod
     def from_vectorization(
@@ -267,11 +368,21 @@ class BallHistory:
             NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]
         ]
         | None,
+        copy: bool = True,
     ) -> BallHistory:
         """Zips a vectorization into a BallHistory
 
         An inverse method of :meth:`vectorize`.
 
+        Args:
+            vectorization:
+                The ``rvws``, ``ss`` and ``ts`` arrays. If None, an empty history is
+                returned.
+            copy:
+                If False, the history adopts the arrays as its storage where possible,
+                rather than copying them. Only pass False for arrays that nothing else
+                holds on to.
+
         Returns:
             BallHistory: A BallHistory constructed from the input vectors.
 
@@ -298,8 +409,21 @@ class BallHistory:
         if vectorization is None:
             return history
 
-        for args in zip(*vectorization):
-            history.add(BallState(*args))
+        rvws, ss, ts = vectorization
+        as_array = np.array if copy else np.ascontiguousarray
+
+        history._rvw = as_array(rvws, dtype=np.float64).reshape(-1, 3, 3)
+        history._s = as_array(ss, dtype=np.float64)
+        history._t = as_array(ts, dtype=np.float64)
+        history._size = len(history._t)
+
+        if not (len(history._rvw) == len(history._s) == history._size):
+            raise ValueError("rvws, ss, and ts must have the same length")
+
+        if not copy and not all(
+            array.flags["WRITEABLE"] for array in (history._rvw, history._s, history._t)
+        ):
+            return BallHistory.from_vectorization(vectorization)
 
         return history
 
@@ -319,6 +443,23 @@ conversion.register_structure_hook(
     which=(SerializeFormat.MSGPACK,),
 )
 
+# For the other formats, a history is a list of states
+for _fmt in (SerializeFormat.JSON, SerializeFormat.YAML):
+    conversion.register_unstructure_hook(
+        BallHistory,
+        lambda v, _fmt=_fmt: {
+            "states": [conversion[_fmt].unstructure(state, BallState) for state in v]
+        },
+        which=(_fmt,),
+    )
+    conversion.register_structure_hook(
+        BallHistory,
+        lambda v, _, _fmt=_fmt: BallHistory(
+            conversion[_fmt].structure(state, BallState) for state in v["states"]
+        ),
+        which=(_fmt,),
+    )
+
 
 @define
 class Ball:
@@ -75,6 +75,44 @@ def evolve_ball_motion(
     raise ValueError
 
 
+@jit(nopython=True, cache=const.use_numba_cache)
+def evolve_ball_motions(
+    states: NDArray[np.int64],
+    rvws: NDArray[np.float64],
+    params: NDArray[np.float64],
+    t: float,
+) -> None:
+    """Evolve the kinematic states of many balls forward in time, in place.
+
+    This is :func:`evolve_ball_motion` applied to every ball in one call.
+
+    Args:
+        states:
+            The motion states of the balls. Shape (N,). These are not updated.
+        rvws:
+            The kinematic states of the balls. Shape (N, 3, 3). Overwritten with the
+            evolved kinematic states.
+        params:
+            The ball parameters. Shape (N, 6), where the columns are ``R``, ``m``,
+            ``u_s``, ``u_sp``, ``u_r``, and ``g``.
+        t:
+            The amount of time to evolve each ball.
+    """
+    for i in range(len(states)):
+        rvw, _ = evolve_ball_motion(
+            states[i],
+            rvws[i],
+            params[i, 0],
+            params[i, 1],
+            params[i, 2],
+            params[i, 3],
+            params[i, 4],
+            params[i, 5],
+            t,
+        )
+        rvws[i] = rvw
+
+
 @jit(nopython=True, cache=const.use_numba_cache)
 def _evolve_slide_state(
     rvw: NDArray[np.float64],
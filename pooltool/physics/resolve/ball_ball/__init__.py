@@ -7,6 +7,9 @@ import attrs
 from pooltool.physics.resolve.ball_ball.core import BallBallCollisionStrategy
 from pooltool.physics.resolve.ball_ball.frictional_inelastic import FrictionalInelastic
 from pooltool.physics.resolve.ball_ball.frictional_mathavan import FrictionalMathavan
+from pooltool.physics.resolve.ball_ball.frictional_mathavan.surrogate import (
+    FrictionalMathavanSurrogate,
+)
 from pooltool.physics.resolve.ball_ball.frictionless_elastic import FrictionlessElastic
 from pooltool.physics.resolve.models import BallBallModel
 
@@ -14,6 +17,7 @@ _ball_ball_model_registry: tuple[type[BallBallCollisionStrategy], ...] = (
     FrictionlessElastic,
     FrictionalMathavan,
     FrictionalInelastic,
+    FrictionalMathavanSurrogate,
 )
 
 ball_ball_models: dict[BallBallModel, type[BallBallCollisionStrategy]] = {
@@ -0,0 +1,312 @@
+"""A lookup-table surrogate of the Mathavan et al. (2014) ball-ball model
+
+Only collisions of a moving ball with a stationary one, the most common kind, are
+tabulated. In the frame of the line of centers, the model's outputs scale linearly
+with the moving ball's speed, and depend on its spin only through the
+non-dimensionalized spin :math:`\\omega R / v`. So an (exact) solution for a unit
+speed, indexed by the cut angle, the three non-dimensionalized spin components, and the
+ball-ball friction, covers every speed. By mirror symmetry about the line of centers,
+only cut angles to one side are tabulated. The ball parameters are constant across a
+table.
+
+See :mod:`pooltool.physics.resolve.surrogate`.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import cache
+
+import attrs
+import numpy as np
+from numba import jit
+from numpy.typing import NDArray
+
+import pooltool.constants as const
+from pooltool.objects.ball.datatypes import Ball, BallState
+from pooltool.physics.resolve.ball_ball.core import CoreBallBallCollision
+from pooltool.physics.resolve.ball_ball.friction import (
+    AlciatoreBallBallFriction,
+    BallBallFrictionStrategy,
+)
+from pooltool.physics.resolve.ball_ball.frictional_mathavan import (
+    FrictionalMathavan,
+    _collide_balls,
+)
+from pooltool.physics.resolve.models import BallBallModel
+from pooltool.physics.resolve.surrogate import (
+    LookupTable,
+    build_table,
+    cached_table,
+    interpolate,
+)
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evaluate(
+    points: NDArray[np.float64],
+    R: float,
+    M: float,
+    u_s1: float,
+    u_s2: float,
+    e_b: float,
+    N: int,
+) -> NDArray[np.float64]:
+    """The exact model at unit speed, non-dimensionalized
+
+    (just-in-time compiled)
+
+    Ball 1 moves towards ball 2, which is stationary and in the +y direction.
+
+    Args:
+        points:
+            Rows of (cut angle, :math:`\\omega_x R`, :math:`\\omega_y R`,
+            :math:`\\omega_z R`, ball-ball friction) of ball 1.
+
+    Returns:
+        NDArray[np.float64]:
+            Rows of (vx, vy, :math:`\\omega_x R`, :math:`\\omega_y R`,
+            :math:`\\omega_z R`) after the collision, of ball 1 then ball 2.
+    """
+    values = np.empty((points.shape[0], 10), dtype=np.float64)
+    r_i = np.zeros(3, dtype=np.float64)
+    r_j = np.array([0.0, 2 * R, 0.0])
+    zeros = np.zeros(3, dtype=np.float64)
+
+    for i in range(points.shape[0]):
+        phi, sx, sy, sz, u_b = points[i]
+        v_i = np.array([math.sin(phi), math.cos(phi), 0.0])
+        w_i = np.array([sx / R, sy / R, sz / R])
+
+        v_i1, w_i1, v_j1, w_j1 = _collide_balls(
+            r_i, v_i, w_i, r_j, zeros, zeros, R, M, u_s1, u_s2, u_b, e_b, None, N
+        )
+
+        values[i, 0:2] = v_i1[:2]
+        values[i, 2:5] = w_i1 * R
+        values[i, 5:7] = v_j1[:2]
+        values[i, 7:10] = w_j1 * R
+
+    return values
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def surrogate_rvws(
+    rvw1: NDArray[np.float64],
+    rvw2: NDArray[np.float64],
+    R: float,
+    u_b: float,
+    flat: NDArray[np.float64],
+    exact: NDArray[np.bool_],
+    shape: NDArray[np.int64],
+    lower: NDArray[np.float64],
+    upper: NDArray[np.float64],
+) -> tuple[bool, NDArray[np.float64], NDArray[np.float64]]:
+    """Resolve a collision of a moving ball with a stationary one by interpolation
+
+    (just-in-time compiled)
+
+    Args:
+        rvw1: The kinematic state of the moving ball.
+        rvw2: The kinematic state of the stationary ball.
+
+    Returns:
+        tuple[bool, NDArray[np.float64], NDArray[np.float64]]:
+            Whether the collision could be interpolated, and if so, the kinematic states
+            of the balls after the collision.
+    """
+    # The frame of the line of centers, as in _collide_balls
+    r_ij = rvw2[0] - rvw1[0]
+    r_ij_mag = math.sqrt(r_ij[0] ** 2 + r_ij[1] ** 2)
+    y_x, y_y = r_ij[0] / r_ij_mag, r_ij[1] / r_ij_mag
+    x_x, x_y = y_y, -y_x
+
+    v, w = rvw1[1], rvw1[2]
+    vx = v[0] * x_x + v[1] * x_y
+    vy = v[0] * y_x + v[1] * y_y
+    if vy <= 0:
+        return False, rvw1, rvw2
+
+    # Mirror collisions cut to the -x side
+    mirror = 1.0 if vx >= 0 else -1.0
+    speed = math.sqrt(vx**2 + vy**2)
+    scale = R / speed
+
+    point = np.empty(5, dtype=np.float64)
+    point[0] = math.atan2(mirror * vx, vy)
+    point[1] = (w[0] * x_x + w[1] * x_y) * scale
+    point[2] = mirror * (w[0] * y_x + w[1] * y_y) * scale
+    point[3] = mirror * w[2] * scale
+    point[4] = u_b
+
+    out = np.empty(10, dtype=np.float64)
+    if not interpolate(flat, exact, shape, lower, upper, point, out):
+        return False, rvw1, rvw2
+
+    rvws = (rvw1.copy(), rvw2.copy())
+    for k in range(2):
+        o = 5 * k
+        vx = mirror * out[o] * speed
+        vy = out[o + 1] * speed
+        wx = out[o + 2] / scale
+        wy = mirror * out[o + 3] / scale
+        wz = mirror * out[o + 4] / scale
+
+        rvw = rvws[k]
+        rvw[1, 0] = vx * x_x + vy * y_x
+        rvw[1, 1] = vx * x_y + vy * y_y
+        rvw[2, 0] = wx * x_x + wy * y_x
+        rvw[2, 1] = wx * x_y + wy * y_y
+        rvw[2, 2] = wz
+
+    return True, rvws[0], rvws[1]
+
+
+@cache
+def frictional_mathavan_table(
+    R: float,
+    M: float,
+    u_s1: float,
+    u_s2: float,
+    e_b: float,
+    num_iterations: int,
+    angle_points: int,
+    spin_points: int,
+    friction_points: int,
+    max_spin: float,
+    max_friction: float,
+    tolerance: float,
+    max_points: int,
+) -> LookupTable:
+    """The lookup table of the model, for a moving ball 1 and stationary ball 2
+
+    Tables are cached in memory and on disk (see
+    :func:`pooltool.physics.resolve.surrogate.cached_table`).
+    """
+    lower = np.array([0.0, -max_spin, -max_spin, -max_spin, 0.0])
+    upper = np.array([math.pi / 2, max_spin, max_spin, max_spin, max_friction])
+    shape = (angle_points, spin_points, spin_points, spin_points, friction_points)
+    params = (R, M, u_s1, u_s2, e_b, num_iterations)
+
+    return cached_table(
+        "frictional_mathavan",
+        dict(
+            params=params,
+            lower=lower.tolist(),
+            upper=upper.tolist(),
+            shape=shape,
+            tolerance=tolerance,
+            max_points=max_points,
+        ),
+        lambda: build_table(
+            lambda points: _evaluate(points, *params),
+            lower,
+            upper,
+            shape,
+            tolerance,
+            max_points,
+        ),
+    )
+
+
+@attrs.define
+class FrictionalMathavanSurrogate(CoreBallBallCollision):
+    """A lookup-table surrogate of the Mathavan et al. (2014) model
+
+    Collisions of a moving ball with a stationary one are resolved by interpolating a
+    table of the model's solutions (see
+    :class:`pooltool.physics.resolve.ball_ball.frictional_mathavan.FrictionalMathavan`),
+    rather than by iterating the model. All other collisions, those outside of the table
+    (i.e. with more spin than ``max_spin``, or more friction than ``max_friction``), and
+    those in cells of it that can't be interpolated within ``tolerance``, are resolved
+    with the exact model.
+
+    A table is built (which takes about half a minute) the first time it's needed for a
+    given set of ball parameters, and then cached under
+    :data:`pooltool.physics.resolve.surrogate.SURROGATE_DIR`.
+
+    Attributes:
+        friction:
+            The ball-ball friction model.
+        num_iterations:
+            The number of iterations of the exact model, which is tabulated.
+        tolerance:
+            The largest tolerated error of any output of the interpolation, relative to
+            the moving ball's speed (or its speed divided by the ball radius, for
+            angular velocities), in the frame of the line of centers. Cells of the grid
+            where this isn't met are resolved with the exact model, and the grid is
+            refined until most cells meet it (see
+            :func:`pooltool.physics.resolve.surrogate.build_table`).
+        angle_points:
+            The initial number of grid points over cut angles.
+        spin_points:
+            The initial number of grid points over each component of spin.
+        friction_points:
+            The initial number of grid points over ball-ball friction.
+        max_spin:
+            The largest spin in the table, as a multiple of the moving ball's speed
+            divided by the ball radius.
+        max_friction:
+            The largest ball-ball friction in the table.
+        max_points:
+            The largest tolerated number of grid points.
+    """
+
+    friction: BallBallFrictionStrategy = AlciatoreBallBallFriction()
+    num_iterations: int = 1000
+    tolerance: float = 0.02
+    angle_points: int = 17
+    spin_points: int = 13
+    friction_points: int = 5
+    max_spin: float = 1.5
+    max_friction: float = 0.2
+    max_points: int = 2_000_000
+
+    model: BallBallModel = attrs.field(
+        default=BallBallModel.FRICTIONAL_MATHAVAN_SURROGATE, init=False, repr=False
+    )
+
+    def solve(self, ball1: Ball, ball2: Ball) -> tuple[Ball, Ball]:
+        if ball2.state.s == const.stationary:
+            moving, still = ball1, ball2
+        elif ball1.state.s == const.stationary:
+            moving, still = ball2, ball1
+        else:
+            return self._exact(ball1, ball2)
+
+        table = frictional_mathavan_table(
+            moving.params.R,
+            moving.params.m,
+            moving.params.u_s,
+            still.params.u_s,
+            (moving.params.e_b + still.params.e_b) / 2,
+            self.num_iterations,
+            self.angle_points,
+            self.spin_points,
+            self.friction_points,
+            self.max_spin,
+            self.max_friction,
+            self.tolerance,
+            self.max_points,
+        )
+
+        within, rvw_moving, rvw_still = surrogate_rvws(
+            moving.state.rvw,
+            still.state.rvw,
+            moving.params.R,
+            self.friction.calculate_friction(ball1, ball2),
+            *table.arrays,
+        )
+
+        if not within:
+            return self._exact(ball1, ball2)
+
+        moving.state = BallState(rvw_moving, const.sliding)
+        still.state = BallState(rvw_still, const.sliding)
+
+        return ball1, ball2
+
+    def _exact(self, ball1: Ball, ball2: Ball) -> tuple[Ball, Ball]:
+        return FrictionalMathavan(self.friction, self.num_iterations).solve(
+            ball1, ball2
+        )
@@ -18,7 +18,9 @@ from pooltool.physics.resolve.ball_cushion.impulse_frictional_inelastic import (
 )
 from pooltool.physics.resolve.ball_cushion.mathavan_2010 import (
     Mathavan2010Circular,
+    Mathavan2010CircularSurrogate,
     Mathavan2010Linear,
+    Mathavan2010LinearSurrogate,
 )
 from pooltool.physics.resolve.ball_cushion.stronge_compliant import (
     StrongeCompliantCircular,
@@ -36,6 +38,7 @@ _ball_lcushion_model_registry: tuple[type[BallLCushionCollisionStrategy], ...] =
     ImpulseFrictionalInelasticLinear,
     StrongeCompliantLinear,
     UnrealisticLinear,
+    Mathavan2010LinearSurrogate,
 )
 
 _ball_ccushion_model_registry: tuple[type[BallCCushionCollisionStrategy], ...] = (
@@ -44,6 +47,7 @@ _ball_ccushion_model_registry: tuple[type[BallCCushionCollisionStrategy], ...] =
     ImpulseFrictionalInelasticCircular,
     StrongeCompliantCircular,
     UnrealisticCircular,
+    Mathavan2010CircularSurrogate,
 )
 
 ball_lcushion_models: dict[BallLCushionModel, type[BallLCushionCollisionStrategy]] = {
@@ -2,8 +2,14 @@ from pooltool.physics.resolve.ball_cushion.mathavan_2010.model import (
     Mathavan2010Circular,
     Mathavan2010Linear,
 )
+from pooltool.physics.resolve.ball_cushion.mathavan_2010.surrogate import (
+    Mathavan2010CircularSurrogate,
+    Mathavan2010LinearSurrogate,
+)
 
 __all__ = [
     "Mathavan2010Linear",
     "Mathavan2010Circular",
+    "Mathavan2010LinearSurrogate",
+    "Mathavan2010CircularSurrogate",
 ]
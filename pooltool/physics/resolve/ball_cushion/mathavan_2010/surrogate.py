@@ -0,0 +1,333 @@
+"""A lookup-table surrogate of the Mathavan et al. (2010) ball-cushion model
+
+The model's outputs scale linearly with the incoming speed, and depend on the ball's
+mass and radius only through the non-dimensionalized spin :math:`\\omega R / v`. So in
+the cushion frame, an (exact) solution for a unit incoming speed, indexed by the
+incidence angle and the three non-dimensionalized spin components, covers every speed.
+By mirror symmetry along the cushion, only incidence angles up to 90 degrees are
+tabulated. The cushion height and ball parameters are constant across a table.
+
+See :mod:`pooltool.physics.resolve.surrogate`.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import cache
+
+import attrs
+import numpy as np
+from numba import jit
+from numpy.typing import NDArray
+
+import pooltool.constants as const
+import pooltool.ptmath as ptmath
+from pooltool.objects.ball.datatypes import Ball, BallState
+from pooltool.objects.table.components import (
+    CircularCushionSegment,
+    Cushion,
+    LinearCushionSegment,
+)
+from pooltool.physics.resolve.ball_cushion.core import (
+    CoreBallCCushionCollision,
+    CoreBallLCushionCollision,
+)
+from pooltool.physics.resolve.ball_cushion.mathavan_2010.model import (
+    solve_adaptive,
+    solve_mathavan,
+)
+from pooltool.physics.resolve.models import BallCCushionModel, BallLCushionModel
+from pooltool.physics.resolve.surrogate import (
+    LookupTable,
+    build_table,
+    cached_table,
+    interpolate,
+)
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evaluate(
+    points: NDArray[np.float64],
+    M: float,
+    R: float,
+    h: float,
+    ee: float,
+    mu_s: float,
+    mu_w: float,
+    rtol: float,
+    max_steps: int,
+) -> NDArray[np.float64]:
+    """The exact model at unit speed, non-dimensionalized
+
+    (just-in-time compiled)
+
+    Args:
+        points:
+            Rows of (incidence angle, :math:`\\omega_x R`, :math:`\\omega_y R`,
+            :math:`\\omega_z R`) in the cushion frame.
+
+    Returns:
+        NDArray[np.float64]:
+            Rows of (vx, vy, :math:`\\omega_x R`, :math:`\\omega_y R`,
+            :math:`\\omega_z R`) after the collision.
+    """
+    values = np.empty((points.shape[0], 5), dtype=np.float64)
+    for i in range(points.shape[0]):
+        alpha, sx, sy, sz = points[i]
+        vx, vy, wx, wy, wz = solve_adaptive(
+            M,
+            R,
+            h,
+            ee,
+            mu_s,
+            mu_w,
+            math.cos(alpha),
+            math.sin(alpha),
+            sx / R,
+            sy / R,
+            sz / R,
+            rtol,
+            max_steps,
+        )
+        values[i, 0] = vx
+        values[i, 1] = vy
+        values[i, 2] = wx * R
+        values[i, 3] = wy * R
+        values[i, 4] = wz * R
+    return values
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def surrogate_rvw(
+    rvw: NDArray[np.float64],
+    normal: NDArray[np.float64],
+    R: float,
+    flat: NDArray[np.float64],
+    exact: NDArray[np.bool_],
+    shape: NDArray[np.int64],
+    lower: NDArray[np.float64],
+    upper: NDArray[np.float64],
+) -> tuple[bool, NDArray[np.float64]]:
+    """Resolve a ball-cushion collision by interpolating a lookup table
+
+    (just-in-time compiled)
+
+    The frame rotation is the same as in
+    :func:`pooltool.physics.resolve.ball_cushion.mathavan_2010.model.solve_rvw`.
+
+    Returns:
+        tuple[bool, NDArray[np.float64]]:
+            Whether the collision could be interpolated, and if so, the kinematic state
+            of the ball after the collision.
+    """
+    if normal[0] * rvw[1, 0] + normal[1] * rvw[1, 1] + normal[2] * rvw[1, 2] <= 0:
+        normal = -normal
+
+    psi = ptmath.angle(normal, np.array([1.0, 0.0]))
+    angle_to_rotate = (math.pi / 2) - psi
+    rvw_R = ptmath.coordinate_rotation(rvw.T, angle_to_rotate).T
+
+    vx, vy = rvw_R[1, 0], rvw_R[1, 1]
+    if vy <= 0:
+        return False, rvw
+
+    # Mirror collisions travelling in -x
+    mirror = 1.0 if vx >= 0 else -1.0
+    speed = math.sqrt(vx**2 + vy**2)
+    scale = R / speed
+
+    point = np.empty(4, dtype=np.float64)
+    point[0] = math.atan2(vy, mirror * vx)
+    point[1] = rvw_R[2, 0] * scale
+    point[2] = mirror * rvw_R[2, 1] * scale
+    point[3] = mirror * rvw_R[2, 2] * scale
+
+    out = np.empty(5, dtype=np.float64)
+    if not interpolate(flat, exact, shape, lower, upper, point, out):
+        return False, rvw
+
+    rvw_R[1, 0] = mirror * out[0] * speed
+    rvw_R[1, 1] = out[1] * speed
+    rvw_R[2, 0] = out[2] / scale
+    rvw_R[2, 1] = mirror * out[3] / scale
+    rvw_R[2, 2] = mirror * out[4] / scale
+
+    return True, ptmath.coordinate_rotation(rvw_R.T, -angle_to_rotate).T
+
+
+@cache
+def mathavan_table(
+    M: float,
+    R: float,
+    h: float,
+    ee: float,
+    mu_s: float,
+    mu_w: float,
+    rtol: float,
+    max_steps: int,
+    angle_points: int,
+    spin_points: int,
+    max_spin: float,
+    tolerance: float,
+    max_points: int,
+) -> LookupTable:
+    """The lookup table of the adaptively integrated model
+
+    Tables are cached in memory and on disk (see
+    :func:`pooltool.physics.resolve.surrogate.cached_table`).
+    """
+    lower = np.array([0.0, -max_spin, -max_spin, -max_spin])
+    upper = np.array([math.pi / 2, max_spin, max_spin, max_spin])
+    shape = (angle_points, spin_points, spin_points, spin_points)
+    params = (M, R, h, ee, mu_s, mu_w, rtol, max_steps)
+
+    return cached_table(
+        "mathavan_2010",
+        dict(
+            params=params,
+            lower=lower.tolist(),
+            upper=upper.tolist(),
+            shape=shape,
+            tolerance=tolerance,
+            max_points=max_points,
+        ),
+        lambda: build_table(
+            lambda points: _evaluate(points, *params),
+            lower,
+            upper,
+            shape,
+            tolerance,
+            max_points,
+        ),
+    )
+
+
+def solve_surrogate(
+    ball: Ball,
+    cushion: Cushion,
+    model: Mathavan2010LinearSurrogate | Mathavan2010CircularSurrogate,
+) -> tuple[Ball, Cushion]:
+    """Resolve with the lookup table, falling back to the exact model outside it"""
+    table = mathavan_table(
+        ball.params.m,
+        ball.params.R,
+        cushion.height,
+        ball.params.e_c,
+        ball.params.u_s,
+        ball.params.f_c,
+        model.rtol,
+        model.max_steps,
+        model.angle_points,
+        model.spin_points,
+        model.max_spin,
+        model.tolerance,
+        model.max_points,
+    )
+
+    within, rvw = surrogate_rvw(
+        ball.state.rvw,
+        cushion.get_normal_xy(ball.state.rvw),
+        ball.params.R,
+        *table.arrays,
+    )
+
+    if not within:
+        return solve_mathavan(
+            ball, cushion, model.max_steps, adaptive=True, rtol=model.rtol
+        )
+
+    ball.state = BallState(rvw, const.sliding)
+    return ball, cushion
+
+
+@attrs.define
+class Mathavan2010LinearSurrogate(CoreBallLCushionCollision):
+    """A lookup-table surrogate of the Mathavan et al. (2010) model
+
+    Collisions are resolved by interpolating a table of the model's solutions, rather
+    than by integrating the model. Collisions outside of the table (i.e. with more spin
+    than ``max_spin``), or in cells of it that can't be interpolated within
+    ``tolerance``, are resolved with the exact model.
+
+    The table approximates the adaptively integrated variant of the model, i.e.
+    ``Mathavan2010Linear(adaptive=True, rtol=rtol, max_steps=max_steps)`` (see
+    :class:`pooltool.physics.resolve.ball_cushion.mathavan_2010.Mathavan2010Linear`),
+    because only it is independent of the incoming speed once non-dimensionalized. It
+    differs from the default, fixed step integration by up to about 0.025 (relative to
+    the incoming speed), on top of ``tolerance``.
+
+    A table is built (which takes about ten seconds) the first time it's needed for a
+    given cushion height and set of ball parameters, and then cached under
+    :data:`pooltool.physics.resolve.surrogate.SURROGATE_DIR`.
+
+    Attributes:
+        tolerance:
+            The largest tolerated error of any output of the interpolation, relative to
+            the incoming speed (or the incoming speed divided by the ball radius, for
+            angular velocities), in the cushion's frame. Cells of the grid where this
+            isn't met are resolved with the exact model, and the grid is refined until
+            most cells meet it (see
+            :func:`pooltool.physics.resolve.surrogate.build_table`).
+        angle_points:
+            The initial number of grid points over incidence angles.
+        spin_points:
+            The initial number of grid points over each component of spin.
+        max_spin:
+            The largest spin in the table, as a multiple of the incoming speed divided
+            by the ball radius.
+        max_points:
+            The largest tolerated number of grid points.
+        max_steps:
+            The maximum number of steps per phase of the exact model.
+        rtol:
+            The tolerance of the exact model's adaptive integration.
+    """
+
+    tolerance: float = attrs.field(default=0.02)
+    angle_points: int = attrs.field(default=17)
+    spin_points: int = attrs.field(default=25)
+    max_spin: float = attrs.field(default=1.5)
+    max_points: int = attrs.field(default=2_000_000)
+    max_steps: int = attrs.field(default=1000)
+    rtol: float = attrs.field(default=3e-4)
+    model: BallLCushionModel = attrs.field(
+        default=BallLCushionModel.MATHAVAN_2010_SURROGATE, init=False, repr=False
+    )
+
+    def solve(
+        self, ball: Ball, cushion: LinearCushionSegment
+    ) -> tuple[Ball, LinearCushionSegment]:
+        return solve_surrogate(ball, cushion, self)
+
+
+@attrs.define
+class Mathavan2010CircularSurrogate(CoreBallCCushionCollision):
+    """A lookup-table surrogate of the Mathavan et al. (2010) model
+
+    See :class:`Mathavan2010LinearSurrogate`.
+
+    Attributes:
+        tolerance: See :class:`Mathavan2010LinearSurrogate`.
+        angle_points: See :class:`Mathavan2010LinearSurrogate`.
+        spin_points: See :class:`Mathavan2010LinearSurrogate`.
+        max_spin: See :class:`Mathavan2010LinearSurrogate`.
+        max_points: See :class:`Mathavan2010LinearSurrogate`.
+        max_steps: See :class:`Mathavan2010LinearSurrogate`.
+        rtol: See :class:`Mathavan2010LinearSurrogate`.
+    """
+
+    tolerance: float = attrs.field(default=0.02)
+    angle_points: int = attrs.field(default=17)
+    spin_points: int = attrs.field(default=25)
+    max_spin: float = attrs.field(default=1.5)
+    max_points: int = attrs.field(default=2_000_000)
+    max_steps: int = attrs.field(default=1000)
+    rtol: float = attrs.field(default=3e-4)
+    model: BallCCushionModel = attrs.field(
+        default=BallCCushionModel.MATHAVAN_2010_SURROGATE, init=False, repr=False
+    )
+
+    def solve(
+        self, ball: Ball, cushion: CircularCushionSegment
+    ) -> tuple[Ball, CircularCushionSegment]:
+        return solve_surrogate(ball, cushion, self)
@@ -41,11 +41,21 @@ class BallBallModel(StrEnum):
 
                 Available at
                 https://billiards.colostate.edu/physics_articles/Mathavan_Sports_2014.pdf
+
+        FRICTIONAL_MATHAVAN_SURROGATE:
+            A lookup-table surrogate of ``FRICTIONAL_MATHAVAN``.
+
+            Collisions of a moving ball with a stationary one are resolved by
+            interpolating a precomputed table of the model's solutions, which is built
+            once (per set of ball parameters) and cached to disk. The interpolation
+            error is bounded by a configurable tolerance, and all other collisions are
+            resolved with the exact model.
     """
 
     FRICTIONLESS_ELASTIC = auto()
     FRICTIONAL_INELASTIC = auto()
     FRICTIONAL_MATHAVAN = auto()
+    FRICTIONAL_MATHAVAN_SURROGATE = auto()
 
 
 class BallLCushionModel(StrEnum):
@@ -100,6 +110,15 @@ class BallLCushionModel(StrEnum):
                 W. J. Stronge, “Tangential Compliance in Planar Impact of Rough Bodies,” in Impact Mechanics,
                 Cambridge: Cambridge University Press, 2018, pp. 89–115
                 doi:10.1017/9781139050227
+
+        MATHAVAN_2010_SURROGATE:
+            A lookup-table surrogate of ``MATHAVAN_2010``.
+
+            Collisions are resolved by interpolating a precomputed table of the model's
+            solutions, which is built once (per cushion height and set of ball
+            parameters) and cached to disk. The interpolation error is bounded by a
+            configurable tolerance, and collisions outside of the table are resolved
+            with the exact model.
     """
 
     MATHAVAN_2010 = auto()
@@ -107,6 +126,7 @@ class BallLCushionModel(StrEnum):
     IMPULSE_FRICTIONAL_INELASTIC = auto()
     STRONGE_COMPLIANT = auto()
     UNREALISTIC = auto()
+    MATHAVAN_2010_SURROGATE = auto()
 
 
 class BallCCushionModel(StrEnum):
@@ -118,6 +138,7 @@ class BallCCushionModel(StrEnum):
         IMPULSE_FRICTIONAL_INELASTIC: See :class:`BallLCushionModel`.
         MATHAVAN_2010: See :class:`BallLCushionModel`.
         STRONGE_COMPLIANT: See :class:`BallLCushionModel`.
+        MATHAVAN_2010_SURROGATE: See :class:`BallLCushionModel`.
     """
 
     MATHAVAN_2010 = auto()
@@ -125,6 +146,7 @@ class BallCCushionModel(StrEnum):
     IMPULSE_FRICTIONAL_INELASTIC = auto()
     STRONGE_COMPLIANT = auto()
     UNREALISTIC = auto()
+    MATHAVAN_2010_SURROGATE = auto()
 
 
 class BallPocketModel(StrEnum):
@@ -107,9 +107,22 @@ class Resolver:
 
     version: int | None = None
 
-    def resolve(self, shot: System, event: Event) -> None:
-        """Resolve an event for a system"""
-        _snapshot_initial(shot, event)
+    def resolve(self, shot: System, event: Event, snapshot: bool = True) -> None:
+        """Resolve an event for a system
+
+        Args:
+            shot:
+                The system the event takes place in.
+            event:
+                The event to resolve.
+            snapshot:
+                If True, the states of the event's agents are copied into the event
+                before and after the event is resolved (see
+                :attr:`pooltool.events.Agent.initial` and
+                :attr:`pooltool.events.Agent.final`).
+        """
+        if snapshot:
+            _snapshot_initial(shot, event)
 
         ids = event.ids
 
@@ -145,7 +158,8 @@ class Resolver:
             self.stick_ball.resolve(cue, ball, inplace=True)
             ball.state.t = event.time
 
-        _snapshot_final(shot, event)
+        if snapshot:
+            _snapshot_final(shot, event)
 
     def save(self, path: Pathish) -> Path:
         path = Path(path)
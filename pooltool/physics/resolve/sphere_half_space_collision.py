@@ -1,5 +1,4 @@
 import numpy as np
-import quaternion
 from numba import jit
 
 import pooltool.constants as const
@@ -7,6 +6,8 @@ import pooltool.ptmath as ptmath
 
 
 def resolve_sphere_half_space_collision(normal, rvw, R, mu_k, e):
+    import quaternion
+
     unit_z = np.array([0.0, 0.0, 1.0])
     frame_rotation = ptmath.quaternion_from_vector_to_vector(normal, unit_z)
     rvw = quaternion.rotate_vectors(frame_rotation, rvw)
@@ -0,0 +1,404 @@
+"""Lookup-table surrogates of expensive collision models
+
+The numerically integrated collision models (e.g.
+:class:`pooltool.physics.resolve.ball_cushion.mathavan_2010.Mathavan2010Linear` and
+:class:`pooltool.physics.resolve.ball_ball.frictional_mathavan.FrictionalMathavan`) are
+the most expensive part of resolving an event. Their surrogates answer ``solve`` by
+multilinear interpolation of a :class:`LookupTable`, which is a dense regular grid of
+the exact model's outputs over its (non-dimensionalized) input space. The cells of the
+grid that can't be interpolated within tolerance (e.g. across a kink in the model's
+outputs, where the ball starts or stops slipping) are flagged, and collisions that fall
+in them are resolved with the exact model instead.
+
+Tables are built the first time they are needed, validated against the exact model, and
+cached to disk under :data:`SURROGATE_DIR`, keyed by everything that went into building
+them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import attrs
+import numpy as np
+from numba import jit
+from numpy.typing import NDArray
+
+import pooltool.config.paths
+import pooltool.constants as const
+from pooltool.utils import Run
+
+SURROGATE_DIR = pooltool.config.paths.PHYSICS_DIR / "surrogates"
+"""The directory that surrogate lookup tables are cached in."""
+
+run = Run()
+
+_tables: dict[str, LookupTable] = {}
+
+Evaluate = Callable[[NDArray[np.float64]], NDArray[np.float64]]
+"""Evaluates the exact model at each row of an array of points"""
+
+
+@attrs.define(frozen=True, eq=False)
+class LookupTable:
+    """A function's values on a regular grid, interpolated multilinearly
+
+    Attributes:
+        lower:
+            The lower bound of each input dimension.
+        upper:
+            The upper bound of each input dimension.
+        values:
+            The function's outputs at the grid points. The shape is ``(*shape,
+            num_outputs)``, where ``shape`` is the number of grid points (at least 2)
+            along each input dimension.
+        exact:
+            Whether each cell of the grid must be resolved with the exact function,
+            rather than interpolated. The shape is ``tuple(n - 1 for n in shape)``. By
+            default, no cell is.
+        error:
+            The largest error of the interpolation found during validation against the
+            exact function (see :func:`build_table`).
+    """
+
+    lower: NDArray[np.float64]
+    upper: NDArray[np.float64]
+    values: NDArray[np.float64] = attrs.field(repr=False)
+    exact: NDArray[np.bool_] = attrs.field(
+        default=attrs.Factory(
+            lambda self: np.zeros(
+                tuple(n - 1 for n in self.values.shape[:-1]), dtype=np.bool_
+            ),
+            takes_self=True,
+        ),
+        repr=False,
+    )
+    error: float = np.nan
+
+    _flat: NDArray[np.float64] = attrs.field(init=False, repr=False)
+    _exact: NDArray[np.bool_] = attrs.field(init=False, repr=False)
+    _shape: NDArray[np.int64] = attrs.field(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        shape = self.values.shape[:-1]
+        assert len(shape) == len(self.lower) == len(self.upper)
+        assert min(shape) >= 2
+
+        assert self.exact.shape == tuple(n - 1 for n in shape)
+
+        object.__setattr__(
+            self,
+            "_flat",
+            np.ascontiguousarray(self.values, dtype=np.float64).reshape(
+                -1, self.values.shape[-1]
+            ),
+        )
+        object.__setattr__(
+            self, "_exact", np.ascontiguousarray(self.exact, dtype=np.bool_).ravel()
+        )
+        object.__setattr__(self, "_shape", np.array(shape, dtype=np.int64))
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """The number of grid points along each input dimension"""
+        return tuple(self._shape)
+
+    @property
+    def exact_fraction(self) -> float:
+        """The fraction of cells that are resolved with the exact function"""
+        return float(self._exact.mean())
+
+    @property
+    def arrays(
+        self,
+    ) -> tuple[
+        NDArray[np.float64],
+        NDArray[np.bool_],
+        NDArray[np.int64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+    ]:
+        """The leading arguments of :func:`interpolate`, for compiled callers"""
+        return self._flat, self._exact, self._shape, self.lower, self.upper
+
+    def __call__(self, point: NDArray[np.float64]) -> NDArray[np.float64] | None:
+        """Interpolate the table at a point
+
+        Returns:
+            NDArray[np.float64] | None:
+                The interpolated outputs, or None if the point is outside the table or
+                in a cell that must be resolved exactly.
+        """
+        out = np.empty(self._flat.shape[1], dtype=np.float64)
+        if not interpolate(*self.arrays, point, out):
+            return None
+        return out
+
+    def interpolate_many(self, points: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Interpolate the table at each row of ``points``
+
+        Rows outside the table, or in cells that must be resolved exactly, are NaN.
+        """
+        return _interpolate_many(*self.arrays, points)
+
+    def save(self, path: Path) -> None:
+        """Save the table, atomically, as an ``.npz`` file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.npz")
+        np.savez(
+            tmp_path,
+            lower=self.lower,
+            upper=self.upper,
+            values=self.values,
+            exact=self.exact,
+            error=self.error,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> LookupTable:
+        with np.load(path) as data:
+            return cls(
+                lower=data["lower"],
+                upper=data["upper"],
+                values=data["values"],
+                exact=data["exact"],
+                error=float(data["error"]),
+            )
+
+    @classmethod
+    def from_function(
+        cls,
+        evaluate: Evaluate,
+        lower: NDArray[np.float64],
+        upper: NDArray[np.float64],
+        shape: tuple[int, ...],
+    ) -> LookupTable:
+        """Tabulate a function on a regular grid
+
+        Args:
+            evaluate:
+                Evaluates the function at each row of an array of points.
+            lower: The lower bound of each input dimension.
+            upper: The upper bound of each input dimension.
+            shape: The number of grid points along each input dimension.
+        """
+        axes = [np.linspace(lo, hi, n) for lo, hi, n in zip(lower, upper, shape)]
+        points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(
+            -1, len(shape)
+        )
+        values = evaluate(points)
+        return cls(
+            lower=np.asarray(lower, dtype=np.float64),
+            upper=np.asarray(upper, dtype=np.float64),
+            values=values.reshape(*shape, -1),
+        )
+
+    def cells(self, points: NDArray[np.float64]) -> NDArray[np.int64]:
+        """The (flat, C order) index of the cell that each row of ``points`` is in"""
+        x = (points - self.lower) / (self.upper - self.lower) * (self._shape - 1)
+        idx = np.clip(x.astype(np.int64), 0, self._shape - 2)
+        return np.ravel_multi_index(tuple(idx.T), self.exact.shape)
+
+    def cell_centers(self) -> NDArray[np.float64]:
+        """The center of every cell, as rows in (flat, C order) cell order"""
+        axes = [
+            lo + (np.arange(n - 1) + 0.5) / (n - 1) * (hi - lo)
+            for lo, hi, n in zip(self.lower, self.upper, self.shape)
+        ]
+        return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(
+            -1, len(axes)
+        )
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def interpolate(
+    flat: NDArray[np.float64],
+    exact: NDArray[np.bool_],
+    shape: NDArray[np.int64],
+    lower: NDArray[np.float64],
+    upper: NDArray[np.float64],
+    point: NDArray[np.float64],
+    out: NDArray[np.float64],
+) -> bool:
+    """Multilinearly interpolate a table at a point
+
+    (just-in-time compiled)
+
+    Args:
+        flat:
+            The table's values, flattened (in C order) over the grid to shape
+            ``(num_grid_points, num_outputs)``.
+        exact:
+            Whether each cell must be resolved exactly, flattened (in C order) over
+            the cells.
+        shape: The number of grid points along each input dimension.
+        lower: The lower bound of each input dimension.
+        upper: The upper bound of each input dimension.
+        point: The point to interpolate at.
+        out: Filled with the interpolated outputs.
+
+    Returns:
+        bool:
+            False if the point is outside the table, or in a cell that must be resolved
+            exactly (``out`` is then undefined).
+    """
+    dims = point.shape[0]
+    idx = np.empty(dims, dtype=np.int64)
+    frac = np.empty(dims, dtype=np.float64)
+
+    cell = 0
+    for d in range(dims):
+        # Also rejects NaN
+        if not (lower[d] <= point[d] <= upper[d]):
+            return False
+
+        x = (point[d] - lower[d]) / (upper[d] - lower[d]) * (shape[d] - 1)
+        i = min(int(x), shape[d] - 2)
+        idx[d] = i
+        frac[d] = x - i
+        cell = cell * (shape[d] - 1) + i
+
+    if exact[cell]:
+        return False
+
+    out[:] = 0.0
+
+    for corner in range(1 << dims):
+        weight = 1.0
+        for d in range(dims):
+            if (corner >> d) & 1:
+                weight *= frac[d]
+            else:
+                weight *= 1.0 - frac[d]
+
+        if weight == 0.0:
+            continue
+
+        row = 0
+        for d in range(dims):
+            row = row * shape[d] + idx[d] + ((corner >> d) & 1)
+
+        for k in range(out.shape[0]):
+            out[k] += weight * flat[row, k]
+
+    return True
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _interpolate_many(
+    flat: NDArray[np.float64],
+    exact: NDArray[np.bool_],
+    shape: NDArray[np.int64],
+    lower: NDArray[np.float64],
+    upper: NDArray[np.float64],
+    points: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    out = np.empty((points.shape[0], flat.shape[1]), dtype=np.float64)
+    for i in range(points.shape[0]):
+        if not interpolate(flat, exact, shape, lower, upper, points[i], out[i]):
+            out[i] = np.nan
+    return out
+
+
+def build_table(
+    evaluate: Evaluate,
+    lower: NDArray[np.float64],
+    upper: NDArray[np.float64],
+    shape: tuple[int, ...],
+    tolerance: float,
+    max_points: int,
+    num_samples: int = 1000,
+    max_exact: float = 0.5,
+) -> LookupTable:
+    """Tabulate a function densely enough to interpolate it within a tolerance
+
+    The function is evaluated at the center of every cell of the grid. A cell whose
+    interpolation there is off by more than a quarter of ``tolerance`` is flagged to be
+    resolved exactly, since the error at a cell's center understates its largest error.
+    The table is then validated by comparing its interpolation to the exact function at
+    ``num_samples`` random points, and the cells of any points that are off by more
+    than ``tolerance`` are flagged too. Until at most ``max_exact`` of the cells are
+    flagged, the grid spacing is halved along every dimension and the table rebuilt.
+
+    Args:
+        evaluate:
+            Evaluates the function at each row of an array of points.
+        lower: The lower bound of each input dimension.
+        upper: The upper bound of each input dimension.
+        shape: The initial number of grid points along each input dimension.
+        tolerance: The largest tolerated error of any output.
+        max_points: The largest tolerated number of grid points.
+        num_samples: The number of random points the table is validated at.
+        max_exact: The largest tolerated fraction of cells resolved exactly.
+
+    Raises:
+        ValueError:
+            If the tolerance can't be met in enough cells without exceeding
+            ``max_points``.
+    """
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(lower, upper, size=(num_samples, len(shape)))
+    expected = evaluate(samples)
+
+    while True:
+        if np.prod(shape) > max_points:
+            raise ValueError(
+                f"A table with {max_points} grid points can't meet a tolerance of "
+                f"{tolerance} in enough cells. Increase the tolerance or the maximum "
+                f"number of points."
+            )
+
+        table = LookupTable.from_function(evaluate, lower, upper, shape)
+
+        centers = table.cell_centers()
+        center_errors = np.abs(table.interpolate_many(centers) - evaluate(centers))
+        exact = (center_errors.max(axis=1) > tolerance / 4).reshape(table.exact.shape)
+        table = attrs.evolve(table, exact=exact)
+
+        # NaN (i.e. already resolved exactly) samples are neither flagged nor counted
+        errors = np.abs(table.interpolate_many(samples) - expected).max(axis=1)
+        failed = errors > tolerance
+        exact.flat[table.cells(samples[failed])] = True
+        error = float(np.max(errors[errors <= tolerance], initial=0.0))
+
+        if exact.mean() <= max_exact:
+            return attrs.evolve(table, exact=exact, error=error)
+
+        shape = tuple(2 * n - 1 for n in shape)
+
+
+def cached_table(
+    name: str, key: dict[str, Any], build: Callable[[], LookupTable]
+) -> LookupTable:
+    """Get a table from memory or disk, or else build and cache it
+
+    Args:
+        name:
+            A prefix for the table's filename in :data:`SURROGATE_DIR`.
+        key:
+            JSON-serializable description of everything the table depends on. Tables
+            built with different keys are cached separately.
+        build:
+            Builds the table, if it isn't cached.
+    """
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    path = SURROGATE_DIR / f"{name}-{digest}.npz"
+
+    if (table := _tables.get(str(path))) is not None:
+        return table
+
+    if path.exists():
+        table = LookupTable.load(path)
+    else:
+        run.info(f"Building the {name} lookup table (cached to {path})")
+        table = build()
+        table.save(path)
+
+    _tables[str(path)] = table
+    return table
@@ -50,15 +50,19 @@ References:
 import math
 
 import numpy as np
-from numba import jit
+from numba import jit, prange
 from numpy.typing import NDArray
 
 import pooltool.constants as const
+from pooltool.ptmath.roots.core import get_real_positive_smallest_root
 
 cubic_rescal_fact = 3.488062113727083e102
 quart_rescal_fact = 7.156344627944542e76
 macheps = 2.2204460492503131e-16
 
+BLOCK_SIZE = 256
+"""The number of rows solved per task by :func:`solve_many_smallest_parallel`"""
+
 
 @jit(nopython=True, cache=const.use_numba_cache)
 def oqs_solve_cubic_analytic_depressed_handle_inf(b, c):
@@ -415,6 +419,79 @@ def solve_many(ps: NDArray[np.float64]) -> NDArray[np.complex128]:
     return roots
 
 
+@jit(nopython=True, cache=const.use_numba_cache)
+def solve_many_smallest(
+    ps: NDArray[np.float64],
+    abs_or_rel_cutoff: float = 1e-3,
+    rtol: float = 1e-3,
+    atol: float = 1e-9,
+) -> NDArray[np.float64]:
+    """Solve many quartics, keeping only the smallest real positive root of each
+
+    (just-in-time compiled)
+
+    This fuses :func:`solve_many` and
+    :func:`pooltool.ptmath.roots.core.get_real_positive_smallest_roots`, so the
+    intermediate array of complex roots is never built. The results are identical.
+
+    Args:
+        ps:
+            An (N, 5) array of quartic coefficients, where each row is ``[a, b, c, d,
+            e]`` for :math:`at^4 + bt^3 + ct^2 + dt + e = 0`.
+        abs_or_rel_cutoff:
+            See :func:`pooltool.ptmath.roots.core.get_real_positive_smallest_root`.
+        rtol:
+            See :func:`pooltool.ptmath.roots.core.get_real_positive_smallest_root`.
+        atol:
+            See :func:`pooltool.ptmath.roots.core.get_real_positive_smallest_root`.
+
+    Returns:
+        NDArray[np.float64]:
+            An array of shape (N,). Each value is the smallest root that is real and
+            positive, or ``np.inf`` if there is none.
+    """
+    num_eqn = ps.shape[0]
+    result = np.empty(num_eqn, dtype=np.float64)
+    roots = np.empty(4, dtype=np.complex128)
+
+    for i in range(num_eqn):
+        solve_into(ps[i, 0], ps[i, 1], ps[i, 2], ps[i, 3], ps[i, 4], roots)
+        result[i] = get_real_positive_smallest_root(
+            roots, abs_or_rel_cutoff, rtol, atol
+        )
+
+    return result
+
+
+@jit(nopython=True, parallel=True, cache=const.use_numba_cache)
+def solve_many_smallest_parallel(
+    ps: NDArray[np.float64],
+    abs_or_rel_cutoff: float = 1e-3,
+    rtol: float = 1e-3,
+    atol: float = 1e-9,
+) -> NDArray[np.float64]:
+    """Like :func:`solve_many_smallest`, but with rows solved in parallel threads
+
+    (just-in-time compiled)
+
+    Threads only pay off for large batches (thousands of quartics). Rows are solved
+    in contiguous blocks of :data:`BLOCK_SIZE`, so ``ps`` should be C-contiguous.
+    """
+    num_eqn = ps.shape[0]
+    result = np.empty(num_eqn, dtype=np.float64)
+    num_blocks = (num_eqn + BLOCK_SIZE - 1) // BLOCK_SIZE
+
+    for block in prange(num_blocks):
+        roots = np.empty(4, dtype=np.complex128)
+        for i in range(block * BLOCK_SIZE, min((block + 1) * BLOCK_SIZE, num_eqn)):
+            solve_into(ps[i, 0], ps[i, 1], ps[i, 2], ps[i, 3], ps[i, 4], roots)
+            result[i] = get_real_positive_smallest_root(
+                roots, abs_or_rel_cutoff, rtol, atol
+            )
+
+    return result
+
+
 @jit(nopython=True, cache=const.use_numba_cache)
 def solve(a: float, b: float, c: float, d: float, e: float) -> NDArray[np.complex128]:
     """Solve quartic equation.
@@ -425,10 +502,24 @@ def solve(a: float, b: float, c: float, d: float, e: float) -> NDArray[np.comple
     Returns:
         Array of 4 complex roots
     """
-    roots = np.zeros(4, dtype=np.complex128)
+    roots = np.empty(4, dtype=np.complex128)
+    solve_into(a, b, c, d, e, roots)
+    return roots
 
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def solve_into(
+    a: float, b: float, c: float, d: float, e: float, roots: NDArray[np.complex128]
+) -> None:
+    """Like :func:`solve`, but the roots are written into ``roots`` (length 4)
+
+    (just-in-time compiled)
+
+    This lets batch solvers reuse one buffer rather than allocate one per quartic.
+    """
     if a == 0.0:
-        return roots
+        roots[:] = 0.0
+        return
 
     a_p = b / a
     b_p = c / a
@@ -711,5 +802,3 @@ def solve(a: float, b: float, c: float, d: float, e: float) -> NDArray[np.comple
     if rfact != 1.0:
         for k in range(4):
             roots[k] *= rfact
-
-    return roots
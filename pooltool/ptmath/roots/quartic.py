@@ -1,10 +1,20 @@
 from pooltool.ptmath.roots._quartic_numba import solve as solve_numba
 from pooltool.ptmath.roots._quartic_numba import solve_many as solve_many_numba
+from pooltool.ptmath.roots._quartic_numba import (
+    solve_many_smallest as solve_many_smallest_numba,
+)
+from pooltool.ptmath.roots._quartic_numba import (
+    solve_many_smallest_parallel as solve_many_smallest_parallel_numba,
+)
 
 solve = solve_numba
 solve_many = solve_many_numba
+solve_many_smallest = solve_many_smallest_numba
+solve_many_smallest_parallel = solve_many_smallest_parallel_numba
 
 __all__ = [
     "solve",
     "solve_many",
+    "solve_many_smallest",
+    "solve_many_smallest_parallel",
 ]
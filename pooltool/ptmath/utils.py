@@ -1,15 +1,16 @@
 from collections.abc import Callable
 from math import sqrt
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
-import quaternion
-import scipy.spatial.transform as sp_tf
 from numba import jit
 from numpy.typing import NDArray
 
 import pooltool.constants as const
 
+if TYPE_CHECKING:
+    import scipy.spatial.transform as sp_tf
+
 
 def solve_transcendental(
     f: Callable[[float], float],
@@ -204,12 +205,14 @@ def angle_between_vectors(a: NDArray[np.float64], b: NDArray[np.float64]) -> flo
 
 def rotation_from_vector_to_vector(
     a: NDArray[np.float64], b: NDArray[np.float64]
-) -> sp_tf.Rotation:
+) -> "sp_tf.Rotation":
     """Compute the rotation that transforms vector a to vector b.
 
     Returns:
         A scipy Rotation object representing the rotation from a to b.
     """
+    import scipy.spatial.transform as sp_tf
+
     angle = angle_between_vectors(a, b)
     axis = unit_vector(cross(a, b))
     return sp_tf.Rotation.from_rotvec(axis * angle)
@@ -227,6 +230,8 @@ def quaternion_from_vector_to_vector(
     Returns:
         A quaternion representing the rotation from a to b.
     """
+    import quaternion
+
     angle = angle_between_vectors(a, b)
     axis = unit_vector(cross(a, b), True)
     return quaternion.from_rotation_vector(axis * angle)
@@ -37,7 +37,8 @@ class Player:
         name:
             Player's name.
         ai:
-            Not implemented yet...
+            If set, the player is an AI that decides its own shots (see
+            :class:`pooltool.ai.search.SimulationAI`).
     """
 
     name: str
@@ -1,7 +1,13 @@
 """The system container and its associated objects"""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from pooltool.system.datatypes import MultiSystem, System, multisystem
-from pooltool.system.render import SystemRender
+
+if TYPE_CHECKING:
+    from pooltool.system.render import SystemRender
 
 __all__ = [
     "System",
@@ -9,3 +15,13 @@ __all__ = [
     "multisystem",
     "SystemRender",
 ]
+
+
+def __getattr__(name: str):
+    # The renderer depends on Panda3D, so it's only imported on first access
+    if name == "SystemRender":
+        from pooltool.system.render import SystemRender
+
+        return SystemRender
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,7 +8,6 @@ import time
 from pathlib import Path
 from typing import Any
 
-from panda3d.core import Filename
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -151,6 +150,8 @@ class classproperty(property):
 
 
 def panda_path(path: Path | str) -> str:
+    from panda3d.core import Filename
+
     panda_path = Filename.fromOsSpecific(str(path))
     panda_path.makeTrueCase()
     return str(panda_path)
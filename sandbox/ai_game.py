@@ -0,0 +1,67 @@
+#! /usr/bin/env python
+"""Play a game of nine ball between two simulation-in-the-loop AI players
+
+Each player searches for its shot with :class:`pooltool.ai.search.SimulationAI`, and
+the number of candidates it simulated within its time budget is printed for every shot.
+"""
+
+import argparse
+
+import pooltool as pt
+from pooltool.ai.search import SimulationAI
+
+
+def main(args):
+    ais = [
+        SimulationAI(time_budget=args.budget, workers=args.workers, seed=seed)
+        for seed in range(2)
+    ]
+    game = pt.get_ruleset(pt.GameType.NINEBALL)(
+        [pt.Player(f"AI {i}", ai=ai) for i, ai in enumerate(ais)]
+    )
+
+    for ai in ais:
+        ai.start()
+
+    table = pt.Table.default()
+    system = pt.System(
+        cue=pt.Cue(cue_ball_id="cue"),
+        table=table,
+        balls=pt.get_rack(pt.GameType.NINEBALL, table),
+    )
+
+    try:
+        for _ in range(args.max_shots):
+            player = game.active_player
+            assert player.ai is not None
+
+            action = player.ai.decide(system, game)
+            player.ai.apply(system, action)
+            pt.simulate(system, inplace=True)
+
+            game.process_and_advance(system)
+            result = player.ai.last_result
+            assert result is not None
+            print(
+                f"{player.name}: {result.evaluated:3d} candidates in "
+                f"{result.elapsed:.1f} s, best score {result.score:7.1f}. "
+                f"{game.shot_info.reason or 'Legal'}."
+            )
+
+            if game.shot_info.game_over:
+                winner = game.shot_info.winner
+                print(f"{winner.name if winner else 'Nobody'} wins!")
+                break
+
+            system.reset_history()
+    finally:
+        for ai in ais:
+            ai.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser("Two simulation-in-the-loop AIs play nine ball")
+    ap.add_argument("--budget", type=float, default=3.0, help="Seconds per shot")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes per AI")
+    ap.add_argument("--max-shots", type=int, default=30)
+    main(ap.parse_args())
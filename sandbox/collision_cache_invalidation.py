@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+"""Benchmark how CollisionCache.invalidate scales with the number of balls
+
+For each rack, a break is simulated. Every time the collision cache is invalidated, the
+invalidation is timed twice: once with ``CollisionCache.invalidate`` (which uses the
+ball-to-key reverse index) and once with a full scan over every cached key (how
+invalidation used to work). Both operate on identical copies of the cache.
+"""
+
+import time
+
+import numpy as np
+
+import pooltool as pt
+from pooltool.events import Event
+from pooltool.events.utils import event_type_to_ball_indices
+from pooltool.evolution.event_based.cache import CollisionCache
+from pooltool.evolution.event_based.simulate import _SimulationState
+
+
+def invalidate_by_scan(cache: CollisionCache, event: Event) -> None:
+    invalid_ball_ids = {
+        event.ids[ball_idx] for ball_idx in event_type_to_ball_indices[event.event_type]
+    }
+
+    for event_type, event_times in cache.times.items():
+        ball_indices = event_type_to_ball_indices.get(event_type, [])
+        keys_to_delete = [
+            key
+            for key in event_times
+            if any(key[idx] in invalid_ball_ids for idx in ball_indices)
+        ]
+        for key in keys_to_delete:
+            del event_times[key]
+
+
+def get_systems() -> dict[str, pt.System]:
+    systems = {"example": pt.System.example()}
+
+    for name, game_type, cue_ball_id, target in [
+        ("9-ball", pt.GameType.NINEBALL, "cue", "1"),
+        ("8-ball", pt.GameType.EIGHTBALL, "cue", "1"),
+        ("snooker", pt.GameType.SNOOKER, "white", "red_01"),
+    ]:
+        table = pt.Table.from_game_type(game_type)
+        system = pt.System(
+            cue=pt.Cue(cue_ball_id=cue_ball_id),
+            table=table,
+            balls=pt.get_rack(game_type, table, spacing_factor=1e-3),
+        )
+        system.strike(V0=8, phi=pt.aim.at_ball(system, target))
+        systems[name] = system
+
+    return systems
+
+
+def main(args):
+    np.random.seed(args.seed)
+    run = pt.utils.Run()
+    run.info("Mean cache size and invalidation time per event:")
+
+    for name, system in get_systems().items():
+        # Burn a run (numba cache loading)
+        pt.simulate(system)
+
+        sim = _SimulationState(system.copy(), pt.physics.PhysicsEngine())
+        sim.init()
+
+        index_times = []
+        scan_times = []
+        sizes = []
+
+        while not sim.done:
+            event = sim.step()
+            if sim.done:
+                break
+
+            sizes.append(sim.collision_cache.size)
+            scan_cache = sim.collision_cache.copy()
+
+            start = time.perf_counter()
+            invalidate_by_scan(scan_cache, event)
+            scan_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            sim.collision_cache.invalidate(event)
+            index_times.append(time.perf_counter() - start)
+
+            sim.transition_cache.update(event)
+
+            assert scan_cache.times == sim.collision_cache.times
+
+        run.info(
+            f"{name:>8}: {len(system.balls):>2} balls, "
+            f"{np.mean(sizes):>5.0f} cached, "
+            f"scan {np.mean(scan_times) * 1e6:>6.1f} us, "
+            f"index {np.mean(index_times) * 1e6:>5.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(
+        "Compare collision cache invalidation with and without a ball index"
+    )
+    ap.add_argument("--seed", type=int, default=42, help="Random seed for racks")
+
+    args = ap.parse_args()
+
+    main(args)
@@ -0,0 +1,43 @@
+#! /usr/bin/env python
+"""Time ``import pooltool`` in fresh processes
+
+Each import runs in a new Python process, and the best of several runs is reported,
+along with whether Panda3D (the GUI stack) was imported. Accessing a GUI attribute, like
+``pooltool.show``, imports it on demand, which is timed separately.
+"""
+
+import subprocess
+import sys
+
+NUM_RUNS = 5
+
+IMPORT = """
+import sys
+import time
+start = time.perf_counter()
+import pooltool
+imported = time.perf_counter()
+panda = "panda3d" in sys.modules
+pooltool.show
+print(imported - start, time.perf_counter() - imported, panda)
+"""
+
+
+def main():
+    results = []
+    for _ in range(NUM_RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT], capture_output=True, text=True, check=True
+        ).stdout.split()
+        results.append((float(output[-3]), float(output[-2]), output[-1] == "True"))
+
+    import_time = min(result[0] for result in results)
+    gui_time = min(result[1] for result in results)
+    panda = any(result[2] for result in results)
+
+    print(f"import pooltool: {import_time:.2f} s (Panda3D imported: {panda})")
+    print(f"pooltool.show:   {gui_time:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
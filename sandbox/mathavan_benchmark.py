@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+"""Benchmark the fixed and adaptive step integrations of the Mathavan cushion model
+
+A few hundred random cushion impacts are resolved with the default fixed impulse steps
+(``Mathavan2010Linear()``) and with adaptive steps at several tolerances
+(``Mathavan2010Linear(adaptive=True, rtol=...)``). Each is compared against a reference
+integrated with very small fixed steps. Errors are the largest deviation of any
+velocity component, relative to the incoming speed (and the incoming speed over R, for
+angular velocities).
+
+Finally, a 9-ball break is simulated end to end with both resolvers.
+"""
+
+import math
+import time
+
+import numpy as np
+
+import pooltool as pt
+from pooltool.physics.resolve.ball_cushion.mathavan_2010.model import (
+    Mathavan2010Circular,
+    Mathavan2010Linear,
+)
+
+NUM_IMPACTS = 300
+REFERENCE_DELTA_P = 1e-7
+
+
+def random_impacts(num: int) -> list[pt.Ball]:
+    rng = np.random.default_rng(0)
+    balls = []
+
+    for _ in range(num):
+        ball = pt.Ball.create("cue", xy=(0.5, 0.5))
+        R = ball.params.R
+        speed = rng.uniform(0.2, 4)
+        alpha = rng.uniform(0.05, math.pi / 2)
+        ball.state.rvw[1] = [speed * math.cos(alpha), -speed * math.sin(alpha), 0]
+        ball.state.rvw[2] = rng.uniform(-1, 1, size=3) * speed / R
+        balls.append(ball)
+
+    return balls
+
+
+def fixed_step_count(ball: pt.Ball, cushion, model: Mathavan2010Linear, rvw) -> int:
+    """The number of steps of a fixed step integration (both phases)"""
+    v_in = abs(np.dot(ball.state.rvw[1], cushion.normal))
+    v_out = abs(np.dot(rvw[1], cushion.normal))
+    impulse = ball.params.m * (v_in + v_out)
+    return math.ceil(
+        impulse / max(ball.params.m * v_in / model.max_steps, model.delta_p)
+    )
+
+
+def errors(balls, cushion, model, reference) -> np.ndarray:
+    errs = []
+    for ball, ref in zip(balls, reference):
+        rvw = model.solve(ball.copy(), cushion)[0].state.rvw
+        speed = pt.ptmath.norm3d(ball.state.rvw[1])
+        scale = np.array([speed, speed / ball.params.R])[:, None]
+        errs.append(np.max(np.abs(rvw[1:] - ref[1:]) / scale))
+    return np.array(errs)
+
+
+def time_per_impact(balls, cushion, model) -> float:
+    copies = [ball.copy() for ball in balls]
+    start = time.perf_counter()
+    for ball in copies:
+        model.solve(ball, cushion)
+    return (time.perf_counter() - start) / len(balls) * 1e6
+
+
+def main():
+    table = pt.Table.default()
+    cushion = table.cushion_segments.linear["3"]
+    balls = random_impacts(NUM_IMPACTS)
+
+    reference_model = Mathavan2010Linear(max_steps=10**8, delta_p=REFERENCE_DELTA_P)
+    reference = [reference_model.solve(b.copy(), cushion)[0].state.rvw for b in balls]
+
+    fixed = Mathavan2010Linear()
+    steps = [
+        fixed_step_count(b, cushion, fixed, ref) for b, ref in zip(balls, reference)
+    ]
+    print(
+        f"{NUM_IMPACTS} impacts, errors relative to delta_p={REFERENCE_DELTA_P} steps"
+    )
+    print(f"{'integration':<22} {'median err':>11} {'max err':>9} {'us/impact':>10}")
+
+    models = {"fixed (default)": fixed}
+    for rtol in (1e-3, 3e-4, 1e-4, 1e-5):
+        models[f"adaptive rtol={rtol:g}"] = Mathavan2010Linear(adaptive=True, rtol=rtol)
+
+    for name, model in models.items():
+        model.solve(balls[0].copy(), cushion)  # compile
+        errs = errors(balls, cushion, model, reference)
+        us = min(time_per_impact(balls, cushion, model) for _ in range(3))
+        print(f"{name:<22} {np.median(errs):>11.2e} {errs.max():>9.2e} {us:>10.1f}")
+
+    print(f"fixed steps per impact: median {np.median(steps):.0f}, max {max(steps)}")
+
+    # End to end
+    shot = pt.System(
+        cue=pt.Cue(cue_ball_id="cue"),
+        table=table,
+        balls=pt.get_rack(pt.GameType.NINEBALL, table),
+    )
+    shot.strike(V0=8, phi=pt.aim.at_ball(shot, "1"))
+
+    for adaptive in (False, True):
+        engine = pt.physics.PhysicsEngine()
+        engine.resolver.ball_linear_cushion = Mathavan2010Linear(adaptive=adaptive)
+        engine.resolver.ball_circular_cushion = Mathavan2010Circular(adaptive=adaptive)
+        pt.simulate(shot, engine=engine)
+        start = time.perf_counter()
+        for _ in range(10):
+            pt.simulate(shot, engine=engine)
+        ms = (time.perf_counter() - start) / 10 * 1e3
+        print(f"9-ball break, adaptive={adaptive}: {ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#! /usr/bin/env python
+"""Compare the size and speed of the JSON and binary multiplayer encodings
+
+A game of nine ball is played with random shots, and after each shot the ball states
+are encoded into a ``TURN_CHANGE`` message, like the server broadcasts them. The total
+number of bytes, and the time spent encoding and decoding, is printed per encoding.
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+import pooltool as pt
+from pooltool.multiplayer.protocol import (
+    Encoding,
+    GameMessage,
+    MessageCodec,
+    MessageType,
+    serialize_ball_positions,
+    serialize_ball_states,
+)
+
+
+def turn_changes(num_shots: int, seed: int) -> list[GameMessage]:
+    rng = np.random.default_rng(seed)
+    table = pt.Table.default()
+    system = pt.System(
+        cue=pt.Cue(cue_ball_id="cue"),
+        table=table,
+        balls=pt.get_rack(pt.GameType.NINEBALL, table),
+    )
+
+    messages = []
+    for shot in range(num_shots):
+        system.strike(V0=rng.uniform(1, 4), phi=rng.uniform(0, 360))
+        pt.simulate(system, inplace=True)
+        system.reset_history()
+
+        messages.append(
+            GameMessage(
+                msg_type=MessageType.TURN_CHANGE,
+                sender_id="server",
+                data={
+                    "next_player_id": "player",
+                    "game_state": {
+                        "room_id": "room",
+                        "turn_number": shot,
+                        "ball_positions": serialize_ball_positions(system.balls),
+                        "ball_states": serialize_ball_states(system.balls),
+                    },
+                },
+                timestamp=time.time(),
+            )
+        )
+
+    return messages
+
+
+async def decode_all(codec: MessageCodec, data: bytes) -> int:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+
+    count = 0
+    while await codec.read(reader) is not None:
+        count += 1
+    return count
+
+
+def main(args):
+    messages = turn_changes(args.shots, args.seed)
+
+    for encoding in Encoding:
+        start = time.perf_counter()
+        sender = MessageCodec(encoding=encoding)
+        data = b"".join(sender.encode(message) for message in messages)
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert asyncio.run(decode_all(MessageCodec(), data)) == len(messages)
+        decode = time.perf_counter() - start
+
+        print(
+            f"{encoding.value:>6}: {len(data) / len(messages):7.1f} bytes/message, "
+            f"encode {encode / len(messages) * 1e6:6.1f} us/message, "
+            f"decode {decode / len(messages) * 1e6:6.1f} us/message"
+        )
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser("Compare the multiplayer encodings")
+    ap.add_argument("--shots", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=0)
+    main(ap.parse_args())
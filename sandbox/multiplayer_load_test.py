@@ -0,0 +1,190 @@
+#! /usr/bin/env python
+"""Load test the multiplayer server
+
+A :class:`MultiplayerServer` and simulated clients are started in this process. The
+clients pair up into rooms, each room's host streams aim updates at a fixed rate, and
+its guest measures how long each update took to arrive. Some guests can be made slow:
+they stop reading, so that the server's queue for them fills up and its slow client
+policy kicks in.
+
+The latency percentiles over all received aim updates are printed, along with how many
+aim updates the server dropped and how many slow clients it disconnected.
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+from typing import Any
+
+import numpy as np
+
+from pooltool.multiplayer.protocol import (
+    Encoding,
+    GameMessage,
+    MessageCodec,
+    MessageType,
+)
+from pooltool.multiplayer.server import MultiplayerServer, SlowClientPolicy
+
+
+class SimulatedClient:
+    def __init__(self, reader, writer, binary: bool):
+        self.reader = reader
+        self.writer = writer
+        self.binary = binary
+        self.codec = MessageCodec()
+        self.latencies: list[float] = []
+
+    @classmethod
+    async def connect(cls, port: int, binary: bool, slow: bool) -> "SimulatedClient":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if slow:
+            # Keep the receive buffer small, so that a client that stops reading
+            # backs up the server soon
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.connect(("127.0.0.1", port))
+        sock.setblocking(False)
+
+        reader, writer = await asyncio.open_connection(sock=sock)
+        client = cls(reader, writer, binary)
+
+        encodings = [Encoding.BINARY.value, Encoding.JSON.value] if binary else []
+        await client.send(MessageType.CONNECT, {"name": "sim", "encodings": encodings})
+        response = await client.receive_until(MessageType.CONNECT)
+        if response.data.get("encoding") == Encoding.BINARY.value:
+            client.codec.encoding = Encoding.BINARY
+
+        return client
+
+    async def send(self, msg_type: MessageType, data: dict[str, Any]) -> None:
+        message = GameMessage(msg_type, "", data, time.time())
+        self.writer.write(self.codec.encode(message))
+        await self.writer.drain()
+
+    async def receive_until(self, msg_type: MessageType) -> GameMessage:
+        while True:
+            message = await self.codec.read(self.reader)
+            if message is None:
+                raise ConnectionError("Disconnected by the server")
+            if message.msg_type == msg_type:
+                return message
+
+    async def listen(self) -> None:
+        """Record the latency of every aim update, until disconnected"""
+        while (message := await self.codec.read(self.reader)) is not None:
+            if message.msg_type == MessageType.SHOT_AIM:
+                self.latencies.append(time.perf_counter() - message.data["sent"])
+
+
+async def start_room(port: int, binary: bool, slow: bool):
+    host = await SimulatedClient.connect(port, binary, slow=False)
+    guest = await SimulatedClient.connect(port, binary, slow=slow)
+
+    await host.send(MessageType.CREATE_ROOM, {"room_name": "load test"})
+    room = await host.receive_until(MessageType.CREATE_ROOM)
+
+    await guest.send(MessageType.JOIN_ROOM, {"room_id": room.data["room"]["room_id"]})
+    await guest.receive_until(MessageType.JOIN_ROOM)
+    await guest.send(MessageType.PLAYER_READY, {"is_ready": True})
+    while True:
+        update = await host.receive_until(MessageType.ROOM_UPDATE)
+        if all(player["is_ready"] for player in update.data["room"]["players"]):
+            break
+    await host.send(MessageType.GAME_START, {})
+    await guest.receive_until(MessageType.GAME_START)
+
+    return host, guest
+
+
+async def stream_aims(host: SimulatedClient, args) -> int:
+    """Send aim updates at a fixed rate for the duration of the test"""
+    padding = "x" * args.padding
+    interval = 1 / args.rate
+    end = time.perf_counter() + args.duration
+
+    sent = 0
+    while (now := time.perf_counter()) < end:
+        await host.send(
+            MessageType.SHOT_AIM,
+            {
+                "cue_state": {"phi": sent % 360, "V0": 2.0, "cue_ball_id": "cue"},
+                "sent": now,
+                "padding": padding,
+            },
+        )
+        sent += 1
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - now)))
+
+    return sent
+
+
+async def run(args) -> None:
+    server = MultiplayerServer(
+        host="127.0.0.1",
+        port=0,
+        max_queue=args.max_queue,
+        slow_client_policy=SlowClientPolicy(args.policy),
+    )
+    server_task = asyncio.create_task(server.start())
+    while server._server is None or not server._server.sockets:
+        await asyncio.sleep(0.01)
+    port = server._server.sockets[0].getsockname()[1]
+
+    rooms = [
+        await start_room(port, args.binary, slow=i < args.slow)
+        for i in range(args.rooms)
+    ]
+    fast_guests = [guest for _, guest in rooms[args.slow :]]
+    listeners = [asyncio.create_task(guest.listen()) for guest in fast_guests]
+
+    sent = sum(await asyncio.gather(*(stream_aims(host, args) for host, _ in rooms)))
+
+    # Let the last updates arrive
+    await asyncio.sleep(0.5)
+
+    dropped = sum(client.outbox.dropped for client in server.clients.values())
+    connected = len(server.clients)
+
+    for task in listeners:
+        task.cancel()
+    await server.stop()
+    server_task.cancel()
+
+    latencies = np.array([lat for guest in fast_guests for lat in guest.latencies])
+    print(
+        f"{len(rooms)} rooms ({args.slow} with a slow guest), "
+        f"{'binary' if args.binary else 'JSON'} encoding, {args.policy} policy"
+    )
+    print(f"Aim updates sent: {sent}, received by fast guests: {len(latencies)}")
+    if len(latencies):
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e3
+        print(
+            f"Latency: p50 {p50:.2f} ms, p90 {p90:.2f} ms, p99 {p99:.2f} ms, "
+            f"max {latencies.max() * 1e3:.2f} ms"
+        )
+    print(
+        f"Dropped stale aim updates: {dropped}, clients disconnected: "
+        f"{2 * len(rooms) - connected}"
+    )
+
+
+def main(args):
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser("Load test the multiplayer server")
+    ap.add_argument("--rooms", type=int, default=20)
+    ap.add_argument("--slow", type=int, default=2, help="Rooms with a slow guest")
+    ap.add_argument("--rate", type=float, default=60, help="Aim updates per second")
+    ap.add_argument("--duration", type=float, default=5.0, help="Seconds")
+    ap.add_argument("--padding", type=int, default=0, help="Extra bytes per aim update")
+    ap.add_argument("--binary", action="store_true", help="Use the binary encoding")
+    ap.add_argument("--max-queue", type=int, default=256)
+    ap.add_argument(
+        "--policy",
+        default=SlowClientPolicy.DROP_STALE.value,
+        choices=[policy.value for policy in SlowClientPolicy],
+    )
+    main(ap.parse_args())
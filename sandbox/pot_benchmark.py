@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+"""Time the evaluation of every pot on the table
+
+Every (object ball, pocket) candidate of a racked table, and then of the broken table,
+is evaluated. This is done once with :func:`pooltool.ai.pot.core.viable_pockets` for each
+object ball, and once with the batched :func:`pooltool.ai.pot.batch.evaluate_pots`.
+"""
+
+import argparse
+import time
+
+import pooltool as pt
+from pooltool.ai.pot.batch import evaluate_pots
+from pooltool.ai.pot.core import viable_pockets
+
+
+def rack(game_type: pt.GameType, broken: bool) -> pt.System:
+    table = pt.Table.from_game_type(game_type)
+    system = pt.System(
+        cue=pt.Cue(cue_ball_id="cue"),
+        table=table,
+        balls=pt.get_rack(game_type, table),
+    )
+
+    if broken:
+        system.strike(V0=8, phi=90.5, b=0.1)
+        pt.simulate(system, inplace=True)
+
+    return system
+
+
+def per_candidate(system: pt.System) -> dict[str, list[tuple[str, float]]]:
+    cue = system.balls[system.cue.cue_ball_id]
+    balls = list(system.balls.values())
+    return {
+        ball.id: viable_pockets(cue, ball, system.table, balls)
+        for ball in balls
+        if ball.id != cue.id and ball.state.s != pt.constants.pocketed
+    }
+
+
+def batched(system: pt.System) -> dict[str, list[tuple[str, float]]]:
+    pots = evaluate_pots(system)
+    return {ball_id: pots.viable_pockets(ball_id) for ball_id in pots.ball_ids}
+
+
+def best_time(func, system: pt.System, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(system)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(args):
+    game_type = pt.GameType[args.game.upper()]
+    for label, broken in (("racked", False), ("broken", True)):
+        system = rack(game_type, broken)
+
+        loop = best_time(per_candidate, system, args.repeats)
+        batch = best_time(batched, system, args.repeats)
+        print(
+            f"{label}: per-candidate {loop * 1e3:7.2f} ms, "
+            f"batched {batch * 1e3:6.2f} ms ({loop / batch:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser("Time the evaluation of every pot on the table")
+    ap.add_argument("--repeats", type=int, default=5)
+    ap.add_argument(
+        "--game",
+        default="nineball",
+        choices=["nineball", "eightball"],
+        help="Game type of the rack",
+    )
+    main(ap.parse_args())
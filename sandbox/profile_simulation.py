@@ -0,0 +1,67 @@
+#! /usr/bin/env python
+"""Report where the time goes in simulating a batch of break shots
+
+Each break is simulated with a :class:`SimulationProfile`, which times each phase of the
+event loop and counts the collision cache's hits and misses. The overhead of profiling
+is reported too, by simulating the same breaks without a profile.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import pooltool as pt
+from pooltool.evolution.event_based.profile import SimulationProfile
+
+
+def breaks(num_shots: int, game_type: pt.GameType) -> list[pt.System]:
+    rng = np.random.default_rng(0)
+    shots = []
+    for _ in range(num_shots):
+        table = pt.Table.from_game_type(game_type)
+        system = pt.System(
+            cue=pt.Cue(cue_ball_id="cue"),
+            table=table,
+            balls=pt.get_rack(game_type, table),
+        )
+        system.strike(V0=rng.uniform(6, 9), phi=rng.uniform(89, 91))
+        shots.append(system)
+    return shots
+
+
+def main(args):
+    shots = breaks(args.shots, pt.GameType[args.game.upper()])
+
+    # Compile the jitted kernels, and warm up the caches, before timing anything
+    for shot in shots:
+        pt.simulate(shot)
+
+    # Profiled and unprofiled simulations are interleaved so that both see the same
+    # machine conditions
+    profile = SimulationProfile()
+    unprofiled = 0.0
+    for shot in shots:
+        pt.simulate(shot, profile=profile)
+
+        start = time.perf_counter()
+        pt.simulate(shot)
+        unprofiled += time.perf_counter() - start
+
+    print(profile.report())
+    print(
+        f"unprofiled: {unprofiled * 1e3:.2f} ms "
+        f"(profiling overhead {profile.total / unprofiled - 1:.1%})"
+    )
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser("Profile the event loop over a batch of breaks")
+    ap.add_argument("--shots", type=int, default=20, help="Number of breaks")
+    ap.add_argument(
+        "--game",
+        default="nineball",
+        choices=["nineball", "eightball", "snooker"],
+        help="Game type of the rack",
+    )
+    main(ap.parse_args())
@@ -0,0 +1,122 @@
+#! /usr/bin/env python
+"""Benchmark the lookup-table surrogates against the models they approximate
+
+Random cushion impacts and cut shots (into a stationary object ball) are resolved with
+the exact models and with their surrogates. Errors are the largest deviation of any
+velocity component, relative to the incoming speed (and the incoming speed over R, for
+angular velocities).
+
+The cushion surrogate tabulates the adaptively integrated model, so it's compared to
+both that and the default (fixed step) model. The tables are built in a temporary
+directory, so the build times are reported too.
+"""
+
+import math
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import pooltool as pt
+import pooltool.physics.resolve.surrogate as surrogate
+from pooltool.physics.resolve.ball_ball.frictional_mathavan import FrictionalMathavan
+from pooltool.physics.resolve.ball_ball.frictional_mathavan.surrogate import (
+    FrictionalMathavanSurrogate,
+)
+from pooltool.physics.resolve.ball_cushion.mathavan_2010 import (
+    Mathavan2010Linear,
+    Mathavan2010LinearSurrogate,
+)
+
+NUM_COLLISIONS = 300
+
+
+def random_impacts(rng: np.random.Generator) -> list[tuple[pt.Ball]]:
+    impacts = []
+    for _ in range(NUM_COLLISIONS):
+        ball = pt.Ball.create("cue", xy=(0.5, 0.5))
+        speed = rng.uniform(0.2, 4)
+        alpha = rng.uniform(0.05, math.pi / 2)
+        ball.state.rvw[1] = [speed * math.cos(alpha), -speed * math.sin(alpha), 0]
+        ball.state.rvw[2] = rng.uniform(-1, 1, size=3) * speed / ball.params.R
+        impacts.append((ball,))
+    return impacts
+
+
+def random_cut_shots(rng: np.random.Generator) -> list[tuple[pt.Ball, pt.Ball]]:
+    shots = []
+    for _ in range(NUM_COLLISIONS):
+        ball1 = pt.Ball.create("1", xy=(0.5, 0.5))
+        R = ball1.params.R
+        cut_angle = rng.uniform(-1.5, 1.5)
+        ball2 = pt.Ball.create(
+            "2",
+            xy=(0.5 + 2 * R * math.sin(cut_angle), 0.5 + 2 * R * math.cos(cut_angle)),
+        )
+        speed = rng.uniform(0.2, 4)
+        ball1.state.rvw[1] = [0, speed, 0]
+        ball1.state.rvw[2] = rng.uniform(-1, 1, size=3) * speed / R
+        ball1.state.s = pt.constants.sliding
+        shots.append((ball1, ball2))
+    return shots
+
+
+def resolve(model, collisions, *args) -> tuple[list, float]:
+    copies = [[ball.copy() for ball in balls] for balls in collisions]
+    start = time.perf_counter()
+    results = [model.solve(*balls, *args) for balls in copies]
+    us = (time.perf_counter() - start) / len(collisions) * 1e6
+    return results, us
+
+
+def compare(name, exact, model, collisions, *args) -> None:
+    exact_results, exact_us = resolve(exact, collisions, *args)
+
+    start = time.perf_counter()
+    model.solve(*[ball.copy() for ball in collisions[0]], *args)
+    build_s = time.perf_counter() - start
+
+    results, us = resolve(model, collisions, *args)
+
+    errs = []
+    for balls, result, expected in zip(collisions, results, exact_results):
+        speed = pt.ptmath.norm3d(balls[0].state.rvw[1])
+        scale = np.array([speed, speed / balls[0].params.R])[:, None]
+        # Results are the balls followed by any other agents (i.e. a cushion)
+        for ball, ball_expected in zip(result[: len(balls)], expected):
+            diff = ball.state.rvw[1:] - ball_expected.state.rvw[1:]
+            errs.append(np.max(np.abs(diff) / scale))
+
+    print(
+        f"{name:<18} build {build_s:>5.1f} s, "
+        f"{exact_us:>6.1f} -> {us:>5.1f} us/collision, "
+        f"error median {np.median(errs):.1e}, max {max(errs):.1e} "
+        f"(tolerance {model.tolerance})"
+    )
+
+
+def main():
+    surrogate.SURROGATE_DIR = Path(tempfile.mkdtemp())
+    rng = np.random.default_rng(0)
+
+    cushion = pt.Table.default().cushion_segments.linear["3"]
+    impacts = random_impacts(rng)
+    Mathavan2010Linear().solve(impacts[0][0].copy(), cushion)  # compile
+    model = Mathavan2010LinearSurrogate()
+    compare(
+        "cushion (adaptive)",
+        Mathavan2010Linear(adaptive=True, rtol=model.rtol, max_steps=model.max_steps),
+        model,
+        impacts,
+        cushion,
+    )
+    compare("cushion", Mathavan2010Linear(), model, impacts, cushion)
+
+    shots = random_cut_shots(rng)
+    FrictionalMathavan().solve(*[ball.copy() for ball in shots[0]])  # compile
+    compare("ball-ball", FrictionalMathavan(), FrictionalMathavanSurrogate(), shots)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+"""Time-to-first-simulate in a fresh process, before and after warming up
+
+Each measurement runs in a new Python process with its own empty numba cache directory
+(``NUMBA_CACHE_DIR``), so nothing carries over from previous runs:
+
+* Cold: nothing is cached, so every kernel is compiled during the first simulation.
+* Warmed up: ``run-pooltool-warmup`` (:func:`pooltool.warmup`) was run beforehand, in
+  another process, so the first simulation only loads kernels from the cache.
+
+Import time is reported separately, and isn't affected by warming up.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+FIRST_SIMULATE = """
+import time
+start = time.perf_counter()
+import pooltool as pt
+imported = time.perf_counter()
+pt.simulate(pt.System.example())
+end = time.perf_counter()
+print(imported - start, end - imported)
+"""
+
+
+def first_simulate(env: dict[str, str]) -> tuple[float, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_SIMULATE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    import_time, simulate_time = map(float, output.split()[-2:])
+    return import_time, simulate_time
+
+
+def main():
+    for name, warm in (("Cold", False), ("Warmed up", True)):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir)
+
+            if warm:
+                subprocess.run(
+                    [sys.executable, "-m", "pooltool.evolution.event_based.warmup"],
+                    env=env,
+                    check=True,
+                )
+
+            import_time, simulate_time = first_simulate(env)
+            print(
+                f"{name + ':':<11} import {import_time:6.2f} s, "
+                f"first simulate {simulate_time:6.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+import pooltool.constants as const
+from pooltool.ai.pot.batch import evaluate_pots
+from pooltool.ai.pot.core import (
+    calc_cut_angle,
+    calc_shadow_ball_center,
+    get_potting_point,
+    is_jaw_in_way,
+    is_object_ball_occluded,
+    is_pocket_occluded,
+    is_room_for_cue_ball,
+    pick_easiest_pot,
+    required_precision,
+    viable_pockets,
+)
+from pooltool.objects import Ball, Cue, Table
+from pooltool.system.datatypes import System
+
+
+def _random_system(seed: int, num_balls: int = 12) -> System:
+    """Balls scattered without overlap, some of them in the jaws of pockets"""
+    rng = np.random.default_rng(seed)
+    table = Table.default()
+    R = Ball.dummy().params.R
+
+    candidates = [
+        (rng.uniform(R, table.w - R), rng.uniform(R, table.l - R))
+        for _ in range(num_balls)
+    ]
+
+    # Put a couple of balls right next to pockets
+    for pocket in rng.choice(list(table.pockets.values()), size=2, replace=False):
+        direction = np.array([table.w / 2, table.l / 2]) - pocket.center[:2]
+        direction /= np.linalg.norm(direction)
+        candidates.append(tuple(pocket.center[:2] + direction * rng.uniform(0, 6 * R)))
+
+    positions: list[tuple[float, float]] = []
+    for xy in candidates:
+        if all(np.hypot(xy[0] - x, xy[1] - y) > 2 * R for x, y in positions):
+            positions.append(xy)
+
+    balls = {
+        ("cue" if i == 0 else str(i)): Ball.create("cue" if i == 0 else str(i), xy=xy)
+        for i, xy in enumerate(positions)
+    }
+    return System(cue=Cue(cue_ball_id="cue"), table=table, balls=balls)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_agrees_with_per_candidate_functions(seed: int):
+    system = _random_system(seed)
+    table = system.table
+    cue = system.balls["cue"]
+    balls = list(system.balls.values())
+
+    pots = evaluate_pots(system)
+
+    assert pots.ball_ids == [ball_id for ball_id in system.balls if ball_id != "cue"]
+    assert pots.pocket_ids == list(table.pockets)
+
+    for i, ball_id in enumerate(pots.ball_ids):
+        ball = system.balls[ball_id]
+        for j, pocket_id in enumerate(pots.pocket_ids):
+            pocket = table.pockets[pocket_id]
+            potting_point = get_potting_point(ball, table, pocket)
+
+            assert pots.potting_points[i, j] == pytest.approx(potting_point, abs=1e-12)
+            assert pots.shadow_ball_centers[i, j] == pytest.approx(
+                calc_shadow_ball_center(ball, table, pocket), abs=1e-12
+            )
+            assert pots.cut_angles[i, j] == pytest.approx(
+                abs(calc_cut_angle(cue.xyz[:2], ball.xyz[:2], potting_point)),
+                abs=1e-9,
+            )
+            assert pots.precisions[i, j] == pytest.approx(
+                required_precision(cue.state, ball.state, table, pocket), abs=1e-9
+            )
+            assert pots.pocket_occluded[i, j] == is_pocket_occluded(
+                ball, table, pocket, balls
+            )
+            assert pots.room_for_cue_ball[i, j] == is_room_for_cue_ball(
+                ball, table, pocket, balls
+            )
+            assert pots.jaw_in_way[i, j] == is_jaw_in_way(ball, table, pocket)
+            assert pots.object_ball_occluded[i, j] == is_object_ball_occluded(
+                cue, ball, table, pocket, balls
+            )
+
+        expected = viable_pockets(cue, ball, table, balls)
+        actual = pots.viable_pockets(ball_id)
+        assert sorted(pocket_id for pocket_id, _ in actual) == sorted(
+            pocket_id for pocket_id, _ in expected
+        )
+        assert [precision for _, precision in actual] == pytest.approx(
+            [precision for _, precision in expected], abs=1e-9
+        )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_easiest_pocket(seed: int):
+    system = _random_system(seed)
+    pots = evaluate_pots(system)
+
+    for ball_id in pots.ball_ids:
+        easiest = pick_easiest_pot(system, system.balls[ball_id])
+        expected = None if easiest is None else easiest.id
+
+        # Pockets whose required precisions are equal up to round-off, e.g. for a
+        # ball on the table's long axis, may be ordered either way
+        options = pots.viable_pockets(ball_id)
+        ties = {
+            pocket_id
+            for pocket_id, precision in options
+            if options and precision - options[0][1] < 1e-9
+        }
+        assert pots.easiest_pocket(ball_id) == expected or expected in ties
+
+
+def test_ranked():
+    system = _random_system(0, num_balls=15)
+    pots = evaluate_pots(system)
+
+    ranked = pots.ranked()
+    assert ranked.shape[1] == 2
+    assert len(ranked) == pots.viable.sum()
+    assert pots.viable[ranked[:, 0], ranked[:, 1]].all()
+
+    precisions = pots.precisions[ranked[:, 0], ranked[:, 1]]
+    assert (np.diff(precisions) >= 0).all()
+
+
+def test_ball_ids():
+    system = _random_system(1)
+    system.balls["1"].state.s = const.pocketed
+
+    assert "1" not in evaluate_pots(system).ball_ids
+
+    pots = evaluate_pots(system, ball_ids=["2", "1"])
+    assert pots.ball_ids == ["2", "1"]
+    assert pots.cut_angles.shape == (2, len(system.table.pockets))
+
+
+def test_no_object_balls():
+    system = _random_system(2)
+    pots = evaluate_pots(system, ball_ids=[])
+
+    assert pots.cut_angles.shape == (0, len(system.table.pockets))
+    assert len(pots.ranked()) == 0
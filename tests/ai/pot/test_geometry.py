@@ -0,0 +1,122 @@
+import attrs
+import numpy as np
+import pytest
+
+from pooltool.ai.pot.geometry import (
+    CACHE_SIZE,
+    _pocket_cache,
+    clear_geometry_cache,
+    pocket_geometry,
+    pocket_jaw_map,
+    table_geometry,
+)
+from pooltool.objects import Table
+from pooltool.ptmath import find_intersection_2D
+
+
+@pytest.fixture
+def table() -> Table:
+    return Table.default()
+
+
+def test_values(table: Table):
+    geometry = table_geometry(table)
+    assert geometry.ids == list(table.pockets)
+
+    for i, (pocket_id, pocket) in enumerate(table.pockets.items()):
+        jaw = pocket_jaw_map[pocket_id]
+        lrail = table.cushion_segments.linear[jaw.left_rail]
+        ledge = table.cushion_segments.linear[jaw.left_edge]
+        rrail = table.cushion_segments.linear[jaw.right_rail]
+        ljaw = table.cushion_segments.circular[jaw.left_tip]
+
+        pocket_geometry = geometry[pocket_id]
+        assert pocket_geometry.corner == jaw.corner
+        assert np.array_equal(pocket_geometry.center, pocket.center)
+        assert tuple(pocket_geometry.ltip) == find_intersection_2D(
+            lrail.lx, lrail.ly, lrail.l0, ledge.lx, ledge.ly, ledge.l0
+        )
+        assert np.array_equal(pocket_geometry.ljaw_center, ljaw.center)
+        assert pocket_geometry.ljaw_radius == ljaw.radius
+
+        if jaw.corner:
+            assert pocket_geometry.mbj is None
+            assert pocket_geometry.aci is not None
+            assert tuple(pocket_geometry.aci) == find_intersection_2D(
+                lrail.lx, lrail.ly, lrail.l0, rrail.lx, rrail.ly, rrail.l0
+            )
+            assert np.isnan(geometry.mbj[i]).all()
+        else:
+            assert pocket_geometry.aci is None
+            assert pocket_geometry.mbj is not None
+            assert np.isnan(geometry.aci[i]).all()
+
+        # The stacked arrays agree with the per-pocket geometry
+        assert np.array_equal(geometry.ltip[i], pocket_geometry.ltip)
+        assert np.array_equal(geometry.center[i], pocket_geometry.center)
+
+
+def test_read_only(table: Table):
+    geometry = table_geometry(table)
+
+    with pytest.raises(ValueError):
+        geometry.ltip[0] = 0
+    with pytest.raises(ValueError):
+        geometry["lb"].ltip[0] = 0
+
+
+def test_memoized(table: Table):
+    geometry = table_geometry(table)
+
+    assert table_geometry(table) is geometry
+    assert table_geometry(table.copy()) is geometry
+    assert pocket_geometry(table, "lb") is geometry["lb"]
+
+
+def test_invalidated_when_cushions_change(table: Table):
+    geometry = table_geometry(table)
+
+    table.set_cushion_height(table.cushion_segments.linear["3"].height * 2)
+    changed = table_geometry(table)
+    assert changed is not geometry
+
+    # Only the pockets around the replaced segment are recomputed
+    table = Table.default()
+    geometry = table_geometry(table)
+    segment = table.cushion_segments.linear["3"]
+    table.cushion_segments.linear["3"] = attrs.evolve(
+        segment, p1=segment.p1 + [0.01, 0, 0]
+    )
+
+    changed = table_geometry(table)
+    assert changed is not geometry
+    assert changed["lb"] is not geometry["lb"]
+    assert changed["lc"] is not geometry["lc"]
+    assert changed["rt"] is geometry["rt"]
+    assert not np.array_equal(changed["lb"].rtip, geometry["lb"].rtip)
+
+
+def test_invalidated_when_pockets_change(table: Table):
+    geometry = table_geometry(table)
+
+    pocket = table.pockets["lb"]
+    table.pockets["lb"] = attrs.evolve(pocket, center=pocket.center + [0.01, 0, 0])
+
+    changed = table_geometry(table)
+    assert changed is not geometry
+    assert changed["lb"] is not geometry["lb"]
+    assert np.array_equal(changed["lb"].center, table.pockets["lb"].center)
+
+
+def test_bounded():
+    clear_geometry_cache()
+
+    tables = [Table.default() for _ in range(CACHE_SIZE)]
+    for i, table in enumerate(tables):
+        table.set_cushion_height(0.03 + i * 1e-4)
+        table_geometry(table)
+
+    assert len(_pocket_cache) == CACHE_SIZE
+
+    clear_geometry_cache()
+    assert not len(_pocket_cache)
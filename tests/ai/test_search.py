@@ -0,0 +1,142 @@
+import attrs
+import numpy as np
+import pytest
+
+from pooltool.ai.action import Action
+from pooltool.ai.search import SimulationAI, score_shot
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.game.datatypes import GameType
+from pooltool.objects import Ball, Cue, Table
+from pooltool.ruleset import Player, Ruleset, get_ruleset
+from pooltool.ruleset.utils import get_pocketed_ball_ids_during_shot
+from pooltool.system.datatypes import System
+
+
+def _straight_in() -> System:
+    """The 1 ball sits between the cue ball and the left-bottom pocket"""
+    table = Table.default()
+    pocket = table.pockets["lb"]
+
+    cue_xy = np.array([table.w / 2, table.l / 3])
+    direction = np.array([pocket.a, pocket.b]) - cue_xy
+
+    return System(
+        cue=Cue(cue_ball_id="cue"),
+        table=table,
+        balls={
+            "cue": Ball.create("cue", xy=cue_xy),
+            "1": Ball.create("1", xy=cue_xy + direction / 2),
+            "2": Ball.create("2", xy=(table.w / 2, 3 * table.l / 4)),
+        },
+    )
+
+
+def _game(ai: SimulationAI) -> Ruleset:
+    game = get_ruleset(GameType.NINEBALL)([Player("AI", ai=ai), Player("B")])
+
+    # Past the break, the 1 ball must be hit first
+    game.shot_number = 1
+    game.shot_constraints = attrs.evolve(game.shot_constraints, hittable=("1",))
+    return game
+
+
+def test_pots_straight_in():
+    ai = SimulationAI(time_budget=60, max_candidates=5, seed=0)
+    system = _straight_in()
+    game = _game(ai)
+
+    action = ai.decide(system, game)
+
+    # The system isn't modified by the search
+    assert not system.simulated
+
+    ai.apply(system, action)
+    simulate(system, inplace=True)
+    assert "1" in get_pocketed_ball_ids_during_shot(system)
+
+    info = game.build_shot_info(system)
+    assert info.legal and not info.turn_over
+
+    assert ai.last_result is not None
+    assert ai.last_result.score == score_shot(game, system, info)
+    assert ai.last_result.evaluated == 5
+    assert not ai.last_result.timed_out
+
+
+def test_anytime():
+    """Without time to simulate anything, a geometric solution is returned"""
+    ai = SimulationAI(time_budget=0)
+    action = ai.decide(_straight_in(), _game(ai))
+
+    assert isinstance(action, Action)
+    assert ai.last_result is not None
+    assert ai.last_result.evaluated == 0
+    assert ai.last_result.timed_out
+    assert ai.last_result.score == -np.inf
+
+
+def test_callback_reports_improvements():
+    ai = SimulationAI(time_budget=60, max_candidates=8, seed=1)
+    improvements: list[Action] = []
+
+    action = ai.decide(_straight_in(), _game(ai), callback=improvements.append)
+
+    assert improvements
+    assert improvements[-1] == action
+
+
+def test_stops_when_good_enough():
+    ai = SimulationAI(time_budget=60, max_candidates=50, good_enough=100, seed=0)
+    ai.decide(_straight_in(), _game(ai))
+
+    assert ai.last_result is not None
+    assert ai.last_result.score >= 100
+    assert ai.last_result.evaluated < 50
+
+
+def test_calls_shot():
+    ai = SimulationAI(time_budget=60, max_candidates=3, seed=0)
+    game = _game(ai)
+    game.shot_constraints = attrs.evolve(game.shot_constraints, call_shot=True)
+
+    ai.decide(_straight_in(), game)
+
+    assert game.shot_constraints.ball_call == "1"
+    assert game.shot_constraints.pocket_call == "lb"
+
+
+def test_nothing_to_shoot_at():
+    system = _straight_in()
+    del system.balls["1"]
+    del system.balls["2"]
+
+    ai = SimulationAI(time_budget=60)
+    assert isinstance(ai.decide(system, _game(ai)), Action)
+    assert ai.last_result is not None
+    assert ai.last_result.candidate is None
+
+
+def test_workers_are_reused():
+    with SimulationAI(time_budget=60, max_candidates=4, workers=2, seed=0) as ai:
+        system = _straight_in()
+        game = _game(ai)
+
+        ai.start()
+        pool = ai._pool
+        assert pool is not None
+
+        ai.decide(system, game)
+        assert ai._pool is pool
+        assert ai.last_result is not None
+        assert ai.last_result.evaluated == 4
+        assert ai.last_result.score >= 100
+
+        ai.decide(system, game)
+        assert ai._pool is pool
+
+    assert ai._pool is None
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        SimulationAI(workers=0)
@@ -0,0 +1,27 @@
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
+from pooltool.objects import Cue, Table
+from pooltool.system import System
+
+
+@pytest.fixture
+def break_shot() -> Callable[[GameType, int], System]:
+    """A factory of tightly racked break shots, seeded for a reproducible rack"""
+
+    def _break_shot(game_type: GameType, seed: int) -> System:
+        np.random.seed(seed)
+        table = Table.default()
+        system = System(
+            cue=Cue(cue_ball_id="cue"),
+            table=table,
+            balls=get_rack(game_type, table, spacing_factor=1e-3),
+        )
+        system.strike(V0=8, phi=95)
+        return system
+
+    return _break_shot
@@ -0,0 +1,22 @@
+from typing import Any
+
+import pytest
+
+from pooltool.evolution.event_based.config import _Strategy
+from pooltool.evolution.event_based.context import SimulationContext
+from pooltool.objects import Table
+
+
+@pytest.fixture(params=["default", "scan", "narrowphase", "context"])
+def variant(request) -> dict[str, Any]:
+    """Keyword arguments of simulate that select an implementation of the event loop
+
+    Every implementation selects the same events. The context is created for the
+    default table.
+    """
+    return {
+        "default": lambda: dict(),
+        "scan": lambda: dict(_strategy=_Strategy(heap=False)),
+        "narrowphase": lambda: dict(_strategy=_Strategy(broadphase=False)),
+        "context": lambda: dict(context=SimulationContext.create(Table.default())),
+    }[request.param]()
@@ -0,0 +1,89 @@
+import numpy as np
+
+import pooltool.constants as const
+from pooltool.events import null_event
+from pooltool.evolution.event_based.arrays import BallStateArrays
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.game.datatypes import GameType
+from pooltool.physics.evolve import evolve_ball_motion, evolve_ball_motions
+from pooltool.system import System
+
+
+def test_evolve_ball_motions_matches_evolve_ball_motion():
+    rng = np.random.default_rng(42)
+
+    system = System.example()
+    system.strike(V0=2)
+    system = simulate(system, max_events=3)
+
+    states = []
+    for ball in system.balls.values():
+        for state in ball.history:
+            states.append(state)
+
+    rvws = np.array([state.rvw for state in states])
+    ss = np.array([state.s for state in states], dtype=np.int64)
+
+    params = system.balls["cue"].params
+    param_matrix = np.tile(
+        [params.R, params.m, params.u_s, params.u_sp, params.u_r, params.g],
+        (len(states), 1),
+    )
+
+    for dt in rng.uniform(0, 2, size=5):
+        evolved = rvws.copy()
+        evolve_ball_motions(ss, evolved, param_matrix, dt)
+
+        for idx in range(len(states)):
+            expected, _ = evolve_ball_motion(ss[idx], rvws[idx], *param_matrix[idx], dt)
+            np.testing.assert_array_equal(evolved[idx], expected)
+
+
+def test_pack_links_ball_states():
+    system = System.example()
+    arrays = BallStateArrays.pack(system)
+
+    assert arrays.rvw.shape == (len(system.balls), 3, 3)
+    assert arrays.params.shape == (len(system.balls), 6)
+
+    arrays.evolve(0.0)
+    arrays.rvw[0, 0, 0] = 1.0
+    assert system.balls[arrays.ids[0]].state.rvw[0, 0] == 1.0
+
+
+def test_unpacked_leaves_the_arrays_packed():
+    system = System.example()
+    system.strike(V0=2)
+    system.reset_history()
+
+    arrays = BallStateArrays.pack(system)
+    arrays.record(system, null_event(time=0))
+    arrays.evolve(0.1)
+
+    copy = arrays.unpacked(system)
+
+    for ball_id, ball in copy.balls.items():
+        assert ball.state == ball.history[-1]
+        assert ball.state.t == 0
+        assert ball.state.rvw.base is not arrays.rvw
+        assert system.balls[ball_id].history.empty
+
+    # The simulated system is still a view into the arrays
+    arrays.rvw[0, 0, 0] = 1.0
+    assert system.balls[arrays.ids[0]].state.rvw[0, 0] == 1.0
+
+
+def test_final_states_are_independent(break_shot):
+    system = simulate(break_shot(GameType.NINEBALL, seed=1))
+
+    for ball in system.balls.values():
+        assert ball.state == ball.history[-1]
+        assert ball.state.s in const.nontranslating
+
+    # Modifying one ball's state doesn't leak into any other ball
+    others = {ball_id: ball.copy() for ball_id, ball in system.balls.items()}
+    system.balls["cue"].state.rvw[:] = 0.0
+
+    for ball_id, ball in system.balls.items():
+        if ball_id != "cue":
+            assert ball == others[ball_id]
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from pooltool.events import EventType
+from pooltool.evolution.event_based.arrays import ball_params_matrix
+from pooltool.evolution.event_based.broadphase import (
+    BroadPhase,
+    overlapping_pairs,
+    swept_bounding_boxes,
+)
+from pooltool.evolution.event_based.cache import TransitionCache
+from pooltool.evolution.event_based.config import INCLUDED_EVENTS, _Strategy
+from pooltool.evolution.event_based.simulate import _SimulationState, simulate
+from pooltool.game.datatypes import GameType
+from pooltool.objects import Table
+from pooltool.physics.engine import PhysicsEngine
+from pooltool.physics.evolve import evolve_ball_motion
+from pooltool.system import System
+
+
+def test_swept_bounding_boxes_contain_trajectory(break_shot):
+    """Every ball center stays within its box until its next transition"""
+    system = simulate(break_shot(GameType.NINEBALL, seed=1), max_events=6)
+
+    # Replay the history so that states of all motion types are covered
+    for idx in range(len(system.events)):
+        balls = list(system.balls.values())
+        states = [ball.history[idx] for ball in balls]
+        shot = system.copy()
+        for ball, state in zip(shot.balls.values(), states):
+            ball.state = state.copy()
+
+        transitions = TransitionCache.create(shot)
+        dts = np.array(
+            [
+                transitions.transitions[ball.id].time - state.t
+                for ball, state in zip(balls, states)
+            ]
+        )
+        dts[~np.isfinite(dts)] = 0.0
+
+        boxes = swept_bounding_boxes(
+            np.array([state.rvw for state in states]),
+            np.array([state.s for state in states], dtype=np.int64),
+            ball_params_matrix(balls),
+            dts,
+        )
+
+        for ball, state, dt, box in zip(balls, states, dts, boxes):
+            p = ball.params
+            for t in np.linspace(0, dt, 20):
+                rvw, _ = evolve_ball_motion(
+                    state.s, state.rvw, p.R, p.m, p.u_s, p.u_sp, p.u_r, p.g, t
+                )
+                assert box[0] - 1e-12 <= rvw[0, 0] <= box[1] + 1e-12
+                assert box[2] - 1e-12 <= rvw[0, 1] <= box[3] + 1e-12
+
+
+def test_swept_bounding_boxes_unbounded_window():
+    system = System.example()
+    system.balls["cue"].state.rvw[1] = [1.0, 0.0, 0.0]
+    system.balls["cue"].state.s = 3
+
+    ball = system.balls["cue"]
+    boxes = swept_bounding_boxes(
+        np.array([ball.state.rvw]),
+        np.array([ball.state.s], dtype=np.int64),
+        ball_params_matrix([ball]),
+        np.array([np.inf]),
+    )
+
+    assert (boxes[0] == [-np.inf, np.inf, -np.inf, np.inf]).all()
+
+
+def test_overlapping_pairs():
+    R = 0.03
+    boxes = np.array(
+        [
+            [0.0, 0.1, 0.0, 0.1],
+            [0.1 + 2 * R - 1e-3, 0.3, 0.0, 0.1],
+            [0.5, 0.6, 0.5, 0.6],
+        ]
+    )
+    params = np.tile([R, 0.17, 0.2, 0.044, 0.01, 9.8], (3, 1))
+
+    overlaps = overlapping_pairs(
+        boxes,
+        params,
+        np.array([0, 0, 1], dtype=np.int64),
+        np.array([1, 2, 2], dtype=np.int64),
+        0.0,
+    )
+
+    assert list(overlaps) == [True, False, False]
+
+
+def test_broadphase_from_table():
+    table = Table.default()
+    broadphase = BroadPhase.from_table(table)
+
+    assert broadphase.linear.keys() == table.cushion_segments.linear.keys()
+    assert broadphase.circular.keys() == table.cushion_segments.circular.keys()
+    assert broadphase.pockets.keys() == table.pockets.keys()
+
+    for pocket_id, (xmin, xmax, ymin, ymax) in broadphase.pockets.items():
+        pocket = table.pockets[pocket_id]
+        assert xmin <= pocket.a <= xmax
+        assert ymin <= pocket.b <= ymax
+        assert xmax - xmin == pytest.approx(2 * pocket.radius)
+
+
+def test_broadphase_requires_transitions():
+    engine = PhysicsEngine()
+
+    sim = _SimulationState(System.example(), engine)
+    assert sim.broadphase is not None
+
+    sim = _SimulationState(
+        System.example(), engine, strategy=_Strategy(broadphase=False)
+    )
+    assert sim.broadphase is None
+
+    include = INCLUDED_EVENTS - {EventType.SLIDING_ROLLING}
+    sim = _SimulationState(System.example(), engine, include=include)
+    assert sim.broadphase is None
@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+
+from pooltool.events import EventType, ball_ball_collision, null_event
+from pooltool.evolution.event_based.cache import (
+    CollisionCache,
+    EventHeap,
+    TransitionCache,
+)
+from pooltool.objects import Ball
+from pooltool.system import System
+
+
+def _dict_argmin(d: dict) -> str:
+    return min(d, key=lambda k: d[k])
+
+
+def test_event_heap_matches_dict_scan():
+    rng = np.random.default_rng(42)
+
+    heap = EventHeap()
+    reference: dict[str, float] = {}
+
+    keys = [str(i) for i in range(20)]
+
+    for _ in range(2000):
+        key = str(rng.choice(keys))
+        action = rng.integers(3)
+
+        if action == 0 or not reference:
+            # Coarse times guarantee lots of ties
+            time = float(rng.integers(5)) if rng.random() < 0.9 else np.inf
+            reference[key] = time
+            heap.push(key, time)
+        elif action == 1:
+            reference.pop(key, None)
+            heap.discard(key)
+        else:
+            assert heap.peek() == _dict_argmin(reference)
+
+        assert len(heap) == len(reference)
+
+
+def test_event_heap_empty():
+    heap = EventHeap()
+
+    with pytest.raises(ValueError):
+        heap.peek()
+
+    heap.push("a", 1.0)
+    heap.discard("a")
+
+    with pytest.raises(ValueError):
+        heap.peek()
+
+
+def test_event_heap_from_dict():
+    times = {"a": 2.0, "b": 1.0, "c": 1.0}
+    assert EventHeap.from_dict(times).peek() == "b"
+
+
+def test_collision_cache_get_next():
+    for use_heap in (True, False):
+        cache = CollisionCache.create(use_heap=use_heap)
+        cache.set_time(EventType.BALL_BALL, ("1", "2"), 3.0)
+        cache.set_time(EventType.BALL_BALL, ("1", "3"), 1.0)
+        cache.set_time(EventType.BALL_BALL, ("2", "3"), 2.0)
+
+        assert cache.get_next(EventType.BALL_BALL) == ("1", "3")
+
+        event = ball_ball_collision(Ball.dummy("1"), Ball.dummy("4"), time=0.0)
+        cache.invalidate(event)
+
+        assert cache.times[EventType.BALL_BALL] == {("2", "3"): 2.0}
+        assert cache.get_next(EventType.BALL_BALL) == ("2", "3")
+
+
+def test_collision_cache_set_times():
+    items = [(("1", "2"), 3.0), (("1", "3"), 1.0), (("2", "3"), 1.0)]
+
+    for use_heap in (True, False):
+        one_by_one = CollisionCache.create(use_heap=use_heap)
+        for key, time in items:
+            one_by_one.set_time(EventType.BALL_BALL, key, time)
+
+        batched = CollisionCache.create(use_heap=use_heap)
+        batched.set_times(EventType.BALL_BALL, items)
+
+        assert batched.times == one_by_one.times
+        assert batched.get_next(EventType.BALL_BALL) == ("1", "3")
+
+        event = ball_ball_collision(Ball.dummy("3"), Ball.dummy("4"), time=0.0)
+        batched.invalidate(event)
+        assert batched.times[EventType.BALL_BALL] == {("1", "2"): 3.0}
+
+
+def test_collision_cache_copy_keeps_heap():
+    cache = CollisionCache.create()
+    cache.set_time(EventType.BALL_POCKET, ("1", "lc"), 3.0)
+    cache.set_time(EventType.BALL_POCKET, ("2", "lc"), 1.0)
+
+    copy = cache.copy()
+    copy.set_time(EventType.BALL_POCKET, ("3", "lc"), 0.5)
+
+    assert copy.get_next(EventType.BALL_POCKET) == ("3", "lc")
+    assert cache.get_next(EventType.BALL_POCKET) == ("2", "lc")
+
+
+def test_transition_cache_get_next():
+    system = System.example()
+
+    for use_heap in (True, False):
+        cache = TransitionCache.create(system, use_heap=use_heap)
+        assert cache.get_next().time == np.inf
+
+    cache = TransitionCache(transitions={"null": null_event(time=np.inf)})
+    assert cache.get_next().time == np.inf
+
+
+def test_collision_cache_invalidate_uses_ball_index():
+    cache = CollisionCache.create()
+    cache.set_time(EventType.BALL_BALL, ("1", "2"), 1.0)
+    cache.set_time(EventType.BALL_BALL, ("2", "3"), 2.0)
+    cache.set_time(EventType.BALL_LINEAR_CUSHION, ("1", "c1"), 3.0)
+    cache.set_time(EventType.BALL_LINEAR_CUSHION, ("3", "c1"), 4.0)
+    cache.set_time(EventType.STICK_BALL, ("cue_stick", "1"), np.inf)
+
+    cache.invalidate(ball_ball_collision(Ball.dummy("1"), Ball.dummy("4"), time=0.0))
+
+    assert cache.times == {
+        EventType.BALL_BALL: {("2", "3"): 2.0},
+        EventType.BALL_LINEAR_CUSHION: {("3", "c1"): 4.0},
+        EventType.STICK_BALL: {},
+    }
+
+    # Ball "2" still refers to the invalidated ("1", "2") pair. Re-cache it, then
+    # invalidate ball "2". Both of its pairs should be dropped.
+    cache.set_time(EventType.BALL_BALL, ("1", "2"), 5.0)
+    cache.invalidate(ball_ball_collision(Ball.dummy("2"), Ball.dummy("4"), time=0.0))
+
+    assert cache.times[EventType.BALL_BALL] == {}
+    assert cache.get_times(EventType.BALL_LINEAR_CUSHION) == {("3", "c1"): 4.0}
+    assert cache.get_next(EventType.BALL_LINEAR_CUSHION) == ("3", "c1")
+
+
+def test_collision_cache_copy_keeps_ball_index():
+    cache = CollisionCache.create()
+    cache.set_time(EventType.BALL_BALL, ("1", "2"), 1.0)
+
+    copy = cache.copy()
+    copy.invalidate(ball_ball_collision(Ball.dummy("2"), Ball.dummy("3"), time=0.0))
+
+    assert copy.times[EventType.BALL_BALL] == {}
+    assert cache.times[EventType.BALL_BALL] == {("1", "2"): 1.0}
@@ -0,0 +1,102 @@
+import attrs
+import numpy as np
+import pytest
+
+from pooltool.evolution.event_based.context import SimulationContext
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.objects import Table, TableType
+from pooltool.physics.engine import PhysicsEngine
+from pooltool.system import System
+
+
+def test_context_matches_table():
+    table = Table.default()
+    context = SimulationContext.create(table)
+
+    linear = list(table.cushion_segments.linear.values())
+    assert context.linear.ids == tuple(cushion.id for cushion in linear)
+    for row, cushion in zip(context.linear.rows, linear):
+        cushion_id, lx, ly, l0, p1, p2, direction = row
+        assert cushion_id == cushion.id
+        assert (lx, ly, l0, direction) == (
+            cushion.lx,
+            cushion.ly,
+            cushion.l0,
+            cushion.direction,
+        )
+        np.testing.assert_array_equal(p1, cushion.p1)
+        np.testing.assert_array_equal(p2, cushion.p2)
+
+    circular = list(table.cushion_segments.circular.values())
+    assert context.circular.rows == [
+        (cushion.id, cushion.a, cushion.b, cushion.radius) for cushion in circular
+    ]
+
+    pockets = list(table.pockets.values())
+    assert context.pockets.rows == [
+        (pocket.id, pocket.a, pocket.b, pocket.radius) for pocket in pockets
+    ]
+
+
+def test_context_arrays_are_read_only():
+    context = SimulationContext.create(Table.default())
+
+    with pytest.raises(ValueError):
+        context.linear.lx[0] = 0.0
+
+    with pytest.raises(ValueError):
+        context.pockets.a[0] = 0.0
+
+
+def test_context_is_reusable():
+    system = System.example()
+    engine = PhysicsEngine()
+    context = SimulationContext.create(system.table, engine)
+
+    # Pocketing balls modifies the pockets of the simulated system's table, but not
+    # the context's
+    for phi in np.linspace(0, 360, 8, endpoint=False):
+        system.strike(V0=3, phi=phi)
+        assert simulate(system, engine=engine) == simulate(system, context=context)
+
+    assert context.table == System.example().table
+
+
+def test_context_engine_is_default():
+    engine = PhysicsEngine()
+    context = SimulationContext.create(Table.default(), engine)
+    assert context.engine is engine
+
+    context = SimulationContext.create(Table.default())
+    assert context.engine == PhysicsEngine()
+
+
+def test_context_must_match_table():
+    system = System.example()
+    system.strike(V0=3, phi=60)
+
+    snooker = SimulationContext.create(Table.default(TableType.SNOOKER))
+    with pytest.raises(ValueError, match="linear cushion segments"):
+        simulate(system, context=snooker)
+
+    # A replaced segment isn't accepted either
+    context = SimulationContext.create(system.table)
+    segment = system.table.cushion_segments.linear["3"]
+    system.table.cushion_segments.linear["3"] = attrs.evolve(
+        segment, p1=segment.p1 + [0.01, 0, 0]
+    )
+    with pytest.raises(ValueError):
+        simulate(system, context=context)
+
+
+def test_context_accepts_equal_tables():
+    system = System.example()
+    system.strike(V0=3, phi=60)
+    expected = simulate(system)
+
+    # An equal table, and the table of a system with pocketed balls
+    for context in (
+        SimulationContext.create(Table.default()),
+        SimulationContext.create(expected.table),
+    ):
+        assert simulate(system, context=context) == expected
@@ -0,0 +1,83 @@
+import pytest
+
+from pooltool.evolution.event_based.parallel import SimulationPool, simulate_many
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.system import System
+
+
+def _systems(n: int) -> list[System]:
+    systems = []
+    for i in range(n):
+        system = System.example()
+        system.strike(phi=90 + 7 * i)
+        systems.append(system)
+    return systems
+
+
+def _assert_same_simulation(a: System, b: System) -> None:
+    assert len(a.events) == len(b.events)
+    for event_a, event_b in zip(a.events, b.events):
+        assert event_a.event_type == event_b.event_type
+        assert event_a.ids == event_b.ids
+        assert event_a.time == event_b.time
+
+    for ball_id in a.balls:
+        assert a.balls[ball_id].state == b.balls[ball_id].state
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_simulate_many_matches_simulate(workers: int):
+    systems = _systems(6)
+    expected = [simulate(system) for system in systems]
+
+    results = list(simulate_many(systems, workers=workers, chunksize=2))
+
+    # Results are returned in order and agree with serial simulation
+    assert len(results) == len(expected)
+    for result, reference in zip(results, expected):
+        _assert_same_simulation(result, reference)
+
+    # The passed systems are not modified
+    assert not any(system.simulated for system in systems)
+
+
+def test_simulate_many_forwards_options():
+    systems = _systems(3)
+
+    kwargs = dict(continuous=True, t_final=0.5, max_events=4)
+    expected = [simulate(system, **kwargs) for system in systems]
+    results = list(simulate_many(systems, workers=2, **kwargs))
+
+    for result, reference in zip(results, expected):
+        assert result.continuized
+        _assert_same_simulation(result, reference)
+
+
+def test_simulation_pool_reuse():
+    systems = _systems(4)
+    expected = [simulate(system) for system in systems]
+
+    with SimulationPool(workers=2) as pool:
+        first = pool.map(systems)
+        second = list(simulate_many(systems, pool=pool))
+
+    for a, b, reference in zip(first, second, expected):
+        _assert_same_simulation(a, reference)
+        _assert_same_simulation(b, reference)
+
+
+def test_simulation_pool_submit():
+    systems = _systems(3)
+    expected = [simulate(system, t_final=0.5) for system in systems]
+
+    with SimulationPool(workers=2) as pool:
+        futures = [pool.submit(system, t_final=0.5) for system in systems]
+        results = [future.result() for future in futures]
+
+    for result, reference in zip(results, expected):
+        _assert_same_simulation(result, reference)
+
+
+def test_simulation_pool_invalid_workers():
+    with pytest.raises(ValueError):
+        SimulationPool(workers=0)
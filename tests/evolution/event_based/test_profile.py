@@ -0,0 +1,112 @@
+import math
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from pooltool.events import EventType
+from pooltool.evolution.event_based.profile import SimulationProfile
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.game.datatypes import GameType
+
+
+def _event_keys(system) -> list[tuple]:
+    return [(event.event_type, event.ids, event.time) for event in system.events]
+
+
+def test_profiling_does_not_change_results(break_shot, variant):
+    system = break_shot(GameType.NINEBALL, seed=1)
+
+    profile = SimulationProfile()
+    profiled = simulate(system, profile=profile, **variant)
+    unprofiled = simulate(system, **variant)
+
+    assert _event_keys(profiled) == _event_keys(unprofiled)
+    assert profile.simulations == 1
+
+
+def test_profile_contents(break_shot):
+    system = break_shot(GameType.NINEBALL, seed=1)
+
+    profile = SimulationProfile()
+    simulated = simulate(system, profile=profile)
+
+    # Every resolved event is counted under its type (the final null event is recorded,
+    # but never resolved)
+    counts = Counter(event.event_type for event in simulated.events[1:-1])
+    assert profile.events == dict(counts)
+    assert set(profile.resolve) == set(counts)
+
+    assert {
+        EventType.STICK_BALL,
+        EventType.NONE,
+        EventType.BALL_BALL,
+        EventType.BALL_LINEAR_CUSHION,
+        EventType.BALL_CIRCULAR_CUSHION,
+        EventType.BALL_POCKET,
+    } <= set(profile.detect)
+
+    for duration in [*profile.detect.values(), *profile.resolve.values()]:
+        assert duration > 0
+    for phase in ("evolve", "history", "cache_update", "broadphase"):
+        assert getattr(profile, phase) > 0
+
+    assert 0 < profile.accounted <= profile.total
+
+
+def test_cache_hits_and_misses(break_shot):
+    system = break_shot(GameType.NINEBALL, seed=1)
+
+    profile = SimulationProfile()
+    simulated = simulate(system, profile=profile)
+
+    # Each detection looks up every ball pair, and is either a hit or a miss
+    num_pairs = len(list(combinations(system.balls, 2)))
+    num_detections = len(simulated.events) - 1
+    lookups = profile.hits[EventType.BALL_BALL] + profile.misses[EventType.BALL_BALL]
+    assert lookups == num_pairs * num_detections
+
+    # The first detection is all misses, and afterwards most lookups are hits
+    assert profile.misses[EventType.BALL_BALL] >= num_pairs
+    assert profile.hit_rate(EventType.BALL_BALL) > 0.5
+    assert math.isnan(profile.hit_rate(EventType.NONE))
+
+
+def test_profile_accumulates(break_shot):
+    system = break_shot(GameType.NINEBALL, seed=1)
+
+    profile = SimulationProfile()
+    simulate(system, profile=profile)
+    once = profile.events.copy()
+    simulate(system, profile=profile)
+
+    assert profile.simulations == 2
+    assert profile.events == {key: 2 * count for key, count in once.items()}
+
+
+def test_merge(break_shot):
+    system = break_shot(GameType.NINEBALL, seed=1)
+
+    first, second = SimulationProfile(), SimulationProfile()
+    simulate(system, profile=first)
+    simulate(system, profile=second)
+
+    total = first.total + second.total
+    first.merge(second)
+
+    assert first.simulations == 2
+    assert first.total == pytest.approx(total)
+    assert first.events == {key: 2 * count for key, count in second.events.items()}
+
+
+def test_report(break_shot):
+    profile = SimulationProfile()
+    simulate(break_shot(GameType.NINEBALL, seed=1), profile=profile)
+
+    data = profile.as_dict()
+    assert data["events"]["ball_ball"] == profile.events[EventType.BALL_BALL]
+    assert all(isinstance(key, str) for key in data["detect"])
+
+    report = profile.report()
+    assert report.startswith("1 simulation(s)")
+    assert "resolve ball_ball" in report
@@ -1,3 +1,5 @@
+from itertools import combinations
+
 import numpy as np
 import pytest
 from numpy.typing import NDArray
@@ -5,14 +7,20 @@ from numpy.typing import NDArray
 import pooltool.constants as const
 import pooltool.ptmath as ptmath
 from pooltool.events import EventType, ball_ball_collision, ball_pocket_collision
+from pooltool.evolution.event_based.arrays import ball_params_matrix
 from pooltool.evolution.event_based.cache import CollisionCache
+from pooltool.evolution.event_based.config import RecordMode
 from pooltool.evolution.event_based.simulate import (
     _system_has_energy,
     get_next_ball_ball_collision,
     get_next_event,
     simulate,
 )
-from pooltool.evolution.event_based.solve import ball_ball_collision_time
+from pooltool.evolution.event_based.solve import (
+    ball_ball_collision_time,
+    ball_ball_collision_times,
+)
+from pooltool.game.datatypes import GameType
 from pooltool.objects import Ball, BilliardTableSpecs, Cue, Table
 from pooltool.ptmath.roots import quadratic
 from pooltool.system import System
@@ -450,6 +458,56 @@ def test_no_ball_ball_collisions_for_intersecting_balls():
     assert get_next_ball_ball_collision(system, CollisionCache()).time == np.inf
 
 
+@pytest.mark.parametrize("case", ["case1", "case2", "case3", "case4"])
+def test_ball_ball_collision_times_matches_scalar(case: str):
+    """The batched solver agrees with ball_ball_collision_time for each pair"""
+    shot = System.load(TEST_DIR / f"{case}.msgpack")
+    balls = list(shot.balls.values())
+    pairs = list(combinations(range(len(balls)), 2))
+
+    times = ball_ball_collision_times(
+        rvws=np.array([ball.state.rvw for ball in balls]),
+        ss=np.array([ball.state.s for ball in balls], dtype=np.int64),
+        params=ball_params_matrix(balls),
+        idx1=np.array([i for i, _ in pairs], dtype=np.int64),
+        idx2=np.array([j for _, j in pairs], dtype=np.int64),
+    )
+
+    for (i, j), time in zip(pairs, times):
+        ball1, ball2 = balls[i], balls[j]
+
+        if (
+            ball1.state.s == const.pocketed
+            or ball2.state.s == const.pocketed
+            or (
+                ball1.state.s in const.nontranslating
+                and ball2.state.s in const.nontranslating
+            )
+            or ptmath.norm3d(ball1.state.rvw[0] - ball2.state.rvw[0])
+            < ball1.params.R + ball2.params.R
+        ):
+            assert time == np.inf
+            continue
+
+        assert time == ball_ball_collision_time(
+            rvw1=ball1.state.rvw,
+            rvw2=ball2.state.rvw,
+            s1=ball1.state.s,
+            s2=ball2.state.s,
+            mu1=(
+                ball1.params.u_s if ball1.state.s == const.sliding else ball1.params.u_r
+            ),
+            mu2=(
+                ball2.params.u_s if ball2.state.s == const.sliding else ball2.params.u_r
+            ),
+            m1=ball1.params.m,
+            m2=ball2.params.m,
+            g1=ball1.params.g,
+            g2=ball2.params.g,
+            R=ball1.params.R,
+        )
+
+
 def test_ball_history_immutability():
     """Test that ball positions in history are not modified by resolver operations
 
@@ -483,6 +541,53 @@ def test_ball_history_immutability():
     )
 
 
+@pytest.mark.parametrize("game_type", [GameType.NINEBALL, GameType.EIGHTBALL])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_variants_simulate_identically(break_shot, variant, game_type, seed):
+    system = break_shot(game_type, seed=seed)
+    assert simulate(system) == simulate(system, **variant)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(max_events=10),
+    ],
+)
+def test_record_modes_reach_the_same_outcome(break_shot, variant, kwargs):
+    kwargs = dict(**variant, **kwargs)
+
+    system = break_shot(GameType.NINEBALL, seed=1)
+    full = simulate(system, **kwargs)
+
+    events_only = simulate(system, record="events_only", **kwargs)
+    assert events_only.events == full.events
+
+    final_state = simulate(system, record=RecordMode.FINAL_STATE, **kwargs)
+    assert [
+        (event.event_type, event.ids, event.time) for event in final_state.events
+    ] == [(event.event_type, event.ids, event.time) for event in full.events]
+    for event in final_state.events:
+        for agent in event.agents:
+            assert agent.initial is None and agent.final is None
+
+    for result in (events_only, final_state):
+        assert result.t == full.t
+        for ball_id, ball in result.balls.items():
+            assert ball.state == full.balls[ball_id].state
+            assert ball.history.empty
+            assert ball.history_cts.empty
+
+
+def test_record_modes_need_histories_to_continuize():
+    with pytest.raises(ValueError):
+        simulate(System.example(), record="events_only", continuous=True)
+
+    with pytest.raises(ValueError):
+        simulate(System.example(), record="everything")
+
+
 def test_system_has_energy():
     system = System.example()
     assert not _system_has_energy(system)
@@ -0,0 +1,201 @@
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+import pooltool.constants as const
+from pooltool.evolution.event_based.solve import (
+    ball_ball_collision_coeffs,
+    ball_ball_collision_time,
+    ball_ball_relative_motion,
+    straight_line_collision_time,
+)
+from pooltool.ptmath.roots import quartic
+from pooltool.ptmath.roots.core import get_real_positive_smallest_root
+
+R = 0.028575
+U_S = 0.2
+U_R = 0.01
+G = 9.8
+
+
+def _rvw(
+    xy: tuple[float, float],
+    v: tuple[float, float] = (0.0, 0.0),
+    w: tuple[float, float, float] = (0.0, 0.0, 0.0),
+) -> NDArray[np.float64]:
+    return np.array([[*xy, R], [*v, 0.0], w], dtype=np.float64)
+
+
+def _rolling(xy: tuple[float, float], v: tuple[float, float]) -> NDArray[np.float64]:
+    return _rvw(xy, v, (-v[1] / R, v[0] / R, 0.0))
+
+
+def _args(rvw1, rvw2, s1, s2) -> tuple:
+    mu1 = U_S if s1 == const.sliding else U_R
+    mu2 = U_S if s2 == const.sliding else U_R
+    return (rvw1, rvw2, s1, s2, mu1, mu2, 0.17, 0.17, G, G, R)
+
+
+def _quartic_time(*args) -> float:
+    return get_real_positive_smallest_root(
+        quartic.solve(*ball_ball_collision_coeffs(*args))
+    )
+
+
+def _motion(rvw1, rvw2, s1, s2) -> tuple[float, ...]:
+    mu1 = U_S if s1 == const.sliding else U_R
+    mu2 = U_S if s2 == const.sliding else U_R
+    return ball_ball_relative_motion(rvw1, rvw2, s1, s2, mu1, mu2, G, G, R)
+
+
+STRAIGHT_CASES = {
+    "rolling vs stationary": (
+        _rolling((0.2, 0.3), (1.2, 0.9)),
+        _rvw((0.9, 0.8)),
+        const.rolling,
+        const.stationary,
+    ),
+    "stationary vs rolling": (
+        _rvw((0.9, 0.8)),
+        _rolling((0.2, 0.3), (1.2, 0.9)),
+        const.stationary,
+        const.rolling,
+    ),
+    "rolling vs spinning": (
+        _rolling((0.2, 0.3), (0.4, 1.5)),
+        _rvw((0.35, 0.9), w=(0.0, 0.0, 20.0)),
+        const.rolling,
+        const.spinning,
+    ),
+    "slow rolling vs stationary": (
+        _rolling((0.2, 0.3), (0.0, 0.2)),
+        _rvw((0.2, 0.42)),
+        const.rolling,
+        const.stationary,
+    ),
+    "draw shot vs stationary": (
+        _rvw((0.5, 0.2), (0.0, 2.0), (-150.0, 0.0, 0.0)),
+        _rvw((0.51, 1.4)),
+        const.sliding,
+        const.stationary,
+    ),
+    "stun shot vs stationary": (
+        _rvw((0.5, 0.2), (1.5, 0.0)),
+        _rvw((0.9, 0.23)),
+        const.sliding,
+        const.stationary,
+    ),
+    "rolling head-on": (
+        _rolling((0.2, 0.5), (1.0, 0.0)),
+        _rolling((1.5, 0.5), (-0.7, 0.0)),
+        const.rolling,
+        const.rolling,
+    ),
+}
+
+
+@pytest.mark.parametrize("case", STRAIGHT_CASES.keys())
+def test_straight_line_collision_time_matches_quartic(case: str):
+    rvw1, rvw2, s1, s2 = STRAIGHT_CASES[case]
+
+    time = straight_line_collision_time(*_motion(rvw1, rvw2, s1, s2), R)
+    assert not np.isnan(time)
+    assert 0 < time < np.inf
+
+    expected = _quartic_time(*_args(rvw1, rvw2, s1, s2))
+    assert time == pytest.approx(expected, rel=1e-9)
+    assert ball_ball_collision_time(*_args(rvw1, rvw2, s1, s2)) == time
+
+
+def test_straight_line_collision_time_matches_quartic_random():
+    """Rolling balls aimed near stationary balls, including misses"""
+    rng = np.random.default_rng(42)
+
+    num_hits = 0
+    for _ in range(2000):
+        xy1, xy2 = rng.uniform(0, 2, size=(2, 2))
+        if np.linalg.norm(xy2 - xy1) < 2 * R:
+            continue
+
+        phi = np.arctan2(*(xy2 - xy1)[::-1]) + rng.normal(0, 0.05)
+        speed = rng.uniform(0.05, 3)
+        rvw1 = _rolling(tuple(xy1), (speed * np.cos(phi), speed * np.sin(phi)))
+        rvw2 = _rvw(tuple(xy2))
+
+        args = _args(rvw1, rvw2, const.rolling, const.stationary)
+        time = ball_ball_collision_time(*args)
+        expected = _quartic_time(*args)
+
+        if expected == np.inf:
+            assert time == np.inf
+            continue
+
+        num_hits += 1
+        assert time == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+    # Both hits, and misses (by angle or by coming to rest first), are covered
+    assert 100 < num_hits < 1900
+
+
+def test_straight_line_collision_time_without_relative_acceleration():
+    """Balls rolling in the same direction with the same deceleration
+
+    The quartic degenerates (its leading coefficients are 0), but the closed form is
+    just distance over speed.
+    """
+    rvw1 = _rolling((0.2, 0.5), (2.0, 0.0))
+    rvw2 = _rolling((0.5, 0.5), (0.5, 0.0))
+
+    expected = (0.3 - 2 * R) / 1.5
+    time = ball_ball_collision_time(*_args(rvw1, rvw2, const.rolling, const.rolling))
+    assert time == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    "rvw2",
+    [
+        # Behind
+        _rvw((0.1, 0.3)),
+        # Wide
+        _rvw((0.5, 0.4)),
+        # Out of reach, since ball 1 comes to rest first
+        _rvw((1.0, 0.31)),
+    ],
+)
+def test_straight_line_no_collision(rvw2: NDArray[np.float64]):
+    """Unlike the quartic, this excludes collisions after ball 1 would come to rest
+
+    Past that time, the quartic's trajectory reverses, so it may find a collision with a
+    ball behind (which is irrelevant, since the rolling-stationary transition comes
+    first).
+    """
+    rvw1 = _rolling((0.2, 0.3), (0.3, 0.0))
+    args = _args(rvw1, rvw2, const.rolling, const.stationary)
+
+    assert ball_ball_collision_time(*args) == np.inf
+
+
+@pytest.mark.parametrize(
+    "rvw1, rvw2, s1, s2",
+    [
+        # Sliding with sideways slip curves
+        (
+            _rvw((0.5, 0.2), (0.0, 2.0), (-50.0, 40.0, 0.0)),
+            _rvw((0.6, 1.4)),
+            const.sliding,
+            const.stationary,
+        ),
+        # Rolling along different lines
+        (
+            _rolling((0.2, 0.2), (1.0, 1.0)),
+            _rolling((1.2, 0.2), (-0.5, 1.2)),
+            const.rolling,
+            const.rolling,
+        ),
+    ],
+)
+def test_curved_relative_motion_falls_back_to_quartic(rvw1, rvw2, s1, s2):
+    assert np.isnan(straight_line_collision_time(*_motion(rvw1, rvw2, s1, s2), R))
+    assert ball_ball_collision_time(*_args(rvw1, rvw2, s1, s2)) == _quartic_time(
+        *_args(rvw1, rvw2, s1, s2)
+    )
@@ -0,0 +1,128 @@
+import pickle
+
+import numpy as np
+
+from pooltool.events import EventType
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.evolution.event_based.stop import (
+    AnyOf,
+    BallPocketed,
+    CueBallScratched,
+    FirstBallBallCollision,
+)
+from pooltool.game.datatypes import GameType
+from pooltool.objects import Ball, Cue, Table
+from pooltool.system import System
+
+
+def _straight_in(follow: bool) -> System:
+    """The 1 ball is shot straight into the left-bottom pocket
+
+    With follow, the cue ball follows it in.
+    """
+    table = Table.default()
+    pocket = table.pockets["lb"]
+
+    cue_xy = np.array([table.w / 2, table.l / 2])
+    direction = np.array([pocket.a, pocket.b]) - cue_xy
+
+    system = System(
+        cue=Cue(cue_ball_id="cue"),
+        table=table,
+        balls={
+            "cue": Ball.create("cue", xy=cue_xy),
+            "1": Ball.create("1", xy=cue_xy + direction / 2),
+            "2": Ball.create("2", xy=(table.w / 2, 3 * table.l / 4)),
+        },
+    )
+    system.strike(
+        V0=3 if follow else 2,
+        b=0.3 if follow else 0.0,
+        phi=np.degrees(np.arctan2(direction[1], direction[0])),
+    )
+    return system
+
+
+def _event_keys(system: System) -> list[tuple]:
+    return [(event.event_type, event.ids, event.time) for event in system.events]
+
+
+def test_first_ball_ball_collision(break_shot, variant):
+    system = break_shot(GameType.NINEBALL, seed=1)
+    full = simulate(system)
+
+    stopped = simulate(system, stop_when=FirstBallBallCollision(), **variant)
+
+    assert stopped.events[-1].event_type == EventType.BALL_BALL
+    assert sum(e.event_type == EventType.BALL_BALL for e in stopped.events) == 1
+    assert _event_keys(stopped) == _event_keys(full)[: len(stopped.events)]
+
+    # Balls are left in motion, and each history ends at the stopping event
+    assert any(ball.state.s != 0 for ball in stopped.balls.values())
+    for ball in stopped.balls.values():
+        assert len(ball.history) == len(stopped.events)
+
+
+def test_first_ball_ball_collision_of_ball(break_shot):
+    system = break_shot(GameType.NINEBALL, seed=1)
+    full = simulate(system)
+
+    ball_id = next(
+        event.ids[1]
+        for event in reversed(full.events)
+        if event.event_type == EventType.BALL_BALL
+    )
+    stopped = simulate(system, stop_when=FirstBallBallCollision(ball_id))
+
+    expected = next(
+        idx
+        for idx, event in enumerate(full.events)
+        if event.event_type == EventType.BALL_BALL and ball_id in event.ids
+    )
+    assert len(stopped.events) == expected + 1
+
+
+def test_ball_pocketed():
+    system = _straight_in(follow=True)
+    full = simulate(system)
+
+    stopped = simulate(system, stop_when=BallPocketed("1"))
+
+    assert stopped.events[-1].event_type == EventType.BALL_POCKET
+    assert stopped.events[-1].ids == ("1", "lb")
+    assert len(stopped.events) < len(full.events)
+
+    # A ball that isn't pocketed doesn't stop the simulation
+    assert _event_keys(simulate(system, stop_when=BallPocketed("2"))) == _event_keys(
+        full
+    )
+
+
+def test_cue_ball_scratched():
+    stopped = simulate(_straight_in(follow=True), stop_when=CueBallScratched())
+    assert stopped.events[-1].event_type == EventType.BALL_POCKET
+    assert stopped.events[-1].ids == ("cue", "lb")
+
+    # Pocketing an object ball is not a scratch
+    system = _straight_in(follow=False)
+    assert _event_keys(simulate(system, stop_when=CueBallScratched())) == _event_keys(
+        simulate(system)
+    )
+
+
+def test_any_of():
+    system = _straight_in(follow=True)
+
+    condition = AnyOf([CueBallScratched(), FirstBallBallCollision()])
+    stopped = simulate(system, stop_when=condition)
+    assert stopped.events[-1].event_type == EventType.BALL_BALL
+
+    # The 1 ball is pocketed before the cue ball
+    condition = AnyOf([CueBallScratched(), BallPocketed("1")])
+    stopped = simulate(system, stop_when=condition)
+    assert stopped.events[-1].ids == ("1", "lb")
+
+
+def test_conditions_are_picklable():
+    condition = AnyOf([FirstBallBallCollision("cue"), CueBallScratched()])
+    assert pickle.loads(pickle.dumps(condition)) == condition
@@ -0,0 +1,57 @@
+import importlib
+import pkgutil
+
+from click.testing import CliRunner
+from numba.core.registry import CPUDispatcher
+
+import pooltool.physics.evolve
+import pooltool.ptmath
+from pooltool.evolution.event_based.config import _Strategy
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.evolution.event_based.warmup import run, warmup
+from pooltool.system.datatypes import System
+
+
+def _kernels() -> list[CPUDispatcher]:
+    names = ["pooltool.evolution.event_based.solve"]
+    for package in (pooltool.ptmath, pooltool.physics.evolve):
+        names.append(package.__name__)
+        names.extend(
+            info.name
+            for info in pkgutil.walk_packages(package.__path__, package.__name__ + ".")
+        )
+
+    kernels = []
+    for name in names:
+        module = importlib.import_module(name)
+        kernels.extend(
+            obj
+            for obj in vars(module).values()
+            if isinstance(obj, CPUDispatcher) and obj.__module__ == name
+        )
+    return kernels
+
+
+def test_nothing_compiled_after_warmup():
+    warmup()
+
+    kernels = _kernels()
+    assert kernels
+    signatures = [len(kernel.signatures) for kernel in kernels]
+
+    for kwargs in (
+        dict(),
+        dict(continuous=True),
+        dict(_strategy=_Strategy(broadphase=False)),
+    ):
+        shot = System.example()
+        shot.strike(V0=3, phi=80, a=-0.2, b=0.4)
+        simulate(shot, inplace=True, **kwargs)
+
+    assert [len(kernel.signatures) for kernel in kernels] == signatures
+
+
+def test_run():
+    result = CliRunner().invoke(run)
+    assert result.exit_code == 0
+    assert result.output.startswith("Warmed up in")
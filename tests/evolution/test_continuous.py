@@ -1,8 +1,19 @@
 import numpy as np
 import pytest
 
-from pooltool.evolution.continuous import continuize, interpolate_ball_states
+import pooltool.constants as const
+from pooltool.events import filter_ball
+from pooltool.evolution.continuous import (
+    _evolve_timepoints,
+    continuize,
+    interpolate_ball_states,
+    interpolate_ball_states_array,
+    interpolate_system_states_array,
+)
 from pooltool.evolution.event_based.simulate import simulate
+from pooltool.game.datatypes import GameType
+from pooltool.objects import Ball, BallHistory, BallState
+from pooltool.physics.evolve import evolve_ball_motion
 from pooltool.system import System
 
 
@@ -35,6 +46,117 @@ def test_continuize_inplace():
     assert continuized_system is system
 
 
+def _continuize_stepwise(system: System, dt: float) -> dict[str, BallHistory]:
+    """Continuize by evolving each ball one timestep at a time"""
+    num_timestamps = int(system.events[-1].time // dt) + 1
+    histories = {}
+
+    for ball in system.balls.values():
+        history = BallHistory()
+        history.add(ball.history[0])
+
+        rvw, s = ball.history[0].rvw, ball.history[0].s
+        events = filter_ball(system.events, ball.id, keep_nonevent=True)
+        count = 0
+        elapsed = 0.0
+
+        for _ in range(num_timestamps - 1):
+            if events[count + 1].time - elapsed > dt:
+                evolve_time = dt
+            else:
+                while True:
+                    count += 1
+                    if events[count + 1].time - elapsed > dt:
+                        break
+
+                state = events[count].get_ball(ball.id, initial=False).state
+                rvw, s = state.rvw, state.s
+                evolve_time = elapsed + dt - events[count].time
+
+            p = ball.params
+            rvw, s = evolve_ball_motion(
+                s, rvw, p.R, p.m, p.u_s, p.u_sp, p.u_r, p.g, evolve_time
+            )
+            history.add(BallState(rvw, s, elapsed + dt))
+            elapsed += dt
+
+        history.add(ball.history[-1])
+        histories[ball.id] = history
+
+    return histories
+
+
+@pytest.mark.parametrize("game_type", [GameType.NINEBALL, GameType.EIGHTBALL])
+@pytest.mark.parametrize("dt", [0.01, 0.0037])
+def test_continuize_matches_stepwise_evolution(
+    break_shot, game_type: GameType, dt: float
+):
+    system = simulate(break_shot(game_type, seed=1))
+
+    expected = _continuize_stepwise(system, dt)
+    continuized = continuize(system, dt=dt)
+
+    for ball_id, ball in continuized.balls.items():
+        rvws, ss, ts = ball.history_cts.vectorize()
+        expected_rvws, expected_ss, expected_ts = expected[ball_id].vectorize()
+
+        # Each timepoint is evolved directly from the last event rather than from the
+        # previous timepoint, so the kinematic states agree up to round-off
+        np.testing.assert_array_equal(ts, expected_ts)
+        np.testing.assert_array_equal(ss, expected_ss)
+        np.testing.assert_allclose(rvws, expected_rvws, rtol=1e-12, atol=1e-12)
+
+
+def test_evolve_timepoints_last_event_on_a_timepoint():
+    # The events, and so the last timepoint, fall exactly on multiples of dt
+    ball = Ball.create("cue", xy=(0.5, 0.5))
+    ball.state.rvw[1] = [1.0, 0.5, 0.0]
+    ball.state.s = const.sliding
+    params = ball.params
+
+    event_times = np.array([0.0, 0.5, 1.0])
+    dt = 0.25
+    num_timepoints = int(event_times[-1] // dt)
+
+    rvws = np.empty((num_timepoints, 3, 3), dtype=np.float64)
+    ss = np.empty(num_timepoints, dtype=np.int64)
+    ts = np.empty(num_timepoints, dtype=np.float64)
+
+    elapsed = _evolve_timepoints(
+        event_times,
+        np.zeros(3),
+        np.array([ball.state.rvw] * 3),
+        np.array([ball.state.s] * 3, dtype=np.int64),
+        params.R,
+        params.m,
+        params.u_s,
+        params.u_sp,
+        params.u_r,
+        params.g,
+        dt,
+        rvws,
+        ss,
+        ts,
+    )
+
+    assert elapsed == event_times[-1]
+    np.testing.assert_array_equal(ts, [0.25, 0.5, 0.75, 1.0])
+    for rvw, s, t in zip(rvws, ss, ts):
+        expected_rvw, expected_s = evolve_ball_motion(
+            ball.state.s,
+            ball.state.rvw,
+            params.R,
+            params.m,
+            params.u_s,
+            params.u_sp,
+            params.u_r,
+            params.g,
+            t,
+        )
+        np.testing.assert_array_equal(rvw, expected_rvw)
+        assert s == expected_s
+
+
 def test_interpolate_ball_states_exact_match():
     """Test interpolation at exact timestamps from history."""
     # Simulate and continuize a system
@@ -110,3 +232,58 @@ def test_interpolate_ball_states_empty_history():
     # Should raise error
     with pytest.raises(ValueError, match="Cannot interpolate from empty history"):
         interpolate_ball_states(ball, [0.5])
+
+
+@pytest.mark.parametrize("game_type", [GameType.NINEBALL, GameType.EIGHTBALL])
+def test_interpolate_ball_states_array(break_shot, game_type: GameType):
+    system = simulate(break_shot(game_type, seed=1))
+
+    # Timestamps before, after, at, and between events
+    event_times = np.array([event.time for event in system.events])
+    timestamps = np.sort(
+        np.concatenate(
+            [
+                [-1.0, system.t + 1.0],
+                event_times,
+                np.linspace(0, system.t, 200),
+            ]
+        )
+    )
+
+    states = interpolate_system_states_array(system, timestamps, extrapolate=True)
+    assert list(states) == list(system.balls)
+
+    for ball_id, ball in system.balls.items():
+        rvws, ss = interpolate_ball_states_array(ball, timestamps, extrapolate=True)
+        assert rvws.shape == (len(timestamps), 3, 3)
+        assert ss.dtype == np.int64
+
+        expected = interpolate_ball_states(ball, timestamps, extrapolate=True)
+        np.testing.assert_array_equal(rvws, [state.rvw for state in expected])
+        np.testing.assert_array_equal(ss, [state.s for state in expected])
+
+        np.testing.assert_array_equal(states[ball_id][0], rvws)
+        np.testing.assert_array_equal(states[ball_id][1], ss)
+
+    # Timestamps don't have to be sorted
+    ball = system.balls["cue"]
+    rvws, _ = interpolate_ball_states_array(ball, timestamps, extrapolate=True)
+    shuffled, _ = interpolate_ball_states_array(
+        ball, timestamps[::-1], extrapolate=True
+    )
+    np.testing.assert_array_equal(shuffled, rvws[::-1])
+
+
+def test_interpolate_ball_states_array_errors():
+    system = System.example()
+
+    with pytest.raises(ValueError, match="Cannot interpolate from empty history"):
+        interpolate_ball_states_array(system.balls["cue"], [0.5])
+
+    ball = simulate(system).balls["cue"]
+    with pytest.raises(ValueError):
+        interpolate_ball_states_array(ball, [0.0, ball.history[-1].t + 1.0])
+
+    rvws, ss = interpolate_ball_states_array(ball, [])
+    assert rvws.shape == (0, 3, 3)
+    assert ss.shape == (0,)
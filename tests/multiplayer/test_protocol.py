@@ -0,0 +1,187 @@
+import asyncio
+import json
+
+import msgpack
+import pytest
+
+import pooltool.constants as const
+from pooltool.multiplayer.protocol import (
+    FRAME_HEADER,
+    FRAME_MAGIC,
+    MAX_FRAME_SIZE,
+    BallStateDecoder,
+    BallStateEncoder,
+    Encoding,
+    GameMessage,
+    MessageCodec,
+    MessageType,
+    ProtocolError,
+    serialize_ball_states,
+)
+from pooltool.objects import Ball
+
+
+def _positions(shift: float = 0.0) -> dict[str, tuple[float, float, float]]:
+    return {
+        str(i): (0.1 * i + shift if i == 1 else 0.1 * i, 0.5 + 1e-9 * i, 0.028575)
+        for i in range(16)
+    }
+
+
+def _states() -> dict[str, str]:
+    return {str(i): "stationary" for i in range(16)}
+
+
+def _result(positions, states) -> GameMessage:
+    return GameMessage(
+        msg_type=MessageType.SHOT_RESULT,
+        sender_id="player",
+        data={
+            "ball_positions": positions,
+            "ball_states": states,
+            "score": {"player": 1},
+            "next_player_id": "other",
+        },
+        timestamp=1.5,
+    )
+
+
+def _read(codec: MessageCodec, data: bytes) -> list[GameMessage]:
+    async def read_all() -> list[GameMessage]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+
+        messages = []
+        while (message := await codec.read(reader)) is not None:
+            messages.append(message)
+        return messages
+
+    return asyncio.run(read_all())
+
+
+def test_ball_state_deltas():
+    encoder, decoder = BallStateEncoder(), BallStateDecoder()
+
+    keyframe = encoder.encode(_positions(), _states())
+    assert keyframe[:2] == [1, 0]
+    assert len(keyframe[2]) == 16
+    assert decoder.decode(keyframe) == (_positions(), _states())
+
+    # Only the ball that moved is sent
+    states = _states() | {"3": "pocketed"}
+    delta = encoder.encode(_positions(0.2), states)
+    assert delta[:2] == [2, 1]
+    assert sorted(delta[2]) == [
+        ["1", list(_positions(0.2)["1"]), None],
+        ["3", None, "pocketed"],
+    ]
+    assert decoder.decode(delta) == (_positions(0.2), states)
+
+    # Nothing changed
+    assert encoder.encode(_positions(0.2), states) == [3, 2, []]
+
+    # Balls were removed, so a keyframe is sent
+    positions = _positions(0.2)
+    del positions["3"]
+    del states["3"]
+    keyframe = encoder.encode(positions, states)
+    assert keyframe[1] == 0
+    assert len(keyframe[2]) == 15
+
+
+def test_ball_state_unknown_baseline():
+    encoder, decoder = BallStateEncoder(), BallStateDecoder()
+    encoder.encode(_positions(), _states())
+
+    with pytest.raises(ProtocolError):
+        decoder.decode(encoder.encode(_positions(0.1), _states()))
+
+
+@pytest.mark.parametrize("encoding", list(Encoding))
+def test_round_trip(encoding: Encoding):
+    sender, receiver = MessageCodec(encoding=encoding), MessageCodec()
+
+    messages = [
+        _result(_positions(), _states()),
+        GameMessage(
+            msg_type=MessageType.SHOT_AIM,
+            sender_id="player",
+            data={"cue_state": {"phi": 90.25, "V0": 2.0, "cue_ball_id": "cue"}},
+            timestamp=2.0,
+        ),
+        _result(_positions(0.3), _states()),
+        GameMessage(
+            msg_type=MessageType.TURN_CHANGE,
+            sender_id="server",
+            data={
+                "next_player_id": "other",
+                "game_state": {
+                    "room_id": "room",
+                    "ball_positions": _positions(0.4),
+                    "ball_states": _states(),
+                },
+            },
+            timestamp=3.0,
+        ),
+    ]
+    expected = [GameMessage.from_json(message.to_json()) for message in messages]
+
+    data = b"".join(sender.encode(message) for message in messages)
+    received = _read(receiver, data)
+
+    for actual, message in zip(received, expected):
+        assert actual.msg_type == message.msg_type
+        assert actual.sender_id == message.sender_id
+        assert actual.timestamp == message.timestamp
+        assert json.loads(json.dumps(actual.data)) == message.data
+
+
+def test_binary_is_smaller():
+    json_codec, binary_codec = MessageCodec(), MessageCodec(encoding=Encoding.BINARY)
+
+    sizes = {Encoding.JSON: 0, Encoding.BINARY: 0}
+    for shift in (0.0, 0.1, 0.2):
+        message = _result(_positions(shift), _states())
+        sizes[Encoding.JSON] += len(json_codec.encode(message))
+        sizes[Encoding.BINARY] += len(binary_codec.encode(message))
+
+    assert sizes[Encoding.BINARY] < sizes[Encoding.JSON] / 2
+
+
+def test_encoding_leaves_data_untouched():
+    codec = MessageCodec(encoding=Encoding.BINARY)
+    message = _result(_positions(), _states())
+
+    codec.encode(message)
+    assert message.data["ball_positions"] == _positions()
+
+
+def test_unencodable_ball_positions():
+    """Ball positions that aren't coordinates are sent as they are"""
+    sender, receiver = MessageCodec(encoding=Encoding.BINARY), MessageCodec()
+    message = _result({"1": "nowhere"}, {"1": "stationary"})
+
+    (received,) = _read(receiver, sender.encode(message))
+    assert received.data["ball_positions"] == {"1": "nowhere"}
+
+
+def test_malformed_frames():
+    codec = MessageCodec()
+
+    payload = msgpack.packb(["not_a_message_type", "", 0.0, {}, None])
+    with pytest.raises(ProtocolError):
+        _read(codec, FRAME_HEADER.pack(FRAME_MAGIC, len(payload)) + payload)
+
+    with pytest.raises(ProtocolError):
+        _read(codec, FRAME_HEADER.pack(FRAME_MAGIC, MAX_FRAME_SIZE + 1))
+
+    # A truncated frame is the end of the stream
+    assert _read(codec, FRAME_HEADER.pack(FRAME_MAGIC, 10) + b"abc") == []
+
+
+def test_serialize_ball_states():
+    balls = {"cue": Ball.create("cue"), "1": Ball.create("1")}
+    balls["1"].state.s = const.pocketed
+
+    assert serialize_ball_states(balls) == {"cue": "stationary", "1": "pocketed"}
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+from pooltool.multiplayer.protocol import (
+    Encoding,
+    GameMessage,
+    MessageCodec,
+    MessageType,
+    RoomInfo,
+)
+from pooltool.multiplayer.server import (
+    MultiplayerServer,
+    OutboundMessage,
+    OutboundQueue,
+    SlowClientPolicy,
+)
+
+
+class _Client:
+    """A bare-bones client that talks to the server over a socket
+
+    Without any encodings, it behaves like a client that predates them: it only reads
+    newline-delimited JSON.
+    """
+
+    def __init__(self, reader, writer, legacy: bool):
+        self.reader = reader
+        self.writer = writer
+        self.legacy = legacy
+        self.codec = MessageCodec()
+
+    @classmethod
+    async def connect(cls, port: int, encodings: list[str] | None) -> _Client:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        client = cls(reader, writer, legacy=encodings is None)
+
+        data: dict[str, Any] = {"name": "test"}
+        if encodings is not None:
+            data["encodings"] = encodings
+        await client.send(MessageType.CONNECT, data)
+
+        response = await client.receive()
+        assert response.msg_type == MessageType.CONNECT
+        if response.data.get("encoding") == Encoding.BINARY.value:
+            client.codec.encoding = Encoding.BINARY
+
+        return client
+
+    async def send(self, msg_type: MessageType, data: dict[str, Any]) -> None:
+        message = GameMessage(msg_type, "", data, time.time())
+        self.writer.write(self.codec.encode(message))
+        await self.writer.drain()
+
+    async def receive(self) -> GameMessage:
+        if self.legacy:
+            line = await asyncio.wait_for(self.reader.readline(), timeout=5)
+            return GameMessage.from_json(line.decode().strip())
+
+        message = await asyncio.wait_for(self.codec.read(self.reader), timeout=5)
+        assert message is not None
+        return message
+
+    async def receive_until(self, msg_type: MessageType) -> GameMessage:
+        while (message := await self.receive()).msg_type != msg_type:
+            pass
+        return message
+
+
+def _serve(
+    test: Callable[[MultiplayerServer, int], Awaitable[None]], binary: bool = True
+) -> None:
+    async def run() -> None:
+        server = MultiplayerServer(host="127.0.0.1", port=0, binary=binary)
+        task = asyncio.create_task(server.start())
+        while server._server is None or not server._server.sockets:
+            await asyncio.sleep(0.01)
+
+        try:
+            await test(server, server._server.sockets[0].getsockname()[1])
+        finally:
+            await server.stop()
+            task.cancel()
+
+    asyncio.run(run())
+
+
+def test_negotiation():
+    async def test(server: MultiplayerServer, port: int) -> None:
+        old = await _Client.connect(port, encodings=None)
+        new = await _Client.connect(port, encodings=["binary", "json"])
+        json_only = await _Client.connect(port, encodings=["json"])
+
+        assert old.codec.encoding == Encoding.JSON
+        assert new.codec.encoding == Encoding.BINARY
+        assert json_only.codec.encoding == Encoding.JSON
+
+        await new.send(MessageType.PING, {"time": 1.0})
+        pong = await new.receive()
+        assert pong.msg_type == MessageType.PONG
+        assert pong.data["client_time"] == 1.0
+
+        await old.send(MessageType.PING, {"time": 2.0})
+        pong = await old.receive()
+        assert pong.data["client_time"] == 2.0
+
+        encodings = sorted(client.codec.encoding for client in server.clients.values())
+        assert encodings == [Encoding.BINARY, Encoding.JSON, Encoding.JSON]
+
+    _serve(test)
+
+
+def test_binary_disabled():
+    async def test(server: MultiplayerServer, port: int) -> None:
+        client = await _Client.connect(port, encodings=["binary", "json"])
+        assert client.codec.encoding == Encoding.JSON
+
+    _serve(test, binary=False)
+
+
+def test_mixed_room():
+    """Ball states reach JSON and binary clients alike"""
+
+    async def test(server: MultiplayerServer, port: int) -> None:
+        host = await _Client.connect(port, encodings=["binary", "json"])
+        guest = await _Client.connect(port, encodings=None)
+
+        await host.send(MessageType.CREATE_ROOM, {"room_name": "room"})
+        room = await host.receive_until(MessageType.CREATE_ROOM)
+        room_id = room.data["room"]["room_id"]
+
+        await guest.send(MessageType.JOIN_ROOM, {"room_id": room_id})
+        await guest.receive_until(MessageType.JOIN_ROOM)
+        await guest.send(MessageType.PLAYER_READY, {"is_ready": True})
+        await host.send(MessageType.GAME_START, {})
+        await host.receive_until(MessageType.GAME_START)
+        await guest.receive_until(MessageType.GAME_START)
+
+        guest_id = next(
+            client_id
+            for client_id, client in server.clients.items()
+            if client.codec.encoding == Encoding.JSON
+        )
+        for shot, x in enumerate((0.1, 0.2, 0.2)):
+            positions = {"cue": (x, 0.5, 0.028575), "1": (0.3, 0.7, 0.028575)}
+            states = {"cue": "stationary", "1": "stationary"}
+            await host.send(
+                MessageType.SHOT_RESULT,
+                {
+                    "ball_positions": positions,
+                    "ball_states": states,
+                    "score": {},
+                    "next_player_id": server.rooms[room_id].host_id,
+                },
+            )
+
+            for client in (host, guest):
+                turn = await client.receive_until(MessageType.TURN_CHANGE)
+                game_state = turn.data["game_state"]
+                assert game_state["shot_number"] == shot + 1
+                assert {
+                    ball_id: tuple(pos)
+                    for ball_id, pos in game_state["ball_positions"].items()
+                } == positions
+                assert game_state["ball_states"] == states
+
+        assert guest_id in server.clients
+
+    _serve(test)
+
+
+def _aim(sender_id: str = "host", phi: float = 0.0) -> OutboundMessage:
+    return OutboundMessage(
+        GameMessage(MessageType.SHOT_AIM, sender_id, {"phi": phi}, time.time())
+    )
+
+
+def _chat(text: str = "") -> OutboundMessage:
+    return OutboundMessage(
+        GameMessage(MessageType.CHAT_MESSAGE, "host", {"message": text}, time.time())
+    )
+
+
+def test_outbound_queue_drops_stale_aims():
+    queue = OutboundQueue(maxsize=3)
+
+    assert queue.put(_aim(phi=1))
+    assert queue.put(_chat())
+    assert queue.put(_aim("guest", phi=2))
+    assert queue.put(_aim(phi=3))
+
+    # The host's first aim update was superseded
+    assert len(queue) == 3
+    assert queue.dropped == 1
+
+    # To make room, the remaining aim updates are dropped
+    assert queue.put(_chat())
+    assert queue.put(_chat())
+    assert queue.dropped == 3
+    assert not queue.put(_aim(phi=4))
+    assert not queue.put(_chat())
+
+    async def drain() -> list[MessageType]:
+        return [(await queue.get()).message.msg_type for _ in range(len(queue))]
+
+    assert asyncio.run(drain()) == [MessageType.CHAT_MESSAGE] * 3
+
+
+def test_outbound_queue_keeps_aims():
+    queue = OutboundQueue(maxsize=2, drop_stale=False)
+
+    assert queue.put(_aim(phi=1))
+    assert queue.put(_aim(phi=2))
+    assert not queue.put(_aim(phi=3))
+    assert queue.dropped == 0
+
+
+class _Writer:
+    """A connection's writer, whose peer stops reading if it's stuck"""
+
+    def __init__(self, stuck: bool):
+        self.stuck = stuck
+        self.written: list[bytes] = []
+        self.aborted = False
+        self.transport = self
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+    async def drain(self) -> None:
+        if self.stuck:
+            await asyncio.Event().wait()
+
+    def abort(self) -> None:
+        self.aborted = True
+
+    def close(self) -> None:
+        pass
+
+    async def wait_closed(self) -> None:
+        pass
+
+    def get_extra_info(self, name: str) -> None:
+        return None
+
+
+async def _room(server: MultiplayerServer) -> tuple[_Writer, _Writer, str, str]:
+    """A room with a host whose connection is fine, and a guest that's stuck"""
+    host = _Writer(stuck=False)
+    guest = _Writer(stuck=True)
+
+    players = []
+    for writer in (host, guest):
+        client = server._add_client(asyncio.StreamReader(), writer)  # type: ignore
+        client.room_id = "room"
+        players.append(client.player_info)
+
+    server.rooms["room"] = RoomInfo("room", "room", players[0].player_id, players)
+    await asyncio.sleep(0)
+
+    return host, guest, players[0].player_id, players[1].player_id
+
+
+@pytest.mark.parametrize("policy", list(SlowClientPolicy))
+def test_slow_client(policy: SlowClientPolicy):
+    async def test() -> None:
+        server = MultiplayerServer(max_queue=4, slow_client_policy=policy)
+        host, guest, host_id, guest_id = await _room(server)
+
+        # The guest is sent aim updates that it never reads
+        for phi in range(20):
+            aim = GameMessage(MessageType.SHOT_AIM, "host", {"phi": phi}, time.time())
+            await server._broadcast_to_room("room", aim)
+            await asyncio.sleep(0)
+
+        if policy == SlowClientPolicy.DROP_STALE:
+            assert guest_id in server.clients
+            assert server.clients[guest_id].outbox.dropped > 0
+
+            # Messages that can't be dropped fill the guest's queue up
+            for _ in range(5):
+                chat = GameMessage(MessageType.CHAT_MESSAGE, "host", {}, time.time())
+                await server._broadcast_to_room("room", chat)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*server._disconnecting)
+        assert guest_id not in server.clients
+        assert guest.aborted
+
+        # Nothing held up the host, which was told that the guest left
+        while len(server.clients[host_id].outbox):
+            await asyncio.sleep(0)
+
+        msg_types = [
+            GameMessage.from_json(data.decode()).msg_type for data in host.written
+        ]
+        assert msg_types.count(MessageType.SHOT_AIM) == 20
+        assert MessageType.ROOM_UPDATE in msg_types
+
+        await server.stop()
+
+    asyncio.run(test())
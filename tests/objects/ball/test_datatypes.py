@@ -1,3 +1,5 @@
+import pickle
+
 import numpy as np
 import pytest
 from attrs.exceptions import FrozenInstanceError
@@ -142,8 +144,9 @@ def test_ball_history_copy():
     assert copy == history
 
     # Modifying original does not modify copy
-    history.states[0].t = 100
-    history.states[0].rvw[0] = [0, 0, 0]
+    rvws, _, ts = history.vectorize()
+    ts[0] = -1
+    rvws[0, 0] = [0, 0, 0]
     assert copy != history
 
 
@@ -160,18 +163,18 @@ def test_ball_history_add():
     history.add(state)
     assert not history.empty
 
-    # `add` appends the state directly, just list how lists append. So verify they are
-    # the same objects
-    assert history[0] is state
+    # `add` copies the state into the history
+    assert history[0] == state
+    assert history[0] is not state
 
-    # Therefore modifying the state modifies the history
+    # Therefore modifying the state doesn't modify the history
     state.t = 2
-    assert history[0] == state
+    assert history[0].t == 1
 
     # You can't add a state with a time less than the last entry
     with pytest.raises(AssertionError):
         new_state = state.copy()
-        new_state.t = 1
+        new_state.t = 0
         history.add(new_state)
 
     # Making time of state greater than the last entry works
@@ -180,6 +183,77 @@ def test_ball_history_add():
     assert len(history) == 2
 
 
+def test_ball_history_columnar():
+    history = BallHistory()
+
+    # Grow well past the initial capacity
+    for t in range(100):
+        state = BallState.default()
+        state.rvw[0] = [t, t, t]
+        state.s = t % 5
+        state.t = t
+        history.add(state)
+
+    assert len(history) == 100
+    assert history[-1].t == 99
+    assert [state.t for state in history[10:13]] == [10, 11, 12]
+
+    # Indexing creates independent states
+    state = history[3]
+    state.rvw[0] = [-1, -1, -1]
+    assert np.array_equal(history[3].rvw[0], [3, 3, 3])
+
+    # Setting an index overwrites the row
+    history[3] = state
+    assert history[3] == state
+
+    with pytest.raises(IndexError):
+        history[100]
+
+    # The states are a snapshot, which can't be mistaken for the history itself
+    states = history.states
+    assert states == tuple(history)
+    with pytest.raises(TypeError):
+        states[3] = BallState.default()  # type: ignore
+    with pytest.raises(AttributeError):
+        states.append(BallState.default())  # type: ignore
+
+    # Vectorizing returns views rather than copies
+    rvws, ss, ts = history.vectorize()
+    assert rvws.shape == (100, 3, 3)
+    assert np.shares_memory(rvws, history.vectorize()[0])
+    ss[0] = 2
+    assert history[0].s == 2
+
+    # Unless asked to copy, a history adopts the arrays it's made from
+    adopted = BallHistory.from_vectorization((rvws, ss, ts), copy=False)
+    assert np.shares_memory(adopted.vectorize()[0], rvws)
+    assert not np.shares_memory(
+        BallHistory.from_vectorization((rvws, ss, ts)).vectorize()[0], rvws
+    )
+
+    assert BallHistory.from_vectorization(None).empty
+
+
+def test_ball_history_round_trips():
+    history = BallHistory()
+    for t in range(20):
+        state = BallState.default()
+        state.rvw[1] = [t, 2 * t, 0]
+        state.s = t % 5
+        state.t = t / 10
+        history.add(state)
+
+    for fmt in [SerializeFormat.JSON, SerializeFormat.MSGPACK]:
+        c = conversion[fmt]
+        assert c.structure(c.unstructure(history), BallHistory) == history
+
+    # JSON keeps the format of a list of states
+    assert len(conversion[SerializeFormat.JSON].unstructure(history)["states"]) == 20
+
+    assert pickle.loads(pickle.dumps(history)) == history
+
+
 # ------ BallParams
 
 
@@ -2,7 +2,15 @@ import numpy as np
 import pytest
 
 import pooltool as pt
-from pooltool.physics.resolve.ball_ball.frictional_mathavan import _collide_balls
+from pooltool.constants import sliding, stationary
+from pooltool.objects import Ball
+from pooltool.physics.resolve.ball_ball.frictional_mathavan import (
+    FrictionalMathavan,
+    _collide_balls,
+)
+from pooltool.physics.resolve.ball_ball.frictional_mathavan.surrogate import (
+    FrictionalMathavanSurrogate,
+)
 
 DEG2RAD = np.pi / 180
 RAD2DEG = 180 / np.pi
@@ -73,3 +81,86 @@ def test_collide_balls(initial_conditions, expected):
     theta_j = abs(lambda_j - cut_angle)
     assert abs(theta_i - theta_i_ex) / abs(theta_i_ex) < 1e-2
     assert abs(theta_j - theta_j_ex) / abs(theta_j_ex) < 1e-2
+
+
+def _cut_shot(rng: np.random.Generator) -> tuple[Ball, Ball]:
+    """A moving ball 1 headed into a stationary ball 2"""
+    ball1 = Ball.create("1", xy=(0.5, 0.5))
+    R = ball1.params.R
+
+    direction = pt.ptmath.unit_vector(np.append(rng.normal(size=2), 0))
+    cut_angle = rng.uniform(-np.pi / 2, np.pi / 2) * 0.95
+    line_of_centers = pt.ptmath.coordinate_rotation(direction, cut_angle)
+    ball2 = Ball.create("2", xy=ball1.xyz[:2] + 2 * R * line_of_centers[:2])
+
+    speed = rng.uniform(0.2, 4)
+    ball1.state.rvw[1] = speed * direction
+    ball1.state.rvw[2] = rng.uniform(-1, 1, size=3) * speed / R
+    ball1.state.s = sliding
+    assert ball2.state.s == stationary
+
+    return ball1, ball2
+
+
+def _in_line_of_centers_frame(vector, ball1, ball2):
+    """The components of a vector across and along the line of centers, and along z"""
+    y = pt.ptmath.unit_vector(ball2.xyz - ball1.xyz)
+    return np.array([vector[0] * y[1] - vector[1] * y[0], vector @ y, vector[2]])
+
+
+def test_surrogate_within_tolerance(surrogate_dir):
+    model = FrictionalMathavanSurrogate()
+    exact = FrictionalMathavan()
+    rng = np.random.default_rng(42)
+
+    interpolated = 0
+    for _ in range(100):
+        ball1, ball2 = _cut_shot(rng)
+        speed = pt.ptmath.norm3d(ball1.state.rvw[1])
+
+        expected = exact.solve(ball1.copy(), ball2.copy())
+        result = model.solve(ball1.copy(), ball2.copy())
+
+        atol = model.tolerance * speed
+        for ball, ball_expected in zip(result, expected):
+            assert ball.state.s == sliding
+            for k, k_atol in [(1, atol), (2, atol / ball.params.R)]:
+                np.testing.assert_allclose(
+                    _in_line_of_centers_frame(ball.state.rvw[k], ball1, ball2),
+                    _in_line_of_centers_frame(ball_expected.state.rvw[k], ball1, ball2),
+                    rtol=0,
+                    atol=k_atol,
+                )
+        interpolated += not np.array_equal(result[0].state.rvw, expected[0].state.rvw)
+
+        # The order of the balls doesn't matter
+        swapped = model.solve(ball2.copy(), ball1.copy())
+        np.testing.assert_allclose(swapped[0].state.rvw, result[1].state.rvw)
+        np.testing.assert_allclose(swapped[1].state.rvw, result[0].state.rvw)
+
+    # Most collisions are interpolated, rather than resolved exactly
+    assert interpolated > 50
+    assert any(surrogate_dir.glob("frictional_mathavan-*.npz"))
+
+
+def test_surrogate_falls_back_to_exact_model(surrogate_dir):
+    model = FrictionalMathavanSurrogate(
+        tolerance=0.3, angle_points=9, spin_points=5, friction_points=3
+    )
+    exact = FrictionalMathavan()
+    ball1, ball2 = _cut_shot(np.random.default_rng(0))
+
+    # Both balls moving
+    moving = ball2.copy()
+    moving.state.rvw[1] = [0.1, 0.2, 0]
+    moving.state.s = sliding
+
+    # Too much spin for the table
+    spinning = ball1.copy()
+    spinning.state.rvw[2] *= 10
+
+    for ball1, ball2 in [(ball1, moving), (spinning, ball2)]:
+        expected = exact.solve(ball1.copy(), ball2.copy())
+        result = model.solve(ball1.copy(), ball2.copy())
+        for ball, ball_expected in zip(result, expected):
+            np.testing.assert_array_equal(ball.state.rvw, ball_expected.state.rvw)
@@ -0,0 +1,291 @@
+import math
+
+import numpy as np
+import pytest
+
+from pooltool import ptmath
+from pooltool.constants import sliding
+from pooltool.objects import Ball, BallParams, LinearCushionSegment, Table
+from pooltool.physics.resolve.ball_cushion.mathavan_2010.model import (
+    Mathavan2010Circular,
+    Mathavan2010Linear,
+    solve,
+    solve_adaptive,
+    solve_mathavan,
+)
+from pooltool.physics.resolve.ball_cushion.mathavan_2010.surrogate import (
+    Mathavan2010CircularSurrogate,
+    Mathavan2010LinearSurrogate,
+)
+
+
+def _solve_mathavan_reference(ball: Ball, cushion, max_steps: int, delta_p: float):
+    """The ball-cushion resolution, with the frame rotations done in python"""
+    rvw = ball.state.rvw
+
+    normal = cushion.get_normal_xy(rvw)
+    if np.dot(normal, rvw[1]) <= 0:
+        normal = -normal
+
+    angle_to_rotate = (math.pi / 2) - ptmath.angle(normal)
+    rvw_R = ptmath.coordinate_rotation(rvw.T, angle_to_rotate).T
+
+    rvw_R[1, 0], rvw_R[1, 1], rvw_R[2, 0], rvw_R[2, 1], rvw_R[2, 2] = solve(
+        ball.params.m,
+        ball.params.R,
+        cushion.height,
+        ball.params.e_c,
+        ball.params.u_s,
+        ball.params.f_c,
+        rvw_R[1, 0],
+        rvw_R[1, 1],
+        rvw_R[2, 0],
+        rvw_R[2, 1],
+        rvw_R[2, 2],
+        max_steps,
+        delta_p,
+    )
+
+    return ptmath.coordinate_rotation(rvw_R.T, -angle_to_rotate).T
+
+
+def _random_collisions(num: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    params = BallParams.default()
+
+    for _ in range(num):
+        speed = rng.uniform(0.2, 4)
+        alpha = rng.uniform(0.05, math.pi / 2)
+        yield (
+            speed * math.cos(alpha),
+            speed * math.sin(alpha),
+            *(rng.uniform(-1, 1, size=3) * speed / params.R),
+        )
+
+
+def test_solve_mathavan_matches_reference():
+    table = Table.default()
+    cushions = [
+        *table.cushion_segments.linear.values(),
+        *table.cushion_segments.circular.values(),
+    ]
+    rng = np.random.default_rng(42)
+
+    for cushion in cushions:
+        ball = Ball.create("cue", xy=rng.uniform(0, 1, size=2))
+        ball.state.rvw[1, :2] = rng.normal(size=2)
+        ball.state.rvw[2] = rng.normal(size=3) * 40
+
+        expected = _solve_mathavan_reference(ball, cushion, 1000, 0.001)
+        ball_after, _ = solve_mathavan(ball.copy(), cushion, 1000, 0.001)
+
+        np.testing.assert_array_equal(ball_after.state.rvw, expected)
+        assert ball_after.state.s == sliding
+
+
+def test_solve_adaptive_converges():
+    params = BallParams.default()
+    h = 0.64 * 2 * params.R
+    args = (params.m, params.R, h, params.e_c, params.u_s, params.f_c)
+
+    for velocities in _random_collisions(5):
+        # Small fixed steps are the reference
+        reference = np.array(solve(*args, *velocities, 10**7, 1e-6))
+        scale = math.hypot(*velocities[:2]) * np.array(
+            [1, 1, 1 / params.R, 1 / params.R, 1 / params.R]
+        )
+
+        default = np.array(solve(*args, *velocities, 1000, 0.001))
+        default_error = np.max(np.abs(default - reference) / scale)
+
+        errors = []
+        for rtol in (1e-3, 1e-4, 1e-5):
+            adaptive = np.array(solve_adaptive(*args, *velocities, rtol, 1000))
+            errors.append(np.max(np.abs(adaptive - reference) / scale))
+
+        assert errors[0] > errors[1] > errors[2]
+        assert errors[2] < 1e-3
+        assert errors[2] < default_error
+
+
+@pytest.mark.parametrize("model_cls", [Mathavan2010Linear, Mathavan2010Circular])
+def test_adaptive_model(model_cls):
+    table = Table.default()
+    if model_cls is Mathavan2010Linear:
+        cushion = table.cushion_segments.linear["3"]
+    else:
+        cushion = table.cushion_segments.circular["1t"]
+
+    ball = Ball.create("cue", xy=(0.5, 0.5))
+    ball.state.rvw[1] = [0.8, -1.5, 0]
+    ball.state.rvw[2] = [10, 5, 30]
+
+    fixed = model_cls().solve(ball.copy(), cushion)[0].state
+    adaptive = model_cls(adaptive=True).solve(ball.copy(), cushion)[0].state
+
+    # Both agree within the fixed step model's accuracy
+    speed = ptmath.norm3d(ball.state.rvw[1])
+    np.testing.assert_allclose(adaptive.rvw[1], fixed.rvw[1], rtol=0, atol=0.01 * speed)
+    np.testing.assert_allclose(
+        adaptive.rvw[2], fixed.rvw[2], rtol=0, atol=0.01 * speed / ball.params.R
+    )
+    assert ptmath.get_ball_energy(
+        adaptive.rvw, ball.params.R, ball.params.m
+    ) <= ptmath.get_ball_energy(ball.state.rvw, ball.params.R, ball.params.m)
+
+
+def test_solve_adaptive_no_approach():
+    params = BallParams.default()
+    # A ball moving away from the cushion is left untouched
+    velocities = (0.5, -1.0, 1.0, 2.0, 3.0)
+    assert (
+        solve_adaptive(
+            params.m,
+            params.R,
+            0.64 * 2 * params.R,
+            params.e_c,
+            params.u_s,
+            params.f_c,
+            *velocities,
+        )
+        == velocities
+    )
+
+
+# A coarse table, which is quick to build
+SURROGATE_KWARGS = dict(tolerance=0.3, angle_points=9, spin_points=7)
+
+
+# The largest difference between the adaptively integrated model, which the surrogates
+# tabulate, and the default fixed step integration, relative to the incoming speed
+ADAPTIVE_GAP = 0.025
+
+
+def _random_impacts(cushion, num):
+    rng = np.random.default_rng(42)
+    for _ in range(num):
+        ball = Ball.create("cue", xy=(0.5, 0.5))
+        speed = rng.uniform(0.2, 4)
+        ball.state.rvw[1, :2] = speed * ptmath.unit_vector_slow(rng.normal(size=2))
+        ball.state.rvw[2] = rng.uniform(-1, 1, size=3) * speed / ball.params.R
+
+        normal = cushion.get_normal_xy(ball.state.rvw)
+        if np.dot(normal, ball.state.rvw[1]) == 0:
+            continue
+
+        yield ball, speed, normal
+
+
+def _in_cushion_frame(vector, normal):
+    """The components of a vector along the normal, the tangent, and the z-axis"""
+    return np.array(
+        [vector @ normal, normal[0] * vector[1] - normal[1] * vector[0], vector[2]]
+    )
+
+
+def _assert_close(result, expected, normal, atol, R):
+    for k, k_atol in [(1, atol), (2, atol / R)]:
+        np.testing.assert_allclose(
+            _in_cushion_frame(result[k], normal),
+            _in_cushion_frame(expected[k], normal),
+            rtol=0,
+            atol=k_atol,
+        )
+
+
+def _cushion(model_cls):
+    table = Table.default()
+    if model_cls is Mathavan2010LinearSurrogate:
+        return table.cushion_segments.linear["3"]
+    return table.cushion_segments.circular["1t"]
+
+
+@pytest.mark.parametrize(
+    "model_cls,exact_cls",
+    [
+        (Mathavan2010LinearSurrogate, Mathavan2010Linear),
+        (Mathavan2010CircularSurrogate, Mathavan2010Circular),
+    ],
+)
+def test_surrogate_within_tolerance(surrogate_dir, model_cls, exact_cls):
+    cushion = _cushion(model_cls)
+    model = model_cls()
+    exact = exact_cls(adaptive=True, rtol=model.rtol, max_steps=model.max_steps)
+
+    interpolated = 0
+    for ball, speed, normal in _random_impacts(cushion, 100):
+        expected = exact.solve(ball.copy(), cushion)[0].state.rvw
+        result = model.solve(ball.copy(), cushion)[0].state
+
+        assert result.s == sliding
+        _assert_close(
+            result.rvw, expected, normal, model.tolerance * speed, ball.params.R
+        )
+        interpolated += not np.array_equal(result.rvw, expected)
+
+    # Most collisions are interpolated, rather than resolved exactly
+    assert interpolated > 50
+    assert any(surrogate_dir.glob("mathavan_2010-*.npz"))
+
+
+@pytest.mark.parametrize(
+    "model_cls,exact_cls",
+    [
+        (Mathavan2010LinearSurrogate, Mathavan2010Linear),
+        (Mathavan2010CircularSurrogate, Mathavan2010Circular),
+    ],
+)
+def test_surrogate_close_to_default_model(surrogate_dir, model_cls, exact_cls):
+    cushion = _cushion(model_cls)
+    model = model_cls()
+    exact = exact_cls()
+
+    for ball, speed, normal in _random_impacts(cushion, 100):
+        expected = exact.solve(ball.copy(), cushion)[0].state.rvw
+        result = model.solve(ball.copy(), cushion)[0].state.rvw
+
+        atol = (model.tolerance + ADAPTIVE_GAP) * speed
+        _assert_close(result, expected, normal, atol, ball.params.R)
+
+
+def test_surrogate_symmetry(surrogate_dir):
+    """Mirrored collisions have mirrored outcomes"""
+    h = Table.default().cushion_segments.linear["3"].height
+    cushion = LinearCushionSegment(
+        "cushion",
+        p1=np.array([0, -1, h], dtype=np.float64),
+        p2=np.array([0, +1, h], dtype=np.float64),
+    )
+    model = Mathavan2010LinearSurrogate(**SURROGATE_KWARGS)
+
+    ball = Ball.create("cue", xy=(-1, 0))
+    ball.state.rvw[1] = [1.2, 0.7, 0]
+    ball.state.rvw[2] = [15, -10, 20]
+
+    other = ball.copy()
+    other.state.rvw[1, 1] *= -1
+    other.state.rvw[2, 0] *= -1
+    other.state.rvw[2, 2] *= -1
+
+    after = model.solve(ball.copy(), cushion)[0].state.rvw
+    other_after = model.solve(other.copy(), cushion)[0].state.rvw
+
+    assert after[1, 0] < 0
+    np.testing.assert_allclose(other_after[1], after[1] * [1, -1, 1])
+    np.testing.assert_allclose(other_after[2], after[2] * [-1, 1, -1])
+
+
+def test_surrogate_falls_back_to_exact_model(surrogate_dir):
+    cushion = Table.default().cushion_segments.linear["3"]
+    model = Mathavan2010LinearSurrogate(**SURROGATE_KWARGS)
+    exact = Mathavan2010Linear(adaptive=True, rtol=model.rtol)
+
+    # More spin than the table covers
+    ball = Ball.create("cue", xy=(0.5, 0.5))
+    ball.state.rvw[1] = [0.1, -0.2, 0]
+    ball.state.rvw[2] = [0, 0, 100]
+
+    np.testing.assert_array_equal(
+        model.solve(ball.copy(), cushion)[0].state.rvw,
+        exact.solve(ball.copy(), cushion)[0].state.rvw,
+    )
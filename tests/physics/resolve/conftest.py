@@ -0,0 +1,30 @@
+import pytest
+
+import pooltool.physics.resolve.surrogate as surrogate
+from pooltool.physics.resolve.ball_ball.frictional_mathavan.surrogate import (
+    frictional_mathavan_table,
+)
+from pooltool.physics.resolve.ball_cushion.mathavan_2010.surrogate import (
+    mathavan_table,
+)
+
+
+def _clear_tables() -> None:
+    mathavan_table.cache_clear()
+    frictional_mathavan_table.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def surrogate_dir(tmp_path_factory):
+    """Keep lookup tables out of the user's config directory
+
+    The directory is shared by the tests of a module, so each table is only built once
+    per module.
+    """
+    path = tmp_path_factory.mktemp("surrogates")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(surrogate, "SURROGATE_DIR", path)
+        monkeypatch.setattr(surrogate, "_tables", {})
+        _clear_tables()
+        yield path
+    _clear_tables()
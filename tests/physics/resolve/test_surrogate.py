@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import pooltool.physics.resolve.surrogate as surrogate
+from pooltool.physics.resolve.surrogate import LookupTable, build_table, cached_table
+
+
+def _multilinear(points):
+    x, y, z = points.T
+    return np.column_stack([1 + 2 * x - y + 3 * x * y * z, x * z - 4 * y])
+
+
+def _wavy(points):
+    return np.sin(3 * points)
+
+
+def _kinked(points):
+    return np.abs(points[:, :1] - 0.1)
+
+
+LOWER = np.array([-1.0, 0.0, 2.0])
+UPPER = np.array([1.0, 0.5, 3.0])
+
+
+def test_interpolation_is_exact_for_multilinear_functions():
+    table = LookupTable.from_function(_multilinear, LOWER, UPPER, (3, 2, 4))
+    assert table.shape == (3, 2, 4)
+
+    points = np.random.default_rng(0).uniform(LOWER, UPPER, size=(100, 3))
+    np.testing.assert_allclose(table.interpolate_many(points), _multilinear(points))
+    np.testing.assert_allclose(table(points[0]), _multilinear(points[:1])[0])
+
+    # Including at the bounds
+    np.testing.assert_allclose(table(UPPER), _multilinear(UPPER[None])[0])
+    np.testing.assert_allclose(table(LOWER), _multilinear(LOWER[None])[0])
+
+
+def test_outside_of_table():
+    table = LookupTable.from_function(_multilinear, LOWER, UPPER, (3, 2, 4))
+
+    assert table(np.array([0.0, 0.6, 2.5])) is None
+    assert table(np.array([0.0, np.nan, 2.5])) is None
+    assert np.isnan(table.interpolate_many(np.array([[-2.0, 0.0, 2.5]]))).all()
+
+
+def test_build_table_refines_to_tolerance():
+    coarse = LookupTable.from_function(_wavy, LOWER, UPPER, (3, 3, 3))
+
+    table = build_table(_wavy, LOWER, UPPER, (3, 3, 3), 0.04, 100_000)
+    assert table.error <= 0.04
+    assert table.exact_fraction <= 0.5
+    assert all(n > 3 for n in table.shape)
+
+    # The validated error holds at other points, where they're interpolated
+    points = np.random.default_rng(42).uniform(LOWER, UPPER, size=(1000, 3))
+    interpolated = table.interpolate_many(points)
+    within = ~np.isnan(interpolated).any(axis=1)
+    assert within.mean() >= 0.5
+    error = np.abs(interpolated[within] - _wavy(points[within])).max()
+    assert error <= 0.04
+    assert error < np.abs(coarse.interpolate_many(points) - _wavy(points)).max()
+
+    with pytest.raises(ValueError):
+        build_table(_wavy, LOWER, UPPER, (3, 3, 3), 1e-6, 10_000)
+
+
+def test_build_table_flags_cells_it_cant_interpolate():
+    # Only the cells spanning the kink, at x = 0.1, can't be interpolated exactly
+    table = build_table(_kinked, LOWER, UPPER, (5, 3, 3), 0.01, 100_000)
+    assert table.shape == (5, 3, 3)
+    np.testing.assert_array_equal(table.exact.any(axis=(1, 2)), [0, 0, 1, 0])
+    assert table.exact[2].all()
+    assert table.exact_fraction == 0.25
+
+    assert table(np.array([0.2, 0.25, 2.5])) is None
+    np.testing.assert_allclose(table(np.array([-0.7, 0.25, 2.5])), [0.8])
+    np.testing.assert_allclose(table(np.array([0.7, 0.25, 2.5])), [0.6])
+
+
+def test_cached_table(surrogate_dir):
+    def build():
+        builds.append(None)
+        return build_table(_wavy, LOWER, UPPER, (3, 3, 3), 0.1, 100_000)
+
+    builds = []
+    table = cached_table("wavy", dict(a=1), build)
+    assert len(builds) == 1
+    assert len(list(surrogate_dir.glob("wavy-*.npz"))) == 1
+
+    # Memory
+    assert cached_table("wavy", dict(a=1), build) is table
+
+    # Disk
+    surrogate._tables.clear()
+    loaded = cached_table("wavy", dict(a=1), build)
+    assert len(builds) == 1
+    assert loaded.shape == table.shape
+    assert loaded.error == table.error
+    np.testing.assert_array_equal(loaded.exact, table.exact)
+    np.testing.assert_array_equal(loaded.values, table.values)
+
+    # A different key is a different table
+    cached_table("wavy", dict(a=2), build)
+    assert len(builds) == 2
+    assert len(list(surrogate_dir.glob("wavy-*.npz"))) == 2
@@ -0,0 +1,81 @@
+"""Compare the ways of getting the smallest real positive root of many quartics
+
+* Per call: ``get_real_positive_smallest_root(solve(a, b, c, d, e))`` for each
+  quartic, called from Python (only up to 10^4 quartics, since it's slow).
+* Batch: ``get_real_positive_smallest_roots(solve_many(coeffs))``.
+* Fused: ``solve_many_smallest(coeffs)``.
+* Fused parallel: ``solve_many_smallest_parallel(coeffs)``, which uses as many threads
+  as numba is configured for (see ``NUMBA_NUM_THREADS``).
+"""
+
+import time
+
+import numba
+import numpy as np
+
+from pooltool.ptmath.roots._quartic_numba import (
+    solve,
+    solve_many,
+    solve_many_smallest,
+    solve_many_smallest_parallel,
+)
+from pooltool.ptmath.roots.core import (
+    get_real_positive_smallest_root,
+    get_real_positive_smallest_roots,
+)
+
+
+def per_call(coeffs: np.ndarray) -> np.ndarray:
+    return np.array(
+        [get_real_positive_smallest_root(solve(*row)) for row in coeffs.tolist()]
+    )
+
+
+def batch(coeffs: np.ndarray) -> np.ndarray:
+    return get_real_positive_smallest_roots(solve_many(coeffs))
+
+
+def time_fn(fn, coeffs: np.ndarray, n_runs: int) -> float:
+    fn(coeffs[:10])  # compile
+
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        fn(coeffs)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    rng = np.random.default_rng(seed=42)
+    methods = {
+        "Per call": per_call,
+        "Batch": batch,
+        "Fused": solve_many_smallest,
+        "Fused parallel": solve_many_smallest_parallel,
+    }
+
+    print(f"Threads: {numba.get_num_threads()}\n")
+
+    for exponent in range(2, 7):
+        size = 10**exponent
+        coeffs = rng.uniform(-10, 10, size=(size, 5))
+        expected = batch(coeffs)
+
+        print(f"Batch size: {size} equations")
+        for name, fn in methods.items():
+            if name == "Per call" and size > 10**4:
+                continue
+
+            assert np.array_equal(fn(coeffs), expected)
+            elapsed = time_fn(fn, coeffs, n_runs=max(1, 10**5 // size))
+            print(
+                f"{name + ':':<16} {elapsed * 1000:10.3f} ms "
+                f"({elapsed / size * 1e9:6.1f} ns / quartic)"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
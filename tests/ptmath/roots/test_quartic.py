@@ -1,9 +1,15 @@
 from pathlib import Path
 
 import numpy as np
+import pytest
 from numpy.typing import NDArray
 
-from pooltool.ptmath.roots._quartic_numba import solve_many
+from pooltool.ptmath.roots._quartic_numba import (
+    solve_many,
+    solve_many_smallest,
+    solve_many_smallest_parallel,
+)
+from pooltool.ptmath.roots.core import get_real_positive_smallest_roots
 
 TEST_DIR = Path(__file__).parent
 DATA_DIR = TEST_DIR / "data"
@@ -64,3 +70,40 @@ def test_1010_reference():
     for i in range(len(coeffs)):
         numba_roots, c_roots = match_roots(numba_roots_array[i], c_roots_array[i])
         assert np.allclose(numba_roots, c_roots, rtol=1e-15, atol=1e-15)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["quartic_coeffs.npy", "hard_quartic_coeffs.npy", "1010_reference_coeffs.npy"],
+)
+def test_solve_many_smallest(filename):
+    coeffs = np.load(DATA_DIR / filename)
+    rng = np.random.default_rng(42)
+    coeffs = np.concatenate(
+        [
+            coeffs,
+            rng.uniform(-10, 10, size=(1000, 5)),
+            # Degenerate rows
+            np.zeros((1, 5)),
+            [[0.0, 1.0, 2.0, 3.0, 4.0]],
+        ]
+    )
+
+    expected = get_real_positive_smallest_roots(solve_many(coeffs))
+    assert np.isfinite(expected).any() and np.isinf(expected).any()
+
+    np.testing.assert_array_equal(solve_many_smallest(coeffs), expected)
+    np.testing.assert_array_equal(solve_many_smallest_parallel(coeffs), expected)
+
+    # Non-contiguous input
+    reversed_coeffs = np.ascontiguousarray(coeffs[:, ::-1])[:, ::-1]
+    np.testing.assert_array_equal(solve_many_smallest(reversed_coeffs), expected)
+    np.testing.assert_array_equal(
+        solve_many_smallest_parallel(reversed_coeffs), expected
+    )
+
+
+def test_solve_many_smallest_empty():
+    coeffs = np.empty((0, 5))
+    assert solve_many_smallest(coeffs).shape == (0,)
+    assert solve_many_smallest_parallel(coeffs).shape == (0,)
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+GUI_MODULES = ("panda3d", "direct", "simplepbr")
+
+SIMULATE = """
+import sys
+
+import pooltool as pt
+
+system = pt.System.example()
+pt.simulate(system, inplace=True)
+pt.continuize(system, inplace=True)
+system.save("{path}")
+pt.System.load("{path}")
+
+ruleset = pt.get_ruleset(pt.GameType.NINEBALL)([pt.Player("A"), pt.Player("B")])
+shot = pt.System(
+    cue=pt.Cue(cue_ball_id="cue"),
+    table=(table := pt.Table.default()),
+    balls=pt.get_rack(pt.GameType.NINEBALL, table),
+)
+pt.simulate(shot, inplace=True)
+ruleset.process_and_advance(shot)
+
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+def _imported_modules(code: str) -> set[str]:
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+def test_simulation_does_not_import_gui(tmp_path):
+    """Headless simulation doesn't need Panda3D, so it isn't imported"""
+    modules = _imported_modules(SIMULATE.format(path=tmp_path / "system.msgpack"))
+
+    assert not {module.split(".")[0] for module in modules} & set(GUI_MODULES)
+    assert "pooltool.interact" not in modules
+    assert "pooltool.system.render" not in modules
+    assert not any(module.startswith("pooltool.multiplayer") for module in modules)
+
+
+@pytest.mark.parametrize(
+    "name", ["ai", "aim", "pot", "image", "interact", "Game", "show"]
+)
+def test_lazy_attributes(name: str):
+    import pooltool
+
+    assert name in dir(pooltool)
+    assert getattr(pooltool, name) is not None
+
+
+def test_missing_attribute():
+    import pooltool
+
+    with pytest.raises(AttributeError):
+        pooltool.not_an_attribute  # noqa: B018